@@ -2,21 +2,58 @@
 
 from __future__ import annotations
 
+import asyncio
 import datetime
-from typing import Optional
+from typing import Callable, Optional
 
+from textual import events
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Container, Horizontal
+from textual.message import Message
 from textual.widgets import Footer, Header, Static, ListView
 
-from db.query import dates_with_schedules, filter_by_date, search_schedules
-from db.store import load_schedules, save_schedules
+from db.archive import (
+    ARCHIVE_NAME,
+    Archive,
+    archive_dir,
+    archive_expired,
+    archive_months,
+    read_year,
+)
+from db.calendars import (
+    DEFAULT_NAME,
+    Calendar,
+    CalendarConfig,
+    CalendarSet,
+    calendar_configs,
+    load_calendars,
+    reload_calendar,
+)
+from db.client import DaemonError, RemoteRepository
+from db.events import ScheduleChange
+from db.query import SearchCursor
+from db.repository import ScheduleRepository, diff_schedules
+import db.store as store
+from db.store import (
+    LoadReport,
+    aload_config,
+    aload_schedules_versioned,
+    asave_merged,
+)
+from db.watcher import DEFAULT_INTERVAL, FileSignature, FileWatcher
 from models.schedule import Schedule
 from ui.calendar_view import CalendarView
 from ui.detail_view import DetailView
 from ui.header_footer import AppFooter
 from ui.schedule_form import ConfirmDialog, ScheduleForm, SearchDialog
+from ui.stats_panel import StatsPanel
+from utils import perf
+from utils.sampler import StackSampler
+from utils.trace import TraceRecorder
+
+# 外部変更の差分がこれより多い場合は、1件ずつ適用せずに全体を再描画する
+BULK_RELOAD_THRESHOLD = 200
 
 
 class ScheduleApp(App):
@@ -120,6 +157,16 @@ class ScheduleApp(App):
         color: $text;
     }
 
+    DayCell.search-hit {
+        text-style: bold underline;
+        color: $warning;
+    }
+
+    DayCell.selected.search-hit {
+        background: $accent;
+        color: $text;
+    }
+
     DayCell.other-month {
         color: $text-muted;
     }
@@ -148,6 +195,16 @@ class ScheduleApp(App):
         color: $text-muted;
     }
 
+    StatsPanel {
+        dock: right;
+        width: 72;
+        height: auto;
+        margin: 3 0;
+        padding: 0 1;
+        border: round $warning;
+        background: $panel;
+    }
+
     #app-footer {
         height: 3;
         content-align: center middle;
@@ -162,17 +219,68 @@ class ScheduleApp(App):
         Binding("e", "edit_schedule", "編集", show=True),
         Binding("d", "delete_schedule", "削除", show=True),
         Binding("slash", "search", "検索", show=True),
+        Binding("question_mark", "search_archive", "アーカイブも検索", show=False),
+        Binding("n", "search_next", "次の結果", show=False),
+        Binding("N", "search_prev", "前の結果", show=False),
         Binding("t", "go_today", "今日", show=True),
         Binding("less_than_sign", "prev_month", "前月", show=True),
         Binding("greater_than_sign", "next_month", "翌月", show=True),
         Binding("tab", "toggle_focus", "切替", show=False),
+        Binding("p", "toggle_stats", "統計", show=False),
+        Binding("f9", "toggle_sampling", "プロファイル", show=False),
         Binding("q", "quit_app", "終了", show=True),
+        # 1〜9: config.json の順でカレンダーの表示・非表示を切り替える
+        *(
+            Binding(str(n), f"toggle_calendar({n - 1})", f"カレンダー{n}", show=False)
+            for n in range(1, 10)
+        ),
     ]
 
-    def __init__(self) -> None:
+    class RemoteCallback(Message):
+        """サーバーの受信スレッドからメインスレッドへ渡す処理。"""
+
+        def __init__(self, callback: Callable[[], None]) -> None:
+            super().__init__()
+            self.callback = callback
+
+    def __init__(
+        self,
+        sampler: StackSampler | None = None,
+        trace: TraceRecorder | None = None,
+        watch_interval: float | None = DEFAULT_INTERVAL,
+        remote: RemoteRepository | None = None,
+    ) -> None:
         super().__init__()
-        self._schedules: list[Schedule] = []
+        self._sampler = sampler
+        self._trace = trace
+        self._watch_interval = watch_interval
+        # サーバー（db.daemon）に接続している場合はデータを持たず、保存もサーバーが行う
+        self._remote = remote
+        self._watcher: FileWatcher | None = None
+        self._reloading = False
+        # 保存は1つのワーカーで順に行い、保存中の変更は次の保存にまとめる
+        self._save_idle = asyncio.Event()
+        self._save_idle.set()
+        self._save_pending = False
+        self._after_save: list[Callable[[], None]] = []
+        # 最後にファイルと同期した時点の内容と version（保存時の3方向マージの祖先）
+        self._base: list[Schedule] = []
+        self._version = 0
+        self._repo: ScheduleRepository | RemoteRepository = (
+            remote if remote is not None else ScheduleRepository()
+        )
+        self._repo.subscribe(self._on_schedule_change)
+        # 表示は全カレンダーのマージ。追加・編集・削除は先頭（_repo）だけに行う
+        self._calendars = CalendarSet(
+            [Calendar(DEFAULT_NAME, store.SCHEDULE_FILE, self._repo, writable=True)]
+        )
+        # 過去のスケジュールのアーカイブ（年ごとに必要になったときだけ読み込む）
+        self._archive: Archive | None = None
+        self._archive_loading: set[int] = set()
         self._selected_date: datetime.date = datetime.date.today()
+        self._search_cursor: SearchCursor | None = None
+        # 現在の検索がアーカイブを含むか（? キーで検索した場合）
+        self._search_archive = False
 
     def compose(self) -> ComposeResult:
         yield Static("JSON スケジュール管理", id="app-header")
@@ -180,42 +288,461 @@ class ScheduleApp(App):
             yield CalendarView(id="calendar-view")
             yield DetailView(id="detail-view")
         yield AppFooter(id="app-footer")
+        yield StatsPanel(id="stats-panel")
+
+    async def on_mount(self) -> None:
+        if self._trace is not None:
+            self._trace.begin(
+                (self.size.width, self.size.height),
+                self._selected_date,
+                store.SCHEDULE_FILE,
+            )
+        if self._remote is not None:
+            self._connect_remote()
+            return
+        startup = perf.Breakdown("startup")
+        config = await self._load_config()
+        startup.lap("config")
+        try:
+            store.configure_compression(config)
+        except ValueError as e:
+            self.notify(str(e), severity="warning")
+        primary, *extras = self._calendar_configs(config)
+        await self._archive_expired(config)
+        startup.lap("archive")
+        # 読み込み前の状態を同期済みにする（読み込み中の外部変更は次のポーリングで拾う）
+        self._watcher = FileWatcher(store.SCHEDULE_FILE)
+        self._calendars.primary.name = primary.name
+        self._calendars.primary.enabled = primary.enabled
+        report = LoadReport()
+        try:
+            # 書き込み先と追加のカレンダーは独立に読み込めるため、同時に読む
+            _, calendars = await asyncio.gather(
+                self._load_data(report), asyncio.to_thread(load_calendars, extras)
+            )
+        finally:
+            self._show_progress(None)
+        startup.lap("load")
+        startup.parts.update(report.timings)
+        perf.gauge("dataset.quarantined", report.quarantined)
+        if report.quarantined:
+            self.notify(
+                f"{report.quarantined}件の不正なレコードを読み込まず、"
+                f"{store.quarantine_path().name} に移しました",
+                severity="warning",
+            )
+        self._calendars.calendars.extend(calendars)
+        for calendar in calendars:
+            if calendar.error is not None:
+                self.notify(
+                    f"カレンダー「{calendar.name}」を読み込めませんでした: {calendar.error}",
+                    severity="warning",
+                )
+        await self._open_archive()
+        self._refresh_views()
+        startup.lap("render")
+        startup.finish()
+        self._load_archive_month(self._selected_date.year, self._selected_date.month)
+        if self._watch_interval:
+            self.set_interval(self._watch_interval, self._poll_data_file)
+            if calendars:
+                self.set_interval(self._watch_interval, self._poll_calendars)
+
+    async def _load_config(self) -> dict:
+        try:
+            return await aload_config()
+        except (OSError, ValueError) as e:
+            self.notify(f"config.json を読み込めませんでした: {e}", severity="warning")
+            return {}
 
-    def on_mount(self) -> None:
-        self._load_data()
+    def _calendar_configs(self, config: dict) -> list[CalendarConfig]:
+        """config.json のカレンダーの一覧（不正なら schedules.json だけ）。"""
+        try:
+            return calendar_configs(config)
+        except ValueError as e:
+            self.notify(
+                f"config.json のカレンダー設定を読み込めませんでした: {e}",
+                severity="warning",
+            )
+            return calendar_configs({})
+
+    async def _archive_expired(self, config: dict) -> None:
+        """config.json の archive の設定に従い、古いスケジュールをアーカイブへ移す。"""
+        try:
+            months = archive_months(config)
+        except ValueError as e:
+            self.notify(str(e), severity="warning")
+            return
+        if months is None:
+            return
+        try:
+            moved = await asyncio.to_thread(archive_expired, months)
+        except (OSError, ValueError) as e:
+            self.notify(f"アーカイブできませんでした: {e}", severity="warning")
+            return
+        if moved:
+            self.notify(
+                f"{months}か月より前のスケジュール {moved}件をアーカイブへ移しました",
+                severity="information",
+            )
+
+    async def _open_archive(self) -> None:
+        """アーカイブがあれば、読み取り専用のカレンダーとして（中身は空のまま）加える。"""
+        try:
+            archive = await asyncio.to_thread(Archive)
+        except (OSError, ValueError) as e:
+            self.notify(f"アーカイブの索引を読み込めませんでした: {e}", severity="warning")
+            return
+        if not archive:
+            return
+        self._archive = archive
+        self._calendars.calendars.append(
+            Calendar(ARCHIVE_NAME, archive_dir(), archive.repo, archive=True)
+        )
+
+    def _load_archive_month(self, year: int, month: int) -> None:
+        """アーカイブ済みの月を開いたら、その年のアーカイブをバックグラウンドで読み込む。"""
+        archive = self._archive
+        if archive is None or not archive.covers(year, month):
+            return
+        self._load_archive_years([year])
+
+    def _load_archive_years(
+        self, years: list[int], then: Callable[[], None] | None = None
+    ) -> None:
+        years = [y for y in years if y not in self._archive_loading]
+        self._archive_loading.update(years)
+
+        async def load() -> None:
+            for year in years:
+                try:
+                    schedules = await asyncio.to_thread(read_year, year)
+                except (OSError, ValueError) as e:
+                    self.notify(
+                        f"{year}年のアーカイブを読み込めませんでした: {e}", severity="warning"
+                    )
+                    continue
+                finally:
+                    self._archive_loading.discard(year)
+                self._archive.add_year(year, schedules)
+            self._rerun_search()
+            self._refresh_views()
+            if then is not None:
+                then()
+
+        self.run_worker(
+            load(),
+            name="archive-load",
+            group="archive-load",
+            exclusive=False,
+            exit_on_error=False,
+        )
+
+    def _connect_remote(self) -> None:
+        """サーバーからの変更通知をメインスレッドで受け取るようにして購読を始める。"""
+        remote = self._remote
+        # 受信スレッドを止めないよう、call_from_thread ではなくメッセージで渡す
+        remote.dispatch = lambda fn: self.post_message(self.RemoteCallback(fn))
+        remote.client.on_disconnect = lambda: self.post_message(
+            self.RemoteCallback(self._on_remote_disconnect)
+        )
+        remote.reset()
         self._refresh_views()
+        remote.start()
+
+    def on_schedule_app_remote_callback(self, message: RemoteCallback) -> None:
+        message.callback()
+
+    def _on_remote_disconnect(self) -> None:
+        self.notify("サーバーとの接続が切れました", severity="error")
+        self.set_timer(2.0, self.exit)
+
+    async def on_event(self, event: events.Event) -> None:
+        # ドライバーから届いた入力（転送前）だけを記録する
+        if (
+            self._trace is not None
+            and isinstance(event, events.InputEvent)
+            and not event.is_forwarded
+        ):
+            self._trace.record(event)
+        await super().on_event(event)
 
     # ---- data ----
 
-    def _load_data(self) -> None:
-        self._schedules = load_schedules()
+    @perf.timed("app._load_data")
+    async def _load_data(self, report: LoadReport | None = None) -> None:
+        if self._remote is not None:
+            self._remote.reset()
+            return
+        schedules, self._version = await aload_schedules_versioned(
+            progress=self._progress_reporter("読み込み中"), report=report
+        )
+        self._base = schedules
+        self._repo.reset(schedules)
+
+    def _progress_reporter(self, label: str) -> Callable[[str, int, int], None]:
+        """ストアの読み書きの進捗をヘッダーに表示するコールバックを返す。"""
+
+        def report(phase: str, done: int, total: int) -> None:
+            # 1回で終わる小さな読み書きでは表示しない
+            if done < total:
+                self._show_progress(f"{label} {phase} {done * 100 // total}%")
 
-    def _save_data(self) -> None:
-        save_schedules(self._schedules)
+        return report
 
-    def _schedule_date_keys(self) -> set[str]:
-        return dates_with_schedules(self._schedules)
+    def _show_progress(self, text: str | None) -> None:
+        header = self.query_one("#app-header", Static)
+        header.update(self.TITLE if text is None else f"{self.TITLE} — {text}")
+
+    def _request_save(self) -> None:
+        """保存を予約する。保存中なら、完了後にまとめてもう一度保存する。"""
+        self._save_pending = True
+        if not self._save_idle.is_set():
+            return
+        self._save_idle.clear()
+        self.run_worker(
+            self._save_data(),
+            name="data-save",
+            group="data-save",
+            exit_on_error=False,
+        )
+
+    @perf.timed("app._save_data")
+    async def _save_data(self) -> None:
+        """予約された保存を行う。他のインスタンスの変更はマージする。
+
+        双方が変更していたレコードだけは他の内容を採用し、こちらの変更を取り消して通知する。
+        """
+        try:
+            while self._save_pending:
+                self._save_pending = False
+                callbacks, self._after_save = self._after_save, []
+                ours = self._repo.schedules
+                known = self._watcher.synced if self._watcher is not None else None
+                try:
+                    result = await asave_merged(
+                        self._base,
+                        ours,
+                        self._version,
+                        known,
+                        progress=self._progress_reporter("保存中"),
+                    )
+                except (OSError, ValueError) as e:
+                    self.notify(f"保存できませんでした: {e}", severity="error")
+                    continue
+                finally:
+                    self._show_progress(None)
+                self._base, self._version = result.schedules, result.version
+                if self._watcher is not None:
+                    # 自分の書き込みは外部変更として扱わない
+                    self._watcher.mark_synced(result.signature)
+                if result.merged:
+                    self._apply_merged(ours, result.schedules)
+                if result.conflicts:
+                    self._notify_conflict(result.conflicts)
+                for callback in callbacks:
+                    callback()
+        finally:
+            self._save_idle.set()
+
+    def _apply_merged(self, ours: list[Schedule], merged: list[Schedule]) -> None:
+        """マージで取り込んだ他のインスタンスの変更を、通常の更新として反映する。
+
+        衝突したレコードもここで他の内容に戻る。保存中に手元で変更したレコードは
+        そのまま残す（次の保存で改めてマージされる）。
+        """
+        for change in diff_schedules(ours, merged):
+            if self._repo.get(change.schedule_id) == change.old:
+                self._repo.apply(change)
+
+    async def wait_for_save(self) -> None:
+        """予約済みの保存がすべて終わるまで待つ。"""
+        await self._save_idle.wait()
+
+    def _commit(
+        self,
+        mutate: Callable[[], ScheduleChange],
+        on_saved: Callable[[], None] | None = None,
+    ) -> bool:
+        """変更を反映して保存を予約する。サーバー接続時は変更をサーバーに依頼する。
+
+        反映できたら True を返す。on_saved は保存が完了したときに呼ばれる。
+        """
+        try:
+            mutate()
+        except DaemonError as e:
+            self.notify(f"保存できませんでした: {e}", severity="error")
+            return False
+        if self._remote is not None:
+            # 変更を依頼した時点でサーバーが保存している
+            if on_saved is not None:
+                on_saved()
+            return True
+        if on_saved is not None:
+            self._after_save.append(on_saved)
+        self._request_save()
+        return True
+
+    def _notify_conflict(self, ids: list[str]) -> None:
+        """衝突して他の内容を採用したスケジュールを通知する（他の変更は保存済み）。"""
+        self.notify(
+            f"他のウィンドウで同じスケジュールが変更されていたため、"
+            f"そちらの内容を表示します（{len(ids)}件）",
+            severity="error",
+        )
 
     def _schedules_for_date(self, d: datetime.date) -> list[Schedule]:
-        return filter_by_date(self._schedules, d)
+        return self._calendars.for_date(d)
+
+    def _poll_data_file(self) -> None:
+        """データファイルが外部で変更されていれば、バックグラウンドで読み直す。"""
+        watcher = self._watcher
+        if watcher is None or self._reloading or not self._save_idle.is_set():
+            # 保存中の変更は、保存の完了時に同期済みとして扱う
+            return
+        if not watcher.changed():
+            return
+        signature = watcher.signature()
+        if signature is None:
+            # 削除・置き換えの途中。メモリ上の内容を保ち、次の保存で書き戻す
+            return
+        self._reloading = True
+        snapshot = self._repo.schedules
+        revision = self._repo.revision
+
+        async def reload() -> None:
+            try:
+                incoming, version = await aload_schedules_versioned()
+            except (OSError, ValueError, TypeError):
+                # 書き込み途中などで読めない場合は、次にファイルが変わるまで待つ
+                self._finish_reload(signature, revision, None)
+                return
+            changes = await asyncio.to_thread(diff_schedules, snapshot, incoming)
+            self._finish_reload(signature, revision, (incoming, version, changes))
+
+        self.run_worker(
+            reload(),
+            name="data-reload",
+            group="data-reload",
+            exit_on_error=False,
+        )
+
+    @perf.timed("app._finish_reload")
+    def _finish_reload(
+        self,
+        signature: FileSignature,
+        revision: int,
+        result: tuple[list[Schedule], int, list[ScheduleChange]] | None,
+    ) -> None:
+        """読み直した内容の差分を、通常の更新と同じ経路で適用する。"""
+        self._reloading = False
+        if self._watcher is None:
+            return
+        if result is None:
+            self._watcher.mark_synced(signature)
+            self.notify("外部で変更されたデータを読み込めませんでした", severity="warning")
+            return
+        if self._repo.revision != revision:
+            # 読み込み中に編集された。同期済みにせず、次のポーリングで差分を取り直す
+            return
+        incoming, version, changes = result
+        self._watcher.mark_synced(signature)
+        self._base, self._version = incoming, version
+        if not changes:
+            return
+        if len(changes) > BULK_RELOAD_THRESHOLD:
+            self._repo.reset(incoming)
+            self._rerun_search()
+            self._refresh_views()
+        else:
+            for change in changes:
+                self._repo.apply(change)
+        added = sum(c.kind == "added" for c in changes)
+        deleted = sum(c.kind == "deleted" for c in changes)
+        self.notify(
+            f"外部の変更を読み込みました（追加 {added} / 更新 {len(changes) - added - deleted}"
+            f" / 削除 {deleted}）",
+            severity="information",
+        )
+
+    def _poll_calendars(self) -> None:
+        """追加のカレンダーのファイルが変更されていれば、そのカレンダーだけを読み直す。"""
+        for calendar in self._calendars.calendars[1:]:
+            watcher = calendar.watcher
+            if watcher is None or not watcher.changed():
+                continue
+            signature = watcher.signature()
+            if signature is None:
+                continue
+            self.run_worker(
+                self._reload_calendar(calendar, signature),
+                name=f"calendar-reload-{calendar.name}",
+                group="calendar-reload",
+                exclusive=False,
+                exit_on_error=False,
+            )
+
+    async def _reload_calendar(
+        self, calendar: Calendar, signature: FileSignature
+    ) -> None:
+        calendar.watcher.mark_synced(signature)
+        try:
+            schedules = await asyncio.to_thread(reload_calendar, calendar)
+        except (OSError, ValueError, TypeError):
+            # 書き込み途中などで読めない場合は、次にファイルが変わるまで待つ
+            return
+        calendar.source.reset(schedules)
+        calendar.error = None
+        self._rerun_search()
+        self._refresh_views()
 
     # ---- view refresh ----
 
+    @perf.timed("app._refresh_views")
     def _refresh_views(self) -> None:
+        mounts = perf.counter("widget.mounts")
         cal = self.query_one("#calendar-view", CalendarView)
-        cal.update_schedule_dates(self._schedule_date_keys())
+        cal.search_cursor = self._search_cursor
+        cal.update_occupancy(self._calendars.occupancy)
 
         detail = self.query_one("#detail-view", DetailView)
         detail.update_schedules(
             self._selected_date,
             self._schedules_for_date(self._selected_date),
         )
+        perf.gauge("widget.mounts/refresh", perf.counter("widget.mounts") - mounts)
+        perf.gauge("dataset.records", len(self._calendars))
+
+    @perf.timed("app._on_schedule_change")
+    def _on_schedule_change(self, change: ScheduleChange) -> None:
+        """1件の変更を、影響するカレンダーのセルと詳細の行だけに反映する。"""
+        mounts = perf.counter("widget.mounts")
+        cursor = self._search_cursor
+        if cursor is not None and self._calendars.primary.enabled:
+            # 検索はやり直さず、変更されたスケジュールだけを結果に反映する
+            if cursor.apply(change) and not cursor:
+                self._search_cursor = None
+        cal = self.query_one("#calendar-view", CalendarView)
+        cal.search_cursor = self._search_cursor
+        cal.apply_change(change)
+        if self._calendars.primary.enabled:
+            # 非表示のカレンダーの変更は一覧に出さない（件数は合算に含まれない）
+            self.query_one("#detail-view", DetailView).apply_change(change)
+        perf.gauge("widget.mounts/refresh", perf.counter("widget.mounts") - mounts)
+        perf.gauge("dataset.records", len(self._calendars))
 
     # ---- events ----
 
+    def on_calendar_view_month_changed(self, event: CalendarView.MonthChanged) -> None:
+        self._load_archive_month(event.year, event.month)
+
     def on_calendar_view_date_selected(self, event: CalendarView.DateSelected) -> None:
         self._selected_date = event.date
+        self._load_archive_month(event.date.year, event.date.month)
         detail = self.query_one("#detail-view", DetailView)
+        if detail.selected_date == event.date:
+            # 表示中の日付の一覧は変更イベントで最新に保たれている
+            return
         detail.update_schedules(
             event.date,
             self._schedules_for_date(event.date),
@@ -232,15 +759,20 @@ class ScheduleApp(App):
     def _on_schedule_form_result(self, result: Optional[Schedule]) -> None:
         if result is None:
             return
-        self._schedules.append(result)
-        self._save_data()
+        primary = self._calendars.primary
+        if not primary.enabled:
+            # 追加した予定が見えるよう、書き込み先のカレンダーを表示に戻す
+            primary.enabled = True
+            self._refresh_views()
+            self.notify(f"「{primary.name}」を表示しました", severity="information")
+        if not self._commit(lambda: self._repo.add(result)):
+            return
         # Navigate to the date of the new schedule
         dt = result.parsed_datetime
         new_date = dt.date()
         self._selected_date = new_date
         cal = self.query_one("#calendar-view", CalendarView)
         cal.select_date(new_date)
-        self._refresh_views()
 
     def action_edit_schedule(self) -> None:
         detail = self.query_one("#detail-view", DetailView)
@@ -248,6 +780,8 @@ class ScheduleApp(App):
         if schedule is None:
             self.notify("編集するスケジュールを選択してください", severity="warning")
             return
+        if not self._check_writable(schedule):
+            return
         self.push_screen(
             ScheduleForm(schedule=schedule),
             callback=self._on_edit_form_result,
@@ -257,16 +791,13 @@ class ScheduleApp(App):
         if result is None:
             return
         # Replace schedule with same id
-        self._schedules = [
-            result if s.id == result.id else s for s in self._schedules
-        ]
-        self._save_data()
+        if not self._commit(lambda: self._repo.update(result)):
+            return
         dt = result.parsed_datetime
         new_date = dt.date()
         self._selected_date = new_date
         cal = self.query_one("#calendar-view", CalendarView)
         cal.select_date(new_date)
-        self._refresh_views()
 
     def action_delete_schedule(self) -> None:
         detail = self.query_one("#detail-view", DetailView)
@@ -274,6 +805,8 @@ class ScheduleApp(App):
         if schedule is None:
             self.notify("削除するスケジュールを選択してください", severity="warning")
             return
+        if not self._check_writable(schedule):
+            return
         self.push_screen(
             ConfirmDialog(f"「{schedule.title}」を削除しますか？"),
             callback=self._on_delete_confirm,
@@ -285,31 +818,108 @@ class ScheduleApp(App):
         detail = self.query_one("#detail-view", DetailView)
         schedule = detail.highlighted_schedule
         if schedule:
-            self._schedules = [s for s in self._schedules if s.id != schedule.id]
-            self._save_data()
-            self._refresh_views()
-            self.notify("削除しました", severity="information")
+            self._commit(
+                lambda: self._repo.delete(schedule.id),
+                on_saved=lambda: self.notify("削除しました", severity="information"),
+            )
+
+    def _check_writable(self, schedule: Schedule) -> bool:
+        """追加のカレンダー（読み取り専用）の予定なら警告して False を返す。"""
+        calendar = self._calendars.calendar_of(schedule)
+        if calendar is None or calendar.writable:
+            return True
+        self.notify(
+            f"「{calendar.name}」のスケジュールは読み取り専用です", severity="warning"
+        )
+        return False
 
     def action_search(self) -> None:
         self.push_screen(SearchDialog(), callback=self._on_search_result)
 
+    def action_search_archive(self) -> None:
+        self.push_screen(
+            SearchDialog(title="検索（アーカイブを含む）"),
+            callback=self._on_archive_search_result,
+        )
+
+    def _on_archive_search_result(self, query: Optional[str]) -> None:
+        archive = self._archive
+        if not query or archive is None or not archive.pending_years:
+            self._search(query, include_archive=True)
+            return
+        # 未読み込みの年をすべて読み込んでから検索する
+        self.notify("アーカイブを読み込んでいます", severity="information")
+        self._load_archive_years(
+            archive.pending_years,
+            then=lambda: self._search(query, include_archive=True),
+        )
+
     def _on_search_result(self, query: Optional[str]) -> None:
+        self._search(query)
+
+    def _search(self, query: Optional[str], include_archive: bool = False) -> None:
+        self._search_archive = include_archive
         if not query:
+            self._search_cursor = None
             self._refresh_views()
             return
-        results = search_schedules(self._schedules, query)
+        results = self._calendars.search(query, include_archive)
         if not results:
+            self._search_cursor = None
+            self._refresh_views()
             self.notify("見つかりませんでした", severity="warning")
             return
-        # Navigate to the first result's date
-        first = results[0]
-        dt = first.parsed_datetime
-        d = dt.date()
+        self._search_cursor = SearchCursor(query, results)
+        self._jump_to_search_hit(self._search_cursor.current)
+        self.notify(f"{len(results)}件見つかりました", severity="information")
+
+    def action_search_next(self) -> None:
+        if not self._search_cursor:
+            self.notify("検索結果がありません", severity="warning")
+            return
+        self._jump_to_search_hit(self._search_cursor.next())
+        self._notify_search_position()
+
+    def action_search_prev(self) -> None:
+        if not self._search_cursor:
+            self.notify("検索結果がありません", severity="warning")
+            return
+        self._jump_to_search_hit(self._search_cursor.prev())
+        self._notify_search_position()
+
+    def _jump_to_search_hit(self, schedule: Schedule) -> None:
+        d = schedule.parsed_datetime.date()
         self._selected_date = d
         cal = self.query_one("#calendar-view", CalendarView)
         cal.select_date(d)
         self._refresh_views()
-        self.notify(f"{len(results)}件見つかりました", severity="information")
+
+    def _notify_search_position(self) -> None:
+        cursor = self._search_cursor
+        self.notify(
+            f"{cursor.index + 1}/{len(cursor)}件目: {cursor.current.title}",
+            severity="information",
+        )
+
+    def _rerun_search(self) -> None:
+        """データ変更後に検索カーソルを最新の内容で作り直す。"""
+        if self._search_cursor is None:
+            return
+        query = self._search_cursor.query
+        results = self._calendars.search(query, self._search_archive)
+        self._search_cursor = SearchCursor(query, results) if results else None
+
+    def action_toggle_calendar(self, index: int) -> None:
+        """カレンダーの表示・非表示を切り替える（読み直さずにマージの対象だけを変える）。"""
+        try:
+            calendar = self._calendars.toggle(index)
+        except IndexError:
+            self.notify(f"カレンダー{index + 1}はありません", severity="warning")
+            return
+        self._rerun_search()
+        self._refresh_views()
+        state = "表示" if calendar.enabled else "非表示に"
+        self.notify(f"「{calendar.name}」を{state}しました", severity="information")
 
     def action_go_today(self) -> None:
         cal = self.query_one("#calendar-view", CalendarView)
@@ -337,6 +947,27 @@ class ScheduleApp(App):
         except Exception:
             cal.focus()
 
-    def action_quit_app(self) -> None:
+    def action_toggle_stats(self) -> None:
+        """ホットパス計測の統計パネルを開閉する。"""
+        self.query_one("#stats-panel", StatsPanel).toggle()
+
+    def action_toggle_sampling(self) -> None:
+        """サンプリングプロファイラを開始・停止する（--sample-profile 起動時のみ）。"""
+        if self._sampler is None:
+            self.notify(
+                "--sample-profile を指定して起動してください", severity="warning"
+            )
+            return
+        path = self._sampler.toggle()
+        if self._sampler.running:
+            self.notify("サンプリングを開始しました", severity="information")
+        elif path is not None:
+            self.notify(f"プロファイルを保存しました: {path}", severity="information")
+        else:
+            self.notify("サンプルがありません", severity="warning")
+
+    async def action_quit_app(self) -> None:
+        # 保存中の変更を書き終えてから終了する
+        await self.wait_for_save()
         self.exit()
 
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""schedules.json の圧縮形式（db.codecs）ごとのファイルサイズと読み書きの時間の計測。
+
+使い方:
+    python -m benchmarks.bench_codecs [--sizes 100k,1m] [--codecs none,gzip,zlib,lzma]
+                                      [--repeat 3] [--output codecs.json]
+
+合成データ（benchmarks.generator）を圧縮形式ごとに save_schedules で保存し、
+  - save_s / load_s:  save_schedules / load_schedules の所要時間（中央値など）
+  - bytes:            保存後の schedules.json のサイズ（ratio は none に対する比）
+  - backup_bytes:     保存を2回行った後の schedules.json.bak のサイズ
+を出力する。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import sys
+from pathlib import Path
+from typing import Any
+
+import db.store as store
+from benchmarks.generator import parse_size
+from benchmarks.run import (
+    CACHE_DIR,
+    calibrate,
+    dataset_dir,
+    environment,
+    measure,
+    store_data_dir,
+)
+from db.codecs import CODECS
+
+DEFAULT_SIZES = ("100k", "1m")
+
+
+def bench(n: int, codecs: list[str], repeat: int, seed: int = 0) -> list[dict[str, Any]]:
+    schedules_file = dataset_dir(n, seed) / "schedules.json"
+    results: list[dict[str, Any]] = []
+    plain_bytes = None
+    print(f"[BENCH] {n:,} 件", file=sys.stderr)
+    saved = store.COMPRESSION
+    try:
+        for codec in codecs:
+            work = CACHE_DIR / f"codec_work_n{n}_{codec}"
+            shutil.rmtree(work, ignore_errors=True)
+            work.mkdir(parents=True)
+            shutil.copyfile(schedules_file, work / "schedules.json")
+            with store_data_dir(work):
+                store.configure_compression({"compression": codec})
+                schedules = store.load_schedules()
+                save = measure(lambda: store.save_schedules(schedules), repeat)
+                size = store.SCHEDULE_FILE.stat().st_size
+                backup = store.SCHEDULE_FILE.with_suffix(".json.bak").stat().st_size
+                load = measure(store.load_schedules, repeat)
+                assert store.load_schedules() == schedules, "読み込んだ内容が一致しない"
+            shutil.rmtree(work, ignore_errors=True)
+            if codec == "none":
+                plain_bytes = size
+            results.append({
+                "name": f"codec.{codec}",
+                "records": n,
+                "codec": codec,
+                "bytes": size,
+                "backup_bytes": backup,
+                "ratio": size / plain_bytes if plain_bytes else None,
+                "save_s": save,
+                "load_s": load,
+            })
+            print(
+                f"  {codec:<5} {size / 1e6:9.2f} MB  save {save['median_s'] * 1000:9.1f} ms"
+                f"  load {load['median_s'] * 1000:9.1f} ms",
+                file=sys.stderr,
+            )
+    finally:
+        store.COMPRESSION = saved
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="圧縮形式ごとのサイズと読み書きの時間の計測")
+    parser.add_argument("--sizes", default=",".join(DEFAULT_SIZES), help="カンマ区切りの件数")
+    parser.add_argument("--codecs", default=",".join(CODECS), help="カンマ区切りの圧縮形式")
+    parser.add_argument("--repeat", type=int, default=3, help="繰り返し回数")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="結果 JSON の出力先")
+    args = parser.parse_args(argv)
+
+    codecs = [c for c in args.codecs.split(",") if c.strip()]
+    unknown = [c for c in codecs if c not in CODECS]
+    if unknown:
+        parser.error(f"未対応の圧縮形式: {', '.join(unknown)}")
+    # ratio の基準になるため none を先頭に置く
+    codecs.sort(key=lambda c: c != "none")
+
+    results: list[dict[str, Any]] = []
+    for size in args.sizes.split(","):
+        if size.strip():
+            results.extend(bench(parse_size(size), codecs, args.repeat, args.seed))
+    report = {
+        "environment": environment(),
+        "seed": args.seed,
+        "calibration_s": calibrate(),
+        "results": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+        print(f"[BENCH] 結果: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""日時パーサーのマイクロベンチマーク。
+
+使い方:
+    python -m benchmarks.bench_datetime_util [--count N]
+
+N 件（既定 100 万件）の日時文字列に対して以下を計測する:
+
+  - parse_datetime（メモ化なし）
+  - parse_datetime（メモ化あり、初回 / 2回目）
+  - parse_datetime（メモ化あり、1万件の作業集合を繰り返しパース — 描画時の呼び出しに相当）
+  - parse_many（datetime を生成しない一括検証＋ソートキー化）
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable
+
+from utils.datetime_util import _parse_cached, parse_datetime, parse_many
+
+
+def make_strings(n: int, seed: int = 0) -> list[str]:
+    """3形式が混在する日時文字列を n 件生成する（15 分刻み・約3年分）。"""
+    rng = random.Random(seed)
+    out: list[str] = []
+    for i in range(n):
+        raw = (
+            f"{rng.randint(24, 26):02d}{rng.randint(1, 12):02d}"
+            f"{rng.randint(1, 28):02d}_{rng.randint(0, 23):02d}"
+            f"{rng.choice((0, 15, 30, 45)):02d}"
+        )
+        kind = i % 3
+        if kind == 1:
+            raw = f"~{raw}"
+        elif kind == 2:
+            raw = f"{raw}~"
+        out.append(raw)
+    return out
+
+
+def _time(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(n: int) -> dict[str, float]:
+    """各パーサーの所要時間（秒）を返す。"""
+    strings = make_strings(n)
+    uncached = _parse_cached.__wrapped__
+
+    results: dict[str, float] = {}
+    results["parse_datetime (uncached)"] = _time(
+        lambda: [uncached(s) for s in strings]
+    )
+    _parse_cached.cache_clear()
+    results["parse_datetime (memo, cold)"] = _time(
+        lambda: [parse_datetime(s) for s in strings]
+    )
+    results["parse_datetime (memo, warm)"] = _time(
+        lambda: [parse_datetime(s) for s in strings]
+    )
+    hot = strings[:10_000] * (n // 10_000 or 1)
+    results["parse_datetime (memo, hot set)"] = _time(
+        lambda: [parse_datetime(s) for s in hot]
+    )
+    results["parse_many"] = _time(lambda: parse_many(strings))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="日時パーサーのマイクロベンチマーク")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    results = run(args.count)
+    print(f"strings: {args.count:,}")
+    for name, sec in results.items():
+        print(f"  {name:<30} {sec * 1000:9.1f} ms  ({sec / args.count * 1e9:6.0f} ns/op)")
+
+
+if __name__ == "__main__":
+    main()
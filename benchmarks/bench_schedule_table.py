@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""list[Schedule] と ScheduleTable の常駐メモリ (RSS) 比較。
+
+使い方:
+    python -m benchmarks.bench_schedule_table [--records N]
+
+各コンテナは別プロセスで構築し、構築前後の VmRSS の差分を測定する。
+レコードはジェネレータで1件ずつ生成するため、入力データ自体は差分に含まれない。
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+from benchmarks.generator import generate_records
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _rss_bytes() -> int:
+    """現在の常駐メモリ量 (バイト) を返す。"""
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+
+    # /proc が無い環境ではピーク値で代用する（macOS はバイト、Linux は KB）
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _measure(kind: str, n: int) -> dict[str, Any]:
+    """kind のコンテナを n 件で構築し、RSS 差分を返す（子プロセス側）。"""
+    from models.schedule import Schedule
+    from models.schedule_table import ScheduleTable
+
+    gc.collect()
+    before = _rss_bytes()
+    if kind == "list":
+        container: Any = [Schedule.from_dict(d) for d in generate_records(n)]
+    else:
+        container = ScheduleTable.from_dicts(generate_records(n))
+    gc.collect()
+    after = _rss_bytes()
+    assert len(container) == n
+    return {"kind": kind, "records": n, "rss_delta_bytes": after - before}
+
+
+def run(n: int) -> dict[str, Any]:
+    """両コンテナを別プロセスで測定し、結果をまとめて返す。"""
+    results: dict[str, Any] = {"records": n}
+    for kind in ("list", "table"):
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_schedule_table",
+             "--child", kind, "--records", str(n)],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        results[kind] = json.loads(out.stdout)["rss_delta_bytes"]
+    results["reduction"] = 1 - results["table"] / results["list"]
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="list[Schedule] と ScheduleTable の RSS 比較"
+    )
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--child", choices=("list", "table"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_measure(args.child, args.records)))
+        return
+
+    r = run(args.records)
+    mb = 1024 * 1024
+    print(f"records        : {r['records']:,}")
+    print(f"list[Schedule] : {r['list'] / mb:8.1f} MB")
+    print(f"ScheduleTable  : {r['table'] / mb:8.1f} MB")
+    print(f"reduction      : {r['reduction']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
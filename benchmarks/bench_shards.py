@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""複数ファイルの並列読み込み（db.loader）のスケーリング計測。
+
+使い方:
+    python -m benchmarks.bench_shards [--size 1m] [--workers 1,2,4,8] [--output results.json]
+
+合成データ（benchmarks.generator）を月ごとのファイルに分割し、
+  - sequential: 1ファイルずつ json.load → validate_schedule → ソートし、最後に全体をソート
+  - parallel:   db.loader.load_merged（ワーカー数ごと。1 はプロセスを起動しない）
+の所要時間を計測する。speedup は sequential に対する比、efficiency は speedup / ワーカー数。
+ワーカー数は CPU コア数までに制限する（それ以上はスケーリングの計測にならないため）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+from benchmarks.generator import generate_records, parse_size
+from benchmarks.run import CACHE_DIR, calibrate, environment, measure
+from db.loader import load_merged
+from db.schema import validate_schedule
+from models.schedule import Schedule
+from utils.datetime_util import parse_datetime, to_sort_key
+
+DEFAULT_WORKERS = (1, 2, 4, 8)
+
+
+def shard_dir(n: int, seed: int = 0) -> Path:
+    """n 件の合成データを月ごとに分割したディレクトリを返す（キャッシュ済みなら再利用）。"""
+    out = CACHE_DIR / f"shards_n{n}_s{seed}"
+    if out.exists():
+        return out
+    months: dict[str, list[dict[str, Any]]] = {}
+    for record in generate_records(n, seed):
+        key = record["date_time"].strip("~")[:4]
+        months.setdefault(key, []).append(record)
+    tmp = out.with_name(out.name + ".tmp")
+    tmp.mkdir(parents=True, exist_ok=True)
+    for key, records in months.items():
+        with open(tmp / f"20{key}.json", "w", encoding="utf-8") as f:
+            json.dump({"schedules": records}, f, ensure_ascii=False, indent=2)
+    tmp.rename(out)
+    return out
+
+
+def shard_paths(n: int, seed: int = 0) -> list[Path]:
+    return sorted(shard_dir(n, seed).glob("*.json"))
+
+
+def load_sequential(paths: list[Path]) -> list[Schedule]:
+    """比較対象: 1プロセスで順に読み込み、全体をソートする。"""
+    pairs: list[tuple[int, Schedule]] = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            records = json.load(f)["schedules"]
+        for record in records:
+            if validate_schedule(record):
+                continue
+            dt, _ = parse_datetime(record["date_time"].strip())
+            pairs.append((to_sort_key(dt), Schedule.from_dict(record)))
+    pairs.sort(key=lambda p: p[0])
+    return [s for _, s in pairs]
+
+
+def bench(n: int, workers: list[int], repeat: int, seed: int = 0) -> list[dict[str, Any]]:
+    paths = shard_paths(n, seed)
+    print(f"[BENCH] {n:,} 件 / {len(paths)} ファイル", file=sys.stderr)
+    results: list[dict[str, Any]] = []
+
+    baseline = measure(lambda: load_sequential(paths), repeat)
+    results.append({"name": "shards.sequential", "records": n, "workers": 1, **baseline})
+    print(
+        f"  sequential         median {baseline['median_s'] * 1000:10.2f} ms",
+        file=sys.stderr,
+    )
+
+    expected = [s.id for s in load_sequential(paths)]
+    for w in workers:
+        merged, _ = load_merged(paths, max_workers=w)
+        assert [s.id for s in merged] == expected, "マージ結果が逐次読み込みと一致しない"
+        stats = measure(lambda: load_merged(paths, max_workers=w), repeat)
+        speedup = baseline["median_s"] / stats["median_s"]
+        results.append({
+            "name": "shards.parallel",
+            "records": n,
+            "workers": w,
+            **stats,
+            "speedup": speedup,
+            "efficiency": speedup / w,
+        })
+        print(
+            f"  parallel x{w:<3}      median {stats['median_s'] * 1000:10.2f} ms"
+            f"  speedup {speedup:5.2f}  efficiency {speedup / w:5.2f}",
+            file=sys.stderr,
+        )
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="複数ファイルの並列読み込みの計測")
+    parser.add_argument("--size", default="1m", help="件数 (1k / 100k / 1m / 整数)")
+    parser.add_argument(
+        "--workers",
+        default=",".join(str(w) for w in DEFAULT_WORKERS),
+        help="カンマ区切りのワーカー数",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="繰り返し回数")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="結果 JSON の出力先")
+    args = parser.parse_args(argv)
+
+    cores = os.cpu_count() or 1
+    requested = {int(x) for x in args.workers.split(",") if x.strip()}
+    workers = sorted(w for w in requested if 1 <= w <= cores)
+    if not workers:
+        workers = [1]
+    if cores == 1:
+        print("[BENCH] CPU コアが1つのため、並列化の効果は計測できません", file=sys.stderr)
+
+    report = {
+        "environment": {**environment(), "cpu_count": cores},
+        "seed": args.seed,
+        "calibration_s": calibrate(),
+        "results": bench(parse_size(args.size), workers, args.repeat, args.seed),
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+        print(f"[BENCH] 結果: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""ScheduleApp のヘッドレス UI 操作レイテンシ計測。
+
+使い方:
+    python -m benchmarks.bench_ui [--sizes 10k,1m] [--samples N] [--output ui.json]
+
+Textual の ``App.run_test()`` と Pilot でアプリを操作し、操作ごとに
+「入力を送ってから、メッセージ処理と再描画（pilot.pause）が完了するまで」の時間を計測する。
+
+  - next_month / prev_month: ``>`` / ``<`` 押下 → 月が切り替わったカレンダーの描画
+  - day_click:               DayCell クリック → DetailView の更新
+  - form_submit:             追加フォームの「保存」クリック → 保存と両ペインの再描画
+
+結果はサイズ・操作ごとの p50 / p99（秒）を JSON で出力する。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import json
+import math
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from benchmarks.generator import parse_size
+from benchmarks.run import (
+    CACHE_DIR,
+    calibrate,
+    dataset_dir,
+    environment,
+    store_data_dir,
+)
+
+# サイズごとの既定サンプル数（1M 件ではフォーム保存1回に数十秒かかる）
+DEFAULT_SAMPLES = {10_000: 30, 1_000_000: 3}
+
+# 計測開始前に移動する月（合成データの期間内）
+START_DATE = datetime.date(2025, 1, 15)
+
+
+def percentile(samples: list[float], p: float) -> float:
+    """最近傍順位法で p パーセンタイルを返す。"""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(name: str, n: int, samples: list[float]) -> dict[str, Any]:
+    return {
+        "name": name,
+        "records": n,
+        "samples": len(samples),
+        "p50_s": percentile(samples, 50),
+        "p99_s": percentile(samples, 99),
+        "min_s": min(samples),
+        "max_s": max(samples),
+    }
+
+
+async def _timed(pilot, action: Callable[[], Awaitable[Any]]) -> float:
+    start = time.perf_counter()
+    await action()
+    await pilot.pause()
+    return time.perf_counter() - start
+
+
+async def bench_app(n: int, samples: int) -> list[dict[str, Any]]:
+    """n 件のデータで ScheduleApp を起動し、各操作のレイテンシを計測する。"""
+    from app import ScheduleApp
+    from ui.calendar_view import CalendarView, DayCell
+    from ui.detail_view import DetailView
+    from textual.widgets import Input
+
+    work = CACHE_DIR / f"ui_work_n{n}"
+    work.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(dataset_dir(n) / "schedules.json", work / "schedules.json")
+
+    timings: dict[str, list[float]] = {
+        "next_month": [],
+        "prev_month": [],
+        "day_click": [],
+        "form_submit": [],
+    }
+
+    with store_data_dir(work):
+        app = ScheduleApp()
+        async with app.run_test(size=(120, 50)) as pilot:
+            cal = app.query_one("#calendar-view", CalendarView)
+            detail = app.query_one("#detail-view", DetailView)
+            cal.select_date(START_DATE)
+            await pilot.pause()
+
+            for _ in range(samples):
+                month = (cal.current_year, cal.current_month)
+                timings["next_month"].append(
+                    await _timed(pilot, lambda: pilot.press("greater_than_sign"))
+                )
+                assert (cal.current_year, cal.current_month) != month
+            for _ in range(samples):
+                timings["prev_month"].append(
+                    await _timed(pilot, lambda: pilot.press("less_than_sign"))
+                )
+
+            for i in range(samples):
+                day = 1 + (i * 7) % 28
+                cell = next(c for c in cal.query(DayCell) if c.day == day)
+                timings["day_click"].append(
+                    await _timed(pilot, lambda: pilot.click(cell))
+                )
+                assert detail.selected_date == cell.date
+
+            for i in range(samples):
+                await pilot.press("a")
+                await pilot.pause()
+                form = app.screen
+                form.query_one("#input-time", Input).value = f"{9 + i % 10:02d}00"
+                form.query_one("#input-title", Input).value = f"ベンチマーク {i}"
+                timings["form_submit"].append(
+                    await _timed(pilot, lambda: pilot.click("#btn-save"))
+                )
+                assert app.screen is not form
+            # 保存はバックグラウンドで行われるため、終了前に書き終えるのを待つ
+            await app.wait_for_save()
+
+    return [summarize(f"ui.{name}", n, s) for name, s in timings.items()]
+
+
+def run(sizes: list[int], samples: int | None = None) -> dict[str, Any]:
+    results: list[dict[str, Any]] = []
+    calibration = calibrate()
+    for n in sizes:
+        k = samples or DEFAULT_SAMPLES.get(n, 10)
+        print(f"[BENCH-UI] {n:,} 件 (samples={k})", file=sys.stderr)
+        for r in asyncio.run(bench_app(n, k)):
+            print(
+                f"  {r['name']:<16} p50 {r['p50_s'] * 1000:10.2f} ms"
+                f"  p99 {r['p99_s'] * 1000:10.2f} ms",
+                file=sys.stderr,
+            )
+            results.append(r)
+    return {
+        "environment": environment(),
+        "calibration_s": calibration,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ScheduleApp の UI レイテンシ計測")
+    parser.add_argument("--sizes", default="10k,1m", help="カンマ区切りの件数")
+    parser.add_argument("--samples", type=int, default=None, help="操作ごとの計測回数")
+    parser.add_argument("--output", type=Path, default=None, help="結果 JSON の出力先")
+    args = parser.parse_args()
+
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    report = run(sizes, args.samples)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+        print(f"[BENCH-UI] 結果: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
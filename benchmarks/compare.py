@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""ベンチマーク結果の性能回帰ゲート。
+
+使い方:
+    python -m benchmarks.compare [--current results.json] [--baseline benchmarks/baseline.json]
+                                 [--threshold 0.3] [--threshold-for load_schedules=0.2 ...]
+                                 [--runs N] [--write-baseline]
+
+現在の結果 JSON（--current 省略時はベースラインと同じサイズでスイートを実行）を
+コミット済みのベースラインと比較する。各計測値（サンプルの最短値 ``min_s``）は
+結果ファイルの ``calibration_s``（固定処理の最短所要時間）で割ってマシン速度を
+正規化し、比率がしきい値を超えて遅くなったベンチマークが1つでもあれば
+終了コード 1 で終了する。
+共有マシンなど計測が揺れる環境では --runs で複数回実行し、実行ごとの値の最小値で
+比較する（遅くなる方向の揺れは他のプロセスの影響で、最小値が最も再現しやすい）。
+
+しきい値は benchmarks/gate.json の ``default_threshold`` と ``thresholds``
+（ベンチマーク名 → 許容する悪化率）で設定し、コマンドライン引数で上書きできる。
+``noisy`` を指定すると、1回が短い（``below_s`` 秒未満）・件数が多い
+（``min_records`` 件以上）エントリには、揺れを見込んだ広めのしきい値を使う
+（``thresholds`` で個別に指定したベンチマークには適用しない）::
+
+    "noisy": {"threshold": 0.5, "below_s": 0.001, "min_records": 100000}
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+BENCH_DIR = Path(__file__).resolve().parent
+BASELINE_FILE = BENCH_DIR / "baseline.json"
+GATE_FILE = BENCH_DIR / "gate.json"
+
+DEFAULT_THRESHOLD = 0.30
+
+
+@dataclass
+class Comparison:
+    """1ベンチマーク分の比較結果。"""
+
+    name: str
+    records: int
+    baseline: float          # 正規化済みの基準値
+    current: float | None    # 正規化済みの現在値（結果に無ければ None）
+    threshold: float
+
+    @property
+    def ratio(self) -> float | None:
+        """現在値 / 基準値（1.0 より大きいほど遅い）。"""
+        if self.current is None or self.baseline <= 0:
+            return None
+        return self.current / self.baseline
+
+    @property
+    def regressed(self) -> bool:
+        ratio = self.ratio
+        return ratio is not None and ratio > 1 + self.threshold
+
+
+@dataclass(frozen=True)
+class NoiseAllowance:
+    """計測が揺れやすいエントリに使う、広めのしきい値。"""
+
+    threshold: float
+    below_s: float = 0.0             # 基準値（正規化前）がこれ未満なら揺れやすい
+    min_records: int | None = None   # 件数がこれ以上なら揺れやすい
+
+    def applies(self, seconds: float, records: int) -> bool:
+        return seconds < self.below_s or (
+            self.min_records is not None and records >= self.min_records
+        )
+
+
+def _metric_field(entry: dict[str, Any]) -> str:
+    """結果エントリの比較に使う代表値のキー（最短値 / 中央値 / p50 の順に探す）。"""
+    for field in ("min_s", "median_s"):
+        if field in entry:
+            return field
+    return "p50_s"
+
+
+def _metric(entry: dict[str, Any]) -> float:
+    """結果エントリから比較に使う代表値を取り出す。"""
+    return entry[_metric_field(entry)]
+
+
+def _normalized(report: dict[str, Any]) -> dict[tuple[str, int], float]:
+    """(名前, 件数) → キャリブレーション値で割った計測値。"""
+    calibration = report.get("calibration_s") or 1.0
+    return {
+        (e["name"], e["records"]): _metric(e) / calibration
+        for e in report.get("results", [])
+    }
+
+
+def merge_reports(reports: list[dict[str, Any]]) -> dict[str, Any]:
+    """複数回の実行結果を、エントリごと（とキャリブレーション値）の最小値で1つにまとめる。"""
+    if len(reports) == 1:
+        return reports[0]
+    merged = dict(reports[0])
+    merged["calibration_s"] = min(r.get("calibration_s") or 1.0 for r in reports)
+    results: list[dict[str, Any]] = []
+    for entry in reports[0]["results"]:
+        key = (entry["name"], entry["records"])
+        values = [
+            _metric(e)
+            for r in reports
+            for e in r["results"]
+            if (e["name"], e["records"]) == key
+        ]
+        results.append({**entry, _metric_field(entry): min(values), "runs": len(values)})
+    merged["results"] = results
+    return merged
+
+
+def compare(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    thresholds: dict[str, float] | None = None,
+    default_threshold: float = DEFAULT_THRESHOLD,
+    noise: NoiseAllowance | None = None,
+) -> list[Comparison]:
+    """ベースラインと現在の結果を比較する。
+
+    thresholds で名前を指定したベンチマークは常にそのしきい値を使う。それ以外で
+    noise に当てはまるエントリは、既定しきい値と noise.threshold の大きいほうを使う。
+    """
+    thresholds = thresholds or {}
+    raw = {(e["name"], e["records"]): _metric(e) for e in baseline.get("results", [])}
+    base = _normalized(baseline)
+    cur = _normalized(current)
+    comparisons: list[Comparison] = []
+    for (name, records), value in base.items():
+        if name in thresholds:
+            threshold = thresholds[name]
+        elif noise is not None and noise.applies(raw[name, records], records):
+            threshold = max(default_threshold, noise.threshold)
+        else:
+            threshold = default_threshold
+        comparisons.append(
+            Comparison(
+                name=name,
+                records=records,
+                baseline=value,
+                current=cur.get((name, records)),
+                threshold=threshold,
+            )
+        )
+    return comparisons
+
+
+def load_gate(path: Path = GATE_FILE) -> tuple[float, dict[str, float]]:
+    """gate.json から (既定しきい値, ベンチマーク別しきい値) を読み込む。"""
+    if not path.exists():
+        return DEFAULT_THRESHOLD, {}
+    with open(path, "r", encoding="utf-8") as f:
+        gate = json.load(f)
+    return (
+        float(gate.get("default_threshold", DEFAULT_THRESHOLD)),
+        {k: float(v) for k, v in gate.get("thresholds", {}).items()},
+    )
+
+
+def load_noise(path: Path = GATE_FILE) -> NoiseAllowance | None:
+    """gate.json の noisy（揺れやすいエントリのしきい値）を読み込む。未設定なら None。"""
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        noisy = json.load(f).get("noisy")
+    if noisy is None:
+        return None
+    min_records = noisy.get("min_records")
+    return NoiseAllowance(
+        threshold=float(noisy["threshold"]),
+        below_s=float(noisy.get("below_s", 0.0)),
+        min_records=int(min_records) if min_records is not None else None,
+    )
+
+
+def format_report(comparisons: list[Comparison]) -> str:
+    lines = [f"{'benchmark':<28} {'records':>9} {'ratio':>7} {'limit':>7}  result"]
+    for c in comparisons:
+        ratio = c.ratio
+        if ratio is None:
+            status, ratio_str = "MISSING", "-"
+        else:
+            status = "REGRESSED" if c.regressed else "ok"
+            ratio_str = f"{ratio:.2f}"
+        lines.append(
+            f"{c.name:<28} {c.records:>9,} {ratio_str:>7} {1 + c.threshold:>7.2f}  {status}"
+        )
+    return "\n".join(lines)
+
+
+def _parse_overrides(items: list[str]) -> dict[str, float]:
+    overrides: dict[str, float] = {}
+    for item in items:
+        name, sep, value = item.partition("=")
+        if not sep:
+            raise SystemExit(f"--threshold-for は NAME=VALUE 形式で指定してください: {item!r}")
+        overrides[name] = float(value)
+    return overrides
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="ベンチマークの性能回帰ゲート")
+    parser.add_argument("--current", type=Path, default=None, help="現在の結果 JSON")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--gate", type=Path, default=GATE_FILE, help="しきい値設定")
+    parser.add_argument("--threshold", type=float, default=None, help="既定しきい値")
+    parser.add_argument(
+        "--threshold-for",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="ベンチマーク別しきい値（複数指定可）",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="--current 省略時にスイートを実行する回数（最小値でまとめる）",
+    )
+    parser.add_argument(
+        "--write-baseline",
+        action="store_true",
+        help="現在の結果でベースラインを上書きして終了",
+    )
+    args = parser.parse_args(argv)
+
+    baseline: dict[str, Any] | None = None
+    if args.baseline.exists():
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    if args.current:
+        with open(args.current, "r", encoding="utf-8") as f:
+            current = json.load(f)
+    else:
+        from benchmarks.run import run
+
+        sizes = sorted({e["records"] for e in (baseline or {}).get("results", [])})
+        current = merge_reports([run(sizes or [1_000]) for _ in range(args.runs)])
+
+    if args.write_baseline:
+        args.baseline.write_text(
+            json.dumps(current, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+        )
+        print(f"[GATE] ベースラインを更新しました: {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print(f"[GATE] ベースラインがありません: {args.baseline}", file=sys.stderr)
+        return 2
+
+    default_threshold, thresholds = load_gate(args.gate)
+    if args.threshold is not None:
+        default_threshold = args.threshold
+    thresholds.update(_parse_overrides(args.threshold_for))
+
+    comparisons = compare(
+        baseline, current, thresholds, default_threshold, load_noise(args.gate)
+    )
+    print(format_report(comparisons))
+    regressed = [c for c in comparisons if c.regressed]
+    if regressed:
+        print(f"\n[GATE] 性能回帰 {len(regressed)} 件", file=sys.stderr)
+        return 1
+    print("\n[GATE] OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""ベンチマーク用の合成 schedules.json ジェネレータ。
+
+使い方:
+    python -m benchmarks.generator --size 100k --out /tmp/schedules.json [--seed 0]
+
+同じ件数・シードからは常に同じバイト列が生成される（乱数は random.Random(seed) のみ使用）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import random
+from pathlib import Path
+from typing import Any, Iterator
+
+from utils.datetime_util import format_datetime
+
+# ベンチマークで使う標準サイズ
+SIZES: dict[str, int] = {
+    "1k": 1_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+_TITLES = (
+    "チームミーティング",
+    "朝会",
+    "週次定例",
+    "コードレビュー",
+    "1on1（{person}さん）",
+    "{client}様 打ち合わせ",
+    "{project} リリース作業",
+    "{project} 設計レビュー",
+    "締め切り: {project} 見積書",
+    "歯医者",
+    "美容院",
+    "ジム",
+    "ランチ（{person}さん）",
+    "飲み会 @{place}",
+    "{place}へ外出",
+    "出張（{place}）",
+    "病院の予約",
+    "子どもの迎え",
+    "燃えないゴミの日",
+    "家賃の振込",
+)
+
+_MEMOS = (
+    "Q1計画策定",
+    "議題: {project} の進捗確認",
+    "PR #{number}",
+    "{place}方面",
+    "資料を事前に共有すること",
+    "Zoom URL はカレンダー招待を参照",
+    "持ち物: 保険証",
+    "{person}さんに確認済み",
+    "会議室 {number}F",
+    "雨天の場合は延期",
+)
+
+_PEOPLE = ("佐藤", "鈴木", "高橋", "田中", "伊藤", "渡辺", "山本", "中村", "小林", "加藤")
+_CLIENTS = ("山田商事", "東都銀行", "北斗製作所", "みなと物流", "さくら電機")
+_PROJECTS = ("会計システム", "新人研修", "社内ポータル", "決算", "採用サイト", "在庫管理")
+_PLACES = ("渋谷", "新宿", "品川", "大阪", "名古屋", "横浜", "福岡", "札幌")
+
+# 業務時間帯に偏った時刻分布
+_HOURS = (7, 8, 9, 9, 10, 10, 10, 11, 11, 12, 13, 13, 14, 14, 15, 15, 16, 16, 17, 18, 19, 20, 21)
+_MINUTES = (0, 0, 0, 15, 30, 30, 45)
+
+_START = datetime.date(2024, 1, 1)
+_SPAN_DAYS = 365 * 3
+
+
+def _fill(rng: random.Random, template: str) -> str:
+    return template.format(
+        person=rng.choice(_PEOPLE),
+        client=rng.choice(_CLIENTS),
+        project=rng.choice(_PROJECTS),
+        place=rng.choice(_PLACES),
+        number=rng.randint(1, 999),
+    )
+
+
+def generate_records(n: int, seed: int = 0) -> Iterator[dict[str, Any]]:
+    """schedules.json 形式のレコードを n 件、決定的に生成する。"""
+    rng = random.Random(seed)
+    for _ in range(n):
+        day = _START + datetime.timedelta(days=rng.randrange(_SPAN_DAYS))
+        dt = datetime.datetime(
+            day.year, day.month, day.day, rng.choice(_HOURS), rng.choice(_MINUTES)
+        )
+        r = rng.random()
+        dt_type = "exact" if r < 0.8 else ("until" if r < 0.9 else "from")
+        created = dt - datetime.timedelta(
+            days=rng.randint(0, 60), minutes=rng.randint(0, 1439)
+        )
+        yield {
+            "id": f"{rng.getrandbits(32):08x}",
+            "date_time": format_datetime(dt, dt_type),
+            "date_time_type": dt_type,
+            "title": _fill(rng, rng.choice(_TITLES)),
+            "memo": _fill(rng, rng.choice(_MEMOS)) if rng.random() < 0.6 else "",
+            "created_at": format_datetime(created),
+        }
+
+
+def parse_size(size: str) -> int:
+    """件数指定（"1k" / "100k" / "1m" / 整数文字列）を件数に変換する。"""
+    key = size.strip().lower()
+    if key in SIZES:
+        return SIZES[key]
+    if key.endswith("k"):
+        return int(key[:-1]) * 1_000
+    if key.endswith("m"):
+        return int(key[:-1]) * 1_000_000
+    return int(key)
+
+
+def write_dataset(path: Path, n: int, seed: int = 0) -> Path:
+    """n 件の schedules.json を path に書き出す（save_schedules と同じ書式）。"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"schedules": list(generate_records(n, seed))}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ベンチマーク用 schedules.json の生成")
+    parser.add_argument("--size", default="1k", help="件数 (1k / 100k / 1m / 整数)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, required=True, help="出力先ファイル")
+    args = parser.parse_args()
+
+    n = parse_size(args.size)
+    write_dataset(args.out, n, args.seed)
+    print(f"[GEN] {n:,} 件 → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""tracemalloc による起動〜操作フェーズ別のメモリプロファイル。
+
+使い方:
+    python -m benchmarks.profile_memory [--size 100k] [--top 10]
+                                        [--group-by lineno|filename|traceback]
+                                        [--output memory.json]
+
+合成データ（benchmarks.generator）で ScheduleApp をヘッドレス起動し、
+次のフェーズの前後で tracemalloc のスナップショットを取る。
+
+  - load_schedules:      JSON 読み込みと Schedule 生成（json.load の中間 dict を含む）
+  - index_build:         ScheduleRepository（id・日付の索引と OccupancyIndex）の構築
+  - first_refresh_views: 初回の _refresh_views と、DayCell のマウント・描画完了まで
+  - month_navigation:    表示月の全日付をクリックし、翌月へ移動するまで
+
+フェーズごとに以下を出力する。
+
+  - peak:     フェーズ中のピーク使用量（開始時点からの増分）
+  - retained: フェーズ終了時点で残っている増分
+  - top:      retained の割り当て箇所上位（--group-by の単位で集計）
+
+peak と retained の差はフェーズ内で解放された一時オブジェクト
+（json.load の中間 dict など）の量の目安になる。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import datetime
+import fnmatch
+import gc
+import json
+import shutil
+import sys
+import sysconfig
+import tracemalloc
+from pathlib import Path
+from typing import Any, Iterator
+
+from benchmarks.generator import parse_size
+from benchmarks.run import CACHE_DIR, dataset_dir, environment, store_data_dir
+
+# 計測開始時に表示する月（合成データの期間内）
+START_DATE = datetime.date(2025, 1, 15)
+
+# tracemalloc 自身やインポート機構の割り当ては集計から除く
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _ignored(traceback: tracemalloc.Traceback) -> bool:
+    """_IGNORED で除く割り当て箇所か（tracemalloc.Filter と同じく最も新しいフレームで判定）。"""
+    filename = traceback[-1].filename
+    return any(fnmatch.fnmatch(filename, f.filename_pattern) for f in _IGNORED)
+
+
+class MemoryProfiler:
+    """フェーズごとに tracemalloc のスナップショット差分を記録する。"""
+
+    def __init__(self, group_by: str = "lineno", top: int = 10) -> None:
+        self.group_by = group_by
+        self.top = top
+        self.phases: list[dict[str, Any]] = []
+        self._current: tuple[str, tracemalloc.Snapshot, int] | None = None
+
+    def begin(self, name: str) -> None:
+        """フェーズを開始する（ピーク値をリセットし、開始時点のスナップショットを取る）。"""
+        if self._current is not None:
+            raise RuntimeError(f"フェーズ {self._current[0]!r} が終了していません")
+        gc.collect()
+        before = tracemalloc.take_snapshot()
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        self._current = (name, before, start)
+
+    def end(self) -> dict[str, Any]:
+        """フェーズを終了し、ピーク・残存量・割り当て箇所上位を記録して返す。"""
+        if self._current is None:
+            raise RuntimeError("開始されたフェーズがありません")
+        name, before, start = self._current
+        self._current = None
+        current, peak = tracemalloc.get_traced_memory()
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+
+        # filter_traces は全トレースを Python で照合するため遅い。集計後の箇所で除く
+        diff = [
+            s for s in after.compare_to(before, self.group_by)
+            if s.size_diff > 0 and not _ignored(s.traceback)
+        ]
+        phase = {
+            "name": name,
+            "peak_bytes": peak - start,
+            "retained_bytes": current - start,
+            "top": [
+                {
+                    "site": _format_site(stat.traceback, self.group_by),
+                    "size_bytes": stat.size_diff,
+                    "count": stat.count_diff,
+                }
+                for stat in diff[: self.top]
+            ],
+        }
+        self.phases.append(phase)
+        return phase
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end()
+
+
+def _format_site(traceback: tracemalloc.Traceback, group_by: str) -> str:
+    """割り当て箇所をプロジェクトルートからの相対パスで表す。"""
+    frames = []
+    for frame in traceback:
+        filename = _relative(frame.filename)
+        frames.append(filename if group_by == "filename" else f"{filename}:{frame.lineno}")
+    return " <- ".join(frames)
+
+
+_PROJECT_ROOT = str(Path(__file__).resolve().parent.parent) + "/"
+_STDLIB = sysconfig.get_paths()["stdlib"] + "/"
+
+
+def _relative(filename: str) -> str:
+    """プロジェクト・標準ライブラリ・site-packages からの相対パスに短縮する。"""
+    marker = "site-packages/"
+    idx = filename.find(marker)
+    if idx >= 0:
+        return filename[idx + len(marker):]
+    for prefix in (_PROJECT_ROOT, _STDLIB):
+        if filename.startswith(prefix):
+            return filename[len(prefix):]
+    return filename
+
+
+def _profiled_app_class(profiler: MemoryProfiler) -> type:
+    """起動処理の各段階をフェーズとして記録する ScheduleApp のサブクラスを返す。"""
+    from app import ScheduleApp
+    from db.store import LoadReport, aload_schedules_versioned
+
+    class ProfiledScheduleApp(ScheduleApp):
+        _first_refresh = True
+
+        async def _load_data(self, report: LoadReport | None = None) -> None:
+            with profiler.phase("load_schedules"):
+                schedules, self._version = await aload_schedules_versioned(report=report)
+            with profiler.phase("index_build"):
+                self._base = schedules
+                self._repo.reset(schedules)
+
+        def _refresh_views(self) -> None:
+            # DayCell のマウントは次のメッセージ処理で行われるため、
+            # フェーズの終了は pilot.pause() の後（profile_app 側）で行う
+            if self._first_refresh:
+                self._first_refresh = False
+                profiler.begin("first_refresh_views")
+            super()._refresh_views()
+
+    return ProfiledScheduleApp
+
+
+async def profile_app(n: int, profiler: MemoryProfiler) -> None:
+    """n 件のデータでアプリを起動し、各フェーズを記録する。"""
+    from ui.calendar_view import CalendarView, DayCell
+
+    work = CACHE_DIR / f"mem_work_n{n}"
+    work.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(dataset_dir(n) / "schedules.json", work / "schedules.json")
+
+    with store_data_dir(work):
+        app = _profiled_app_class(profiler)()
+        async with app.run_test(size=(120, 50)) as pilot:
+            await pilot.pause()
+            profiler.end()
+
+            cal = app.query_one("#calendar-view", CalendarView)
+            cal.select_date(START_DATE)
+            await pilot.pause()
+
+            with profiler.phase("month_navigation"):
+                days = [c.day for c in cal.query(DayCell) if c.day]
+                for day in days:
+                    cell = next(c for c in cal.query(DayCell) if c.day == day)
+                    await pilot.click(cell)
+                    await pilot.pause()
+                await pilot.press("greater_than_sign")
+                await pilot.pause()
+
+
+def run(n: int, group_by: str = "lineno", top: int = 10, frames: int = 1) -> dict[str, Any]:
+    """n 件のデータでプロファイルを取り、結果の dict を返す。"""
+    # データ生成はプロファイル対象外（tracemalloc 下では遅いため先に済ませる）
+    dataset_dir(n)
+    profiler = MemoryProfiler(group_by=group_by, top=top)
+    tracemalloc.start(frames)
+    try:
+        asyncio.run(profile_app(n, profiler))
+    finally:
+        tracemalloc.stop()
+    return {
+        "environment": environment(),
+        "records": n,
+        "group_by": group_by,
+        "phases": profiler.phases,
+    }
+
+
+def format_report(report: dict[str, Any]) -> str:
+    mb = 1024 * 1024
+    lines = [f"records: {report['records']:,}"]
+    for phase in report["phases"]:
+        lines.append("")
+        lines.append(
+            f"== {phase['name']}: peak {phase['peak_bytes'] / mb:.1f} MB, "
+            f"retained {phase['retained_bytes'] / mb:.1f} MB"
+        )
+        for site in phase["top"]:
+            lines.append(
+                f"  {site['size_bytes'] / mb:9.2f} MB {site['count']:>10,}  {site['site']}"
+            )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="フェーズ別メモリプロファイル")
+    parser.add_argument("--size", default="100k", help="件数 (例: 10k, 100k, 1m)")
+    parser.add_argument("--top", type=int, default=10, help="表示する割り当て箇所の数")
+    parser.add_argument(
+        "--group-by",
+        choices=("lineno", "filename", "traceback"),
+        default="lineno",
+        help="割り当て箇所の集計単位",
+    )
+    parser.add_argument(
+        "--frames",
+        type=int,
+        default=None,
+        help="記録するスタックの深さ（既定: traceback 集計時 10、それ以外 1）",
+    )
+    parser.add_argument("--output", type=Path, default=None, help="結果 JSON の出力先")
+    args = parser.parse_args()
+
+    frames = args.frames or (10 if args.group_by == "traceback" else 1)
+    report = run(parse_size(args.size), args.group_by, args.top, frames)
+    print(format_report(report))
+    if args.output:
+        args.output.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+        )
+        print(f"\n[MEM] 結果: {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
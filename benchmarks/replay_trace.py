@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""入力トレースのヘッドレス再生とイベントごとの処理レイテンシ計測。
+
+使い方:
+    python -m benchmarks.replay_trace TRACE --data schedules.json
+                                      [--pace fast|recorded] [--strict] [--output replay.json]
+
+``python main.py --record-trace`` で記録したトレースを、指定したデータファイルの
+コピーに対して ``App.run_test()`` で再生する。端末サイズと開始日付はトレースの
+ヘッダーに合わせる。各イベントは実際のドライバーと同じく App にメッセージとして
+送り、「送信してから、メッセージ処理と再描画（pilot.pause）が完了するまで」を
+そのイベントの処理レイテンシとして記録する。
+
+  --pace fast:     前のイベントの処理完了後すぐに次を送る（既定）
+  --pace recorded: 記録時の時刻どおりに送る。処理が追いつかない場合の遅れも lag として記録する
+
+データファイルの指紋がトレースと異なる場合は警告を出す（--strict ではエラー終了）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import json
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from benchmarks.bench_ui import percentile
+from benchmarks.run import CACHE_DIR, environment, store_data_dir
+from utils.trace import dataset_fingerprint, read_trace, record_to_event
+
+
+def event_label(record: dict[str, Any]) -> str:
+    """集計用のイベント名（キーはキー名ごと、マウスは種別ごと）。"""
+    if record["type"] == "key":
+        return f"key:{record['key']}"
+    return record["type"]
+
+
+async def replay(
+    header: dict[str, Any],
+    records: list[dict[str, Any]],
+    data_file: Path,
+    pace: str = "fast",
+) -> list[dict[str, Any]]:
+    """トレースを再生し、イベントごとの計測結果を返す。"""
+    from app import ScheduleApp
+    from ui.calendar_view import CalendarView
+
+    work = CACHE_DIR / "replay_work"
+    work.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(data_file, work / "schedules.json")
+
+    width, height = header["size"]
+    start_date = datetime.date.fromisoformat(header["start_date"])
+    results: list[dict[str, Any]] = []
+
+    with store_data_dir(work):
+        app = ScheduleApp()
+        async with app.run_test(size=(width, height)) as pilot:
+            app.query_one("#calendar-view", CalendarView).select_date(start_date)
+            await pilot.pause()
+
+            origin = time.perf_counter()
+            for i, record in enumerate(records):
+                lag = 0.0
+                if pace == "recorded":
+                    delay = record["t"] - (time.perf_counter() - origin)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    else:
+                        lag = -delay
+                start = time.perf_counter()
+                app.post_message(record_to_event(record))
+                await pilot.pause()
+                results.append({
+                    "index": i,
+                    "label": event_label(record),
+                    "t": record["t"],
+                    "latency_s": time.perf_counter() - start,
+                    "lag_s": lag,
+                })
+                if not app.is_running:
+                    # トレース内の q などでアプリが終了した
+                    break
+    return results
+
+
+def summarize(results: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """イベント名ごと（と全体）の p50 / p99 / 最大レイテンシを返す。"""
+    groups: dict[str, list[float]] = {}
+    for r in results:
+        groups.setdefault(r["label"], []).append(r["latency_s"])
+    if results:
+        groups["(all)"] = [r["latency_s"] for r in results]
+    return [
+        {
+            "label": label,
+            "count": len(samples),
+            "p50_s": percentile(samples, 50),
+            "p99_s": percentile(samples, 99),
+            "max_s": max(samples),
+        }
+        for label, samples in sorted(groups.items())
+    ]
+
+
+def format_report(report: dict[str, Any], slowest: int = 10) -> str:
+    lines = [
+        f"{'event':<28} {'count':>6} {'p50':>9} {'p99':>9} {'max':>9}  (ms)"
+    ]
+    for s in report["summary"]:
+        lines.append(
+            f"{s['label']:<28} {s['count']:>6} {s['p50_s'] * 1000:>9.2f} "
+            f"{s['p99_s'] * 1000:>9.2f} {s['max_s'] * 1000:>9.2f}"
+        )
+    worst = sorted(report["events"], key=lambda r: r["latency_s"], reverse=True)
+    if worst:
+        lines.append("")
+        lines.append(f"slowest {min(slowest, len(worst))} events:")
+        for r in worst[:slowest]:
+            lines.append(
+                f"  #{r['index']:<5} t={r['t']:8.3f}s  {r['label']:<24} "
+                f"{r['latency_s'] * 1000:9.2f} ms  lag {r['lag_s'] * 1000:8.2f} ms"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="入力トレースの再生とレイテンシ計測")
+    parser.add_argument("trace", type=Path, help="記録したトレース (trace_*.jsonl)")
+    parser.add_argument("--data", type=Path, required=True, help="再生に使う schedules.json")
+    parser.add_argument("--pace", choices=("fast", "recorded"), default="fast")
+    parser.add_argument("--strict", action="store_true", help="データの指紋が異なればエラー")
+    parser.add_argument("--output", type=Path, default=None, help="結果 JSON の出力先")
+    args = parser.parse_args(argv)
+
+    header, records = read_trace(args.trace)
+    fingerprint = dataset_fingerprint(args.data)
+    recorded = header.get("dataset", {})
+    if fingerprint["sha256"] != recorded.get("sha256"):
+        print(
+            f"[REPLAY] データの指紋が記録時と異なります "
+            f"(記録時 {recorded.get('bytes', 0):,} bytes, 指定 {fingerprint['bytes']:,} bytes)",
+            file=sys.stderr,
+        )
+        if args.strict:
+            return 2
+
+    print(f"[REPLAY] {len(records)} イベント (pace={args.pace})", file=sys.stderr)
+    results = asyncio.run(replay(header, records, args.data, args.pace))
+    report = {
+        "environment": environment(),
+        "trace": str(args.trace),
+        "dataset": fingerprint,
+        "dataset_matches": fingerprint["sha256"] == recorded.get("sha256"),
+        "pace": args.pace,
+        "summary": summarize(results),
+        "events": results,
+    }
+    print(format_report(report))
+    if args.output:
+        args.output.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+        )
+        print(f"[REPLAY] 結果: {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
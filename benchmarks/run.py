@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""store / query / model のベンチマークスイート。
+
+使い方:
+    python -m benchmarks.run [--sizes 1k,100k,1m] [--output results.json]
+
+サイズごとに合成データ（benchmarks.generator）を作成し、以下を計測する:
+
+  load_schedules, save_schedules, filter_by_date, dates_with_schedules,
+  search_schedules, validate_schedule / validate_records（全レコード）
+
+結果は機械可読な JSON として --output（省略時は標準出力）に書き出す。
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import db.store as store
+from benchmarks.generator import SIZES, parse_size, write_dataset
+from db.query import dates_with_schedules, filter_by_date, search_schedules
+from db.schema import validate_records, validate_schedule
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = PROJECT_ROOT / "benchmarks" / ".cache"
+
+# サイズごとの既定の繰り返し回数（大きいデータは1回の計測が長い）
+DEFAULT_REPEAT = {1_000: 20, 100_000: 5, 1_000_000: 1}
+
+
+@contextlib.contextmanager
+def store_data_dir(data_dir: Path) -> Iterator[Path]:
+    """db.store の読み書き先を一時的に data_dir に切り替える。"""
+    saved = (store.DATA_DIR, store.SCHEDULE_FILE, store.CONFIG_FILE)
+    store.DATA_DIR = data_dir
+    store.SCHEDULE_FILE = data_dir / "schedules.json"
+    store.CONFIG_FILE = data_dir / "config.json"
+    try:
+        yield data_dir
+    finally:
+        store.DATA_DIR, store.SCHEDULE_FILE, store.CONFIG_FILE = saved
+
+
+def dataset_dir(n: int, seed: int = 0) -> Path:
+    """n 件の合成データを含むデータディレクトリを返す（キャッシュ済みなら再利用）。"""
+    data_dir = CACHE_DIR / f"n{n}_s{seed}"
+    schedule_file = data_dir / "schedules.json"
+    if not schedule_file.exists():
+        write_dataset(schedule_file, n, seed)
+    return data_dir
+
+
+# 1サンプルあたりの最短計測時間。これより速い処理は複数回まとめて計測する
+MIN_SAMPLE_S = 0.1
+
+
+def _autorange(fn: Callable[[], Any]) -> int:
+    """1サンプルが MIN_SAMPLE_S 以上になる呼び出し回数を返す（timeit の autorange 相当）。"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= MIN_SAMPLE_S:
+            return number
+        number *= 2
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> dict[str, float]:
+    """fn を repeat サンプル分実行し、1回あたりの所要時間の統計（秒）を返す。
+
+    timeit と同じく計測中は GC を止める（読み込んだ全件を走査する世代別 GC の
+    発生タイミングで、サンプルごとの値が大きく揺れるため）。
+    """
+    number = _autorange(fn)
+    samples: list[float] = []
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            samples.append((time.perf_counter() - start) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {
+        "repeat": repeat,
+        "number": number,
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.fmean(samples),
+        "max_s": max(samples),
+    }
+
+
+def bench_size(n: int, repeat: int, seed: int = 0) -> list[dict[str, Any]]:
+    """1サイズ分のベンチマークを実行する。"""
+    src = dataset_dir(n, seed)
+    work = CACHE_DIR / f"work_n{n}"
+    work.mkdir(parents=True, exist_ok=True)
+    (work / "schedules.json").write_bytes((src / "schedules.json").read_bytes())
+
+    results: list[dict[str, Any]] = []
+
+    def record(name: str, fn: Callable[[], Any]) -> None:
+        stats = measure(fn, repeat)
+        results.append({"name": name, "records": n, **stats})
+        print(f"  {name:<22} median {stats['median_s'] * 1000:10.2f} ms", file=sys.stderr)
+
+    with store_data_dir(work):
+        schedules = store.load_schedules()
+        with open(work / "schedules.json", encoding="utf-8") as f:
+            raw_records = json.load(f)["schedules"]
+        # データ中で最も件数の多い日付（描画時の典型的な問い合わせ）
+        counts: dict[str, int] = {}
+        for s in schedules:
+            counts[s.date_key] = counts.get(s.date_key, 0) + 1
+        busiest = max(counts, key=counts.get) if counts else "260101"
+        target = datetime.date(2000 + int(busiest[:2]), int(busiest[2:4]), int(busiest[4:6]))
+
+        record("load_schedules", store.load_schedules)
+        record("save_schedules", lambda: store.save_schedules(schedules))
+        record("filter_by_date", lambda: filter_by_date(schedules, target))
+        record("dates_with_schedules", lambda: dates_with_schedules(schedules))
+        record("search_schedules", lambda: search_schedules(schedules, "打ち合わせ"))
+        record(
+            "validate_schedule",
+            lambda: [validate_schedule(d) for d in raw_records],
+        )
+        record("validate_records", lambda: validate_records(raw_records))
+    return results
+
+
+def _calibration_workload() -> None:
+    """マシン速度の目安となる固定の純 Python 処理（文字列・dict・ソート・JSON）。"""
+    data = [{"key": f"{i:08d}", "value": i * 7919 % 1000} for i in range(20_000)]
+    data.sort(key=lambda d: d["value"])
+    json.dumps(data, ensure_ascii=False)
+    sum(int(d["key"][2:6]) for d in data)
+
+
+def calibrate(repeat: int = 15) -> float:
+    """キャリブレーション処理の所要時間の最短値（秒）を返す。
+
+    比較時は各ベンチマークの最短値をこの値で割り、マシン速度の差を正規化する。
+    共有マシンでは中央値が他のプロセスの影響で 1.5 倍以上揺れるが、最短値はほぼ揺れない。
+    """
+    return measure(_calibration_workload, repeat)["min_s"]
+
+
+def environment() -> dict[str, Any]:
+    """計測環境の情報を返す。"""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def run(sizes: list[int], repeat: int | None = None, seed: int = 0) -> dict[str, Any]:
+    """指定サイズのベンチマークを実行し、結果の dict を返す。"""
+    results: list[dict[str, Any]] = []
+    calibration = calibrate()
+    print(f"[BENCH] calibration {calibration * 1000:.2f} ms", file=sys.stderr)
+    for n in sizes:
+        r = repeat or DEFAULT_REPEAT.get(n, 3)
+        print(f"[BENCH] {n:,} 件 (repeat={r})", file=sys.stderr)
+        results.extend(bench_size(n, r, seed))
+    return {
+        "environment": environment(),
+        "seed": seed,
+        "calibration_s": calibration,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="store / query / model のベンチマーク")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(SIZES),
+        help="カンマ区切りの件数 (例: 1k,100k,1m)",
+    )
+    parser.add_argument("--repeat", type=int, default=None, help="繰り返し回数")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="結果 JSON の出力先")
+    args = parser.parse_args()
+
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    report = run(sizes, args.repeat, args.seed)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+        print(f"[BENCH] 結果: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
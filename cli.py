@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""常駐サーバー（python -m db.daemon）を使うコマンドラインクライアント。
+
+使い方:
+    python cli.py [--socket PATH] status
+    python cli.py day [YYYY-MM-DD]
+    python cli.py range START END
+    python cli.py search QUERY
+    python cli.py add YYMMDD_HHMM TITLE [--memo MEMO]
+    python cli.py delete ID
+    python cli.py watch
+
+データはサーバーが保持しているため、起動時にデータファイルを読み込まない。
+watch は他のクライアントによる変更を受信するたびに1行表示する（Ctrl+C で終了）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import sys
+import threading
+from pathlib import Path
+from typing import Any
+
+from db.client import DaemonClient, DaemonError
+from db.daemon import default_socket_path
+from db.protocol import change_from_wire
+from models.schedule import Schedule
+from utils.datetime_util import (
+    format_datetime,
+    format_time_display,
+    parse_datetime,
+)
+
+
+def _format(schedule: Schedule) -> str:
+    dt, dt_type = parse_datetime(schedule.date_time)
+    line = f"{schedule.id}  {dt:%Y/%m/%d} {format_time_display(dt, dt_type)}  {schedule.title}"
+    if schedule.memo:
+        line += f"  ({schedule.memo})"
+    return line
+
+
+def _print_schedules(schedules: list[Schedule]) -> None:
+    for schedule in schedules:
+        print(_format(schedule))
+    print(f"{len(schedules)} 件")
+
+
+def _cmd_status(client: DaemonClient, args: argparse.Namespace) -> None:
+    info = client.hello()
+    print(f"pid {info['pid']}  version {info['version']}  {info['count']:,} 件")
+
+
+def _cmd_day(client: DaemonClient, args: argparse.Namespace) -> None:
+    _print_schedules(client.day(args.date))
+
+
+def _cmd_range(client: DaemonClient, args: argparse.Namespace) -> None:
+    _print_schedules(client.between(args.start, args.end))
+
+
+def _cmd_search(client: DaemonClient, args: argparse.Namespace) -> None:
+    _print_schedules(client.search(args.query))
+
+
+def _cmd_add(client: DaemonClient, args: argparse.Namespace) -> None:
+    try:
+        dt, dt_type = parse_datetime(args.date_time.strip())
+    except ValueError as e:
+        raise DaemonError(f"日時の形式が不正です: {e}") from None
+    schedule = Schedule(
+        date_time=format_datetime(dt, dt_type),
+        date_time_type=dt_type,
+        title=args.title,
+        memo=args.memo,
+    )
+    client.add(schedule)
+    print(f"追加しました: {_format(schedule)}")
+
+
+def _cmd_delete(client: DaemonClient, args: argparse.Namespace) -> None:
+    change = client.delete(args.schedule_id)
+    print(f"削除しました: {_format(change.old)}")
+
+
+def _cmd_watch(client: DaemonClient, args: argparse.Namespace) -> None:
+    closed = threading.Event()
+
+    def on_push(message: dict[str, Any]) -> None:
+        change = change_from_wire(message)
+        schedule = change.new if change.new is not None else change.old
+        print(f"[{change.kind}] v{message.get('version')}  {_format(schedule)}", flush=True)
+
+    client.on_push = on_push
+    client.on_disconnect = closed.set
+    client.subscribe()
+    print("変更を待っています (Ctrl+C で終了)", file=sys.stderr)
+    closed.wait()
+    raise DaemonError("サーバーとの接続が切れました")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="常駐サーバーのコマンドラインクライアント")
+    parser.add_argument("--socket", type=Path, default=None, help="ソケットのパス")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("status", help="サーバーの状態を表示する").set_defaults(func=_cmd_status)
+
+    p = sub.add_parser("day", help="指定日のスケジュールを表示する")
+    p.add_argument(
+        "date",
+        nargs="?",
+        type=datetime.date.fromisoformat,
+        default=datetime.date.today(),
+        help="YYYY-MM-DD (既定: 今日)",
+    )
+    p.set_defaults(func=_cmd_day)
+
+    p = sub.add_parser("range", help="期間内のスケジュールを表示する")
+    p.add_argument("start", type=datetime.date.fromisoformat, help="YYYY-MM-DD")
+    p.add_argument("end", type=datetime.date.fromisoformat, help="YYYY-MM-DD")
+    p.set_defaults(func=_cmd_range)
+
+    p = sub.add_parser("search", help="タイトル・メモを検索する")
+    p.add_argument("query")
+    p.set_defaults(func=_cmd_search)
+
+    p = sub.add_parser("add", help="スケジュールを追加する")
+    p.add_argument("date_time", help="YYMMDD_HHMM / ~YYMMDD_HHMM / YYMMDD_HHMM~")
+    p.add_argument("title")
+    p.add_argument("--memo", default="")
+    p.set_defaults(func=_cmd_add)
+
+    p = sub.add_parser("delete", help="スケジュールを削除する")
+    p.add_argument("schedule_id", metavar="ID")
+    p.set_defaults(func=_cmd_delete)
+
+    sub.add_parser("watch", help="変更の通知を表示し続ける").set_defaults(func=_cmd_watch)
+
+    args = parser.parse_args(argv)
+    try:
+        client = DaemonClient(args.socket or default_socket_path())
+    except DaemonError as e:
+        print(f"[CLI] {e}", file=sys.stderr)
+        return 1
+    try:
+        args.func(client, args)
+    except DaemonError as e:
+        print(f"[CLI] {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
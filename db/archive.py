@@ -0,0 +1,187 @@
+"""過去のスケジュールの年ごとのアーカイブ（よく使う最近の分と古い分の分離）。
+
+config.json の ``archive`` に月数を指定すると、起動時にそれより古い月のスケジュールを
+schedules.json から ``data/archive/YYYY.json.gz``（年ごと・gzip 圧縮）へ移す::
+
+    {"archive": {"older_than_months": 12}}
+
+schedules.json には最近の分だけが残るため、通常の読み込み・保存はその分だけで済む。
+アーカイブは読み取り専用で、``archive/index.json`` に年ごとの月キー（YYMM）と件数を
+記録しておき、カレンダーでアーカイブ済みの月を開いたときや、アーカイブを含めて
+検索したときにだけ、その年のファイルを読み込む。
+"""
+
+from __future__ import annotations
+
+import datetime
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterable
+
+from db import codecs
+import db.store as store
+from db.repository import ScheduleRepository
+from models.schedule import Schedule
+from utils import perf
+from utils.datetime_util import month_key, shift_month
+
+ARCHIVE_NAME = "アーカイブ"
+ARCHIVE_DIRNAME = "archive"
+INDEX_NAME = "index.json"
+
+
+def archive_dir() -> Path:
+    return store.DATA_DIR / ARCHIVE_DIRNAME
+
+
+def archive_path(year: int) -> Path:
+    return archive_dir() / f"{year}.json.gz"
+
+
+def archive_months(config: dict[str, Any]) -> int | None:
+    """config.json のアーカイブの設定（何か月より古いものを移すか）。未設定なら None。
+
+    Raises:
+        ValueError: 設定の形式が不正
+    """
+    policy = config.get("archive")
+    if policy is None:
+        return None
+    months = policy.get("older_than_months") if isinstance(policy, dict) else None
+    if not isinstance(months, int) or isinstance(months, bool) or months < 1:
+        raise ValueError("archive.older_than_months は1以上の整数で指定してください")
+    return months
+
+
+def cutoff_key(today: datetime.date, months: int) -> str:
+    """この月キー（YYMM）より前の月がアーカイブの対象になる。"""
+    return month_key(*shift_month(today.year, today.month, -months))
+
+
+def _year_of(key: str) -> int:
+    return 2000 + int(key[:2])
+
+
+# ---- files ----
+
+
+def load_index() -> dict[int, dict[str, int]]:
+    """年 → {月キー: 件数} の索引を返す（アーカイブが無ければ空）。"""
+    path = archive_dir() / INDEX_NAME
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {int(year): months for year, months in data.get("years", {}).items()}
+
+
+def _replace(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _save_index(index: dict[int, dict[str, int]]) -> None:
+    years = {
+        str(year): dict(sorted(months.items())) for year, months in sorted(index.items())
+    }
+    data = json.dumps({"years": years}, ensure_ascii=False, indent=2)
+    _replace(archive_dir() / INDEX_NAME, data.encode("utf-8"))
+
+
+@perf.timed("archive.read_year")
+def read_year(year: int) -> list[Schedule]:
+    """year 年のアーカイブを読み込む（無ければ空）。"""
+    path = archive_path(year)
+    if not path.exists():
+        return []
+    data = codecs.load_json(path)
+    return [Schedule.from_dict(d) for d in data.get("schedules", [])]
+
+
+def _write_year(year: int, schedules: list[Schedule]) -> None:
+    payload = {"schedules": [s.to_dict() for s in schedules]}
+    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    _replace(archive_path(year), gzip.compress(data))
+
+
+# ---- archiving ----
+
+
+def split_expired(
+    schedules: Iterable[Schedule], cutoff: str
+) -> tuple[list[Schedule], dict[int, list[Schedule]]]:
+    """cutoff（YYMM）より前の月のスケジュールを年ごとに分けて返す（残り, 年 → 移す分）。"""
+    keep: list[Schedule] = []
+    expired: dict[int, list[Schedule]] = {}
+    for s in schedules:
+        key = s.date_key[:4]
+        if key < cutoff:
+            expired.setdefault(_year_of(key), []).append(s)
+        else:
+            keep.append(s)
+    return keep, expired
+
+
+@perf.timed("archive.archive_expired")
+def archive_expired(months: int, today: datetime.date | None = None) -> int:
+    """schedules.json の months か月より古いスケジュールをアーカイブへ移し、件数を返す。
+
+    schedules.json のロックの中で、アーカイブと索引を書いてから schedules.json を
+    書き換える。途中で中断した場合は両方に同じスケジュールが残るが、次回の実行で
+    id ごとに上書きされる。
+    """
+    cutoff = cutoff_key(today or datetime.date.today(), months)
+    with store.file_lock():
+        schedules, version = store._load_versioned()
+        keep, expired = split_expired(schedules, cutoff)
+        if not expired:
+            return 0
+        archive_dir().mkdir(parents=True, exist_ok=True)
+        index = load_index()
+        for year, moved in sorted(expired.items()):
+            merged = {s.id: s for s in read_year(year)}
+            merged.update((s.id, s) for s in moved)
+            year_schedules = sorted(merged.values(), key=lambda s: s.parsed_datetime)
+            _write_year(year, year_schedules)
+            counts: dict[str, int] = {}
+            for s in year_schedules:
+                key = s.date_key[:4]
+                counts[key] = counts.get(key, 0) + 1
+            index[year] = counts
+        _save_index(index)
+        store._write_payload(keep, version + 1)
+    return len(schedules) - len(keep)
+
+
+class Archive:
+    """アーカイブの索引と、読み込み済みの年の内容（読み取り専用）。
+
+    repo は読み込んだ年の分だけを持ち、CalendarSet の読み取り専用のカレンダーとして
+    表示する。年の読み込み（read_year）はスレッドで行い、add_year で反映する。
+    """
+
+    def __init__(self, index: dict[int, dict[str, int]] | None = None) -> None:
+        self.index = load_index() if index is None else index
+        self.repo = ScheduleRepository()
+        self.loaded: set[int] = set()
+
+    def __bool__(self) -> bool:
+        return bool(self.index)
+
+    def covers(self, year: int, month: int) -> bool:
+        """year 年 month 月がアーカイブにあり、まだ読み込んでいないか。"""
+        return year not in self.loaded and month_key(year, month) in self.index.get(year, {})
+
+    @property
+    def pending_years(self) -> list[int]:
+        return sorted(set(self.index) - self.loaded)
+
+    def add_year(self, year: int, schedules: list[Schedule]) -> None:
+        if year in self.loaded:
+            return
+        self.loaded.add(year)
+        self.repo.reset([*self.repo.schedules, *schedules])
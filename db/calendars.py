@@ -0,0 +1,268 @@
+"""複数のカレンダー（チームごとの JSON ファイルなど）を1つの表示にまとめる。
+
+config.json の ``calendars`` に追加のカレンダーを列挙する::
+
+    {
+      "calendars": [
+        {"name": "チームA", "file": "team_a.json"},
+        {"name": "チームB", "file": "/shared/team_b.json", "enabled": false}
+      ]
+    }
+
+``file`` は DATA_DIR からの相対パス（絶対パスも可）。先頭のカレンダーは常に
+schedules.json（書き込み先）で、config.json で同じファイルを指定すると名前と
+表示状態だけを上書きできる。追加のカレンダーは読み取り専用。
+
+カレンダーごとに ScheduleRepository（日付索引・OccupancyIndex）を持ち、
+日付・期間・検索の結果は各カレンダーの日時順の結果を k-way マージして遅延生成する。
+表示の切り替えはマージの対象を変えるだけで、読み直しは行わない。
+"""
+
+from __future__ import annotations
+
+import datetime
+import heapq
+import itertools
+import multiprocessing
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Protocol, Sequence
+
+import db.store as store
+from db.query import OccupancyIndex
+from models.schedule import Schedule
+from db.loader import load_shard, load_shards
+from db.repository import ScheduleRepository
+from db.watcher import FileWatcher
+from utils import perf
+
+DEFAULT_NAME = "マイカレンダー"
+
+_GENERATIONS = itertools.count(1)
+
+
+class ScheduleSource(Protocol):
+    """カレンダーの中身（ScheduleRepository / RemoteRepository）。"""
+
+    occupancy: OccupancyIndex
+
+    def __len__(self) -> int: ...
+
+    def get(self, schedule_id: str) -> Schedule | None: ...
+
+    def for_date(self, d: datetime.date) -> list[Schedule]: ...
+
+    def between(self, start: datetime.date, end: datetime.date) -> list[Schedule]: ...
+
+    def search(self, query: str) -> list[Schedule]: ...
+
+
+@dataclass(frozen=True)
+class CalendarConfig:
+    """config.json に書かれたカレンダー1つ分の設定。"""
+
+    name: str
+    path: Path
+    enabled: bool = True
+
+
+def calendar_configs(config: dict[str, Any]) -> list[CalendarConfig]:
+    """config.json の内容からカレンダーの一覧を作る（先頭は schedules.json）。
+
+    Raises:
+        ValueError: calendars の形式が不正
+    """
+    primary = CalendarConfig(DEFAULT_NAME, store.SCHEDULE_FILE)
+    extras: list[CalendarConfig] = []
+    entries = config.get("calendars", [])
+    if not isinstance(entries, list):
+        raise ValueError("calendars はリストで指定してください")
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not entry.get("file"):
+            raise ValueError(f"calendars[{i}] に file がありません")
+        path = store.DATA_DIR / Path(entry["file"]).expanduser()
+        calendar = CalendarConfig(
+            str(entry.get("name") or path.stem), path, bool(entry.get("enabled", True))
+        )
+        if path.resolve() == primary.path.resolve():
+            primary = calendar
+        elif all(path.resolve() != c.path.resolve() for c in extras):
+            extras.append(calendar)
+    return [primary, *extras]
+
+
+@dataclass(eq=False)
+class Calendar:
+    """表示中のカレンダー1つ。"""
+
+    name: str
+    path: Path
+    source: ScheduleSource
+    enabled: bool = True
+    writable: bool = False
+    # 過去のスケジュールのアーカイブ（db.archive）。明示したときだけ検索の対象にする
+    archive: bool = False
+    # 追加のカレンダーの外部変更の検出（書き込み先は App 側で監視する）
+    watcher: FileWatcher | None = None
+    # 読み込めなかった場合のエラー（空のカレンダーとして表示する）
+    error: str | None = field(default=None)
+
+    def owns(self, schedule: Schedule) -> bool:
+        return self.source.get(schedule.id) is schedule
+
+
+def load_calendars(
+    configs: Sequence[CalendarConfig], max_workers: int | None = None
+) -> list[Calendar]:
+    """追加のカレンダーを並列に読み込む（読み取り専用。カレンダーごとに索引を作る）。
+
+    読み込めないファイルがあっても他のカレンダーは表示できるよう、
+    そのカレンダーだけを空にして error に理由を記録する。
+    """
+    # App のスレッドから呼ばれるため、fork ではなく spawn でワーカーを起動する
+    context = multiprocessing.get_context("spawn")
+    # 読み込み中の外部変更は次のポーリングで拾う
+    watchers = [FileWatcher(c.path) for c in configs]
+    try:
+        shards = load_shards([c.path for c in configs], max_workers, mp_context=context)
+    except (OSError, ValueError, TypeError):
+        shards = None
+    calendars: list[Calendar] = []
+    for i, (config, watcher) in enumerate(zip(configs, watchers)):
+        error = None
+        if shards is not None:
+            schedules = shards[i].schedules
+        else:
+            try:
+                schedules = load_shard(config.path).schedules
+            except (OSError, ValueError, TypeError) as e:
+                schedules, error = [], str(e)
+        calendars.append(Calendar(
+            config.name, config.path, ScheduleRepository(schedules),
+            enabled=config.enabled, watcher=watcher, error=error,
+        ))
+    return calendars
+
+
+def reload_calendar(calendar: Calendar) -> list[Schedule]:
+    """追加のカレンダーのファイルを読み直す（反映は呼び出し側で source.reset する）。"""
+    return load_shard(calendar.path).schedules
+
+
+def _by_time(schedules: Iterable[Schedule]) -> list[Schedule]:
+    return sorted(schedules, key=lambda s: s.parsed_datetime)
+
+
+class MergedOccupancy:
+    """表示中のカレンダーの OccupancyIndex を合算して見せる（読み取り専用）。
+
+    OccupancyIndex と同じ mask / counts / count / generation を持つ。
+    generation は、いずれかのカレンダーの内容または表示の切り替えが変わると進む。
+    """
+
+    def __init__(self, calendars: CalendarSet) -> None:
+        self._calendars = calendars
+        self._members: tuple[int, ...] = ()
+        self._generation = 0
+
+    def _sources(self) -> list[OccupancyIndex]:
+        return [c.source.occupancy for c in self._calendars.enabled]
+
+    @property
+    def generation(self) -> int:
+        members = tuple(o.generation for o in self._sources())
+        if members != self._members:
+            self._members = members
+            self._generation = next(_GENERATIONS)
+        return self._generation
+
+    def mask(self, year: int, month: int) -> int:
+        mask = 0
+        for occupancy in self._sources():
+            mask |= occupancy.mask(year, month)
+        return mask
+
+    def counts(self, year: int, month: int) -> list[int]:
+        sources = self._sources()
+        if len(sources) == 1:
+            return sources[0].counts(year, month)
+        totals = [0] * 31
+        for occupancy in sources:
+            for i, n in enumerate(occupancy.counts(year, month)):
+                totals[i] += n
+        return totals
+
+    def count(self, d: datetime.date) -> int:
+        return sum(occupancy.count(d) for occupancy in self._sources())
+
+
+class CalendarSet:
+    """複数のカレンダーを日時順にマージして1つのデータのように見せる。"""
+
+    def __init__(self, calendars: Iterable[Calendar]) -> None:
+        self.calendars: list[Calendar] = list(calendars)
+        if not self.calendars:
+            raise ValueError("カレンダーが1つもありません")
+        self.occupancy = MergedOccupancy(self)
+
+    @property
+    def primary(self) -> Calendar:
+        """追加・編集の書き込み先のカレンダー。"""
+        return self.calendars[0]
+
+    @property
+    def enabled(self) -> list[Calendar]:
+        return [c for c in self.calendars if c.enabled]
+
+    def toggle(self, index: int) -> Calendar:
+        """index 番目のカレンダーの表示・非表示を切り替える（読み直しはしない）。
+
+        Raises:
+            IndexError: 該当するカレンダーが無い
+        """
+        calendar = self.calendars[index]
+        calendar.enabled = not calendar.enabled
+        return calendar
+
+    def calendar_of(self, schedule: Schedule) -> Calendar | None:
+        """schedule（表示中のオブジェクト）を持つカレンダーを返す。"""
+        for calendar in self.calendars:
+            if calendar.owns(schedule):
+                return calendar
+        return None
+
+    def __len__(self) -> int:
+        return sum(len(c.source) for c in self.enabled)
+
+    # ---- merged queries ----
+
+    def _merge(self, streams: list[list[Schedule]]) -> Iterator[Schedule]:
+        """日時順の結果を k-way マージする（同じ日時はカレンダーの順）。"""
+        if len(streams) == 1:
+            return iter(streams[0])
+        return heapq.merge(*streams, key=lambda s: s.parsed_datetime)
+
+    def iter_date(self, d: datetime.date) -> Iterator[Schedule]:
+        return self._merge([c.source.for_date(d) for c in self.enabled])
+
+    def iter_between(self, start: datetime.date, end: datetime.date) -> Iterator[Schedule]:
+        return self._merge([c.source.between(start, end) for c in self.enabled])
+
+    def iter_search(self, query: str, include_archive: bool = False) -> Iterator[Schedule]:
+        return self._merge([
+            _by_time(c.source.search(query))
+            for c in self.enabled
+            if include_archive or not c.archive
+        ])
+
+    def for_date(self, d: datetime.date) -> list[Schedule]:
+        """表示中の全カレンダーの、指定日のスケジュールを時刻順で返す。"""
+        return list(self.iter_date(d))
+
+    def between(self, start: datetime.date, end: datetime.date) -> list[Schedule]:
+        return list(self.iter_between(start, end))
+
+    @perf.timed("calendars.search")
+    def search(self, query: str, include_archive: bool = False) -> list[Schedule]:
+        """表示中の全カレンダー（include_archive でアーカイブも）から検索し、日時順で返す。"""
+        return list(self.iter_search(query, include_archive))
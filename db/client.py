@@ -0,0 +1,338 @@
+"""常駐サーバー（db.daemon）のクライアント。
+
+DaemonClient はソケット1本の上で要求・応答と変更通知を扱う。応答と通知は
+受信スレッドが読み、要求を送ったスレッドへ応答を渡す（ワーカースレッドからも呼べる）。
+
+RemoteRepository は ScheduleRepository と同じインターフェースでサーバーのデータを扱い、
+ScheduleApp をデータを持たない薄いクライアントとして動かすために使う。
+月ごとの件数は表示する月だけ RemoteOccupancy が問い合わせ、変更通知で差分更新する。
+自分の変更も他のクライアントの変更も、サーバーからの通知を受けた時点で反映する。
+"""
+
+from __future__ import annotations
+
+import datetime
+import itertools
+import socket
+import threading
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from db.events import (
+    ChangeBus,
+    ChangeListener,
+    ScheduleChange,
+)
+from db.protocol import (
+    ProtocolError,
+    change_from_wire,
+    encode_frame,
+    recv_frame,
+)
+from db.query import OccupancyIndex
+from models.schedule import Schedule
+from utils.datetime_util import month_key
+
+# 応答を待つ時間の上限（秒）
+DEFAULT_TIMEOUT = 30.0
+
+
+class DaemonError(Exception):
+    """サーバーがエラーを返した、または接続が切れた。"""
+
+
+class _Pending:
+    """応答待ちの要求1つ。"""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.response: dict[str, Any] | None = None
+
+
+class DaemonClient:
+    """サーバーへの接続。request() はスレッドセーフ。
+
+    on_push は受信スレッドから呼ばれる（UI への反映は呼び出し側でメインスレッドに渡す）。
+    on_disconnect は接続が切れたときに受信スレッドから1回だけ呼ばれる。
+    """
+
+    def __init__(
+        self,
+        socket_path: Path,
+        on_push: Callable[[dict[str, Any]], None] | None = None,
+        on_disconnect: Callable[[], None] | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        self.socket_path = socket_path
+        self.on_push = on_push
+        self.on_disconnect = on_disconnect
+        self.timeout = timeout
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._sock.connect(str(socket_path))
+        except OSError as e:
+            self._sock.close()
+            raise DaemonError(f"サーバーに接続できません: {socket_path} ({e})") from None
+        self._ids = itertools.count(1)
+        self._pending: dict[int, _Pending] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._reader = threading.Thread(
+            target=self._read_loop, name="daemon-client", daemon=True
+        )
+        self._reader.start()
+
+    @property
+    def connected(self) -> bool:
+        return not self._closed
+
+    def request(self, op: str, **params: Any) -> Any:
+        """要求を送り、応答の result を返す。
+
+        Raises:
+            DaemonError: エラー応答・タイムアウト・切断
+        """
+        pending = _Pending()
+        with self._lock:
+            if self._closed:
+                raise DaemonError("サーバーとの接続は切れています")
+            request_id = next(self._ids)
+            self._pending[request_id] = pending
+            try:
+                self._sock.sendall(encode_frame({"id": request_id, "op": op, **params}))
+            except OSError as e:
+                del self._pending[request_id]
+                raise DaemonError(f"送信できませんでした: {e}") from None
+        if not pending.done.wait(self.timeout):
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise DaemonError(f"応答がありません: {op}")
+        response = pending.response
+        if response is None:
+            raise DaemonError("サーバーとの接続が切れました")
+        if not response.get("ok"):
+            raise DaemonError(response.get("error", "不明なエラー"))
+        return response.get("result")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+        if threading.current_thread() is not self._reader:
+            self._reader.join(timeout=1.0)
+
+    def _read_loop(self) -> None:
+        try:
+            while True:
+                message = recv_frame(self._sock)
+                if message is None:
+                    break
+                if "push" in message:
+                    if self.on_push is not None:
+                        self.on_push(message)
+                    continue
+                with self._lock:
+                    pending = self._pending.pop(message.get("id"), None)
+                if pending is not None:
+                    pending.response = message
+                    pending.done.set()
+        except (OSError, ProtocolError):
+            pass
+        with self._lock:
+            was_closed, self._closed = self._closed, True
+            waiting = list(self._pending.values())
+            self._pending.clear()
+        for pending in waiting:
+            pending.done.set()
+        if not was_closed and self.on_disconnect is not None:
+            self.on_disconnect()
+
+    # ---- operations ----
+
+    def hello(self) -> dict[str, Any]:
+        return self.request("hello")
+
+    def subscribe(self, enabled: bool = True) -> None:
+        self.request("subscribe", enabled=enabled)
+
+    def day(self, d: datetime.date) -> list[Schedule]:
+        return _schedules(self.request("day", date=d.isoformat()))
+
+    def month_counts(self, year: int, month: int) -> list[int]:
+        return self.request("month", year=year, month=month)
+
+    def between(self, start: datetime.date, end: datetime.date) -> list[Schedule]:
+        return _schedules(
+            self.request("range", start=start.isoformat(), end=end.isoformat())
+        )
+
+    def search(self, query: str) -> list[Schedule]:
+        return _schedules(self.request("search", query=query))
+
+    def get(self, schedule_id: str) -> Schedule | None:
+        result = self.request("get", schedule_id=schedule_id)
+        return Schedule.from_dict(result) if result is not None else None
+
+    def all(self) -> list[Schedule]:
+        return _schedules(self.request("all"))
+
+    def add(self, schedule: Schedule) -> ScheduleChange:
+        return change_from_wire(self.request("add", schedule=schedule.to_dict()))
+
+    def update(self, schedule: Schedule) -> ScheduleChange:
+        return change_from_wire(self.request("update", schedule=schedule.to_dict()))
+
+    def delete(self, schedule_id: str) -> ScheduleChange:
+        return change_from_wire(self.request("delete", schedule_id=schedule_id))
+
+
+def _schedules(records: Iterable[dict[str, Any]]) -> list[Schedule]:
+    return [Schedule.from_dict(d) for d in records]
+
+
+class RemoteOccupancy(OccupancyIndex):
+    """サーバーに問い合わせて月ごとに埋める OccupancyIndex。
+
+    一度読み込んだ月は変更通知で差分更新する。まだ読み込んでいない月への変更は
+    記録だけしておき、読み込み中に変更が届いた場合は読み直す。
+    """
+
+    def __init__(self, client: DaemonClient) -> None:
+        super().__init__()
+        self._client = client
+        self._loaded: set[str] = set()
+        self._invalidations: dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    def _ensure(self, year: int, month: int) -> None:
+        key = month_key(year, month)
+        while key not in self._loaded:
+            with self._lock:
+                seen = self._invalidations.get(key, 0)
+            counts = self._client.month_counts(year, month)
+            with self._lock:
+                if self._invalidations.get(key, 0) != seen:
+                    continue
+                if any(counts):
+                    self._counts[key] = list(counts)
+                    self._masks[key] = sum(1 << i for i, n in enumerate(counts) if n)
+                self._loaded.add(key)
+
+    def _is_loaded(self, schedule: Schedule) -> bool:
+        key = schedule.date_key[:4]
+        if key in self._loaded:
+            return True
+        self._invalidations[key] = self._invalidations.get(key, 0) + 1
+        return False
+
+    def add(self, schedule: Schedule) -> None:
+        with self._lock:
+            if self._is_loaded(schedule):
+                super().add(schedule)
+
+    def remove(self, schedule: Schedule) -> None:
+        with self._lock:
+            if self._is_loaded(schedule):
+                super().remove(schedule)
+
+    def mask(self, year: int, month: int) -> int:
+        self._ensure(year, month)
+        return super().mask(year, month)
+
+    def counts(self, year: int, month: int) -> list[int]:
+        self._ensure(year, month)
+        return super().counts(year, month)
+
+    def count(self, d: datetime.date) -> int:
+        self._ensure(d.year, d.month)
+        return super().count(d)
+
+
+class RemoteRepository:
+    """サーバー上のデータを ScheduleRepository と同じ形で扱う。
+
+    変更イベントは、自分の変更を含めてサーバーからの通知を受けた時点で配信する
+    （add / update / delete の戻り値の時点では、イベントはまだ配信されていないことがある）。
+    通知は受信スレッドに届くため、dispatch にはメインスレッドへ処理を渡す
+    ブロックしない関数を設定する（受信スレッドを止めると応答も受け取れなくなる）。
+    """
+
+    def __init__(self, client: DaemonClient) -> None:
+        self.client = client
+        self.bus = ChangeBus()
+        self.occupancy = RemoteOccupancy(client)
+        self.revision = 0
+        self._count = 0
+        self._lock = threading.Lock()
+        self.dispatch: Callable[[Callable[[], None]], Any] = lambda fn: fn()
+        client.on_push = self._on_push
+
+    def reset(self, schedules: Iterable[Schedule] = ()) -> None:
+        """キャッシュを捨ててサーバーの状態を読み直す（schedules は使わない）。"""
+        self.occupancy = RemoteOccupancy(self.client)
+        self._count = self.client.hello()["count"]
+        self.revision += 1
+
+    def start(self) -> None:
+        """変更通知の購読を開始する。"""
+        self.client.subscribe()
+
+    # ---- read ----
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, schedule_id: str) -> bool:
+        return self.get(schedule_id) is not None
+
+    @property
+    def schedules(self) -> list[Schedule]:
+        return self.client.all()
+
+    def get(self, schedule_id: str) -> Schedule | None:
+        return self.client.get(schedule_id)
+
+    def for_date(self, d: datetime.date) -> list[Schedule]:
+        return self.client.day(d)
+
+    def between(self, start: datetime.date, end: datetime.date) -> list[Schedule]:
+        return self.client.between(start, end)
+
+    def search(self, query: str) -> list[Schedule]:
+        return self.client.search(query)
+
+    # ---- write ----
+
+    def subscribe(self, listener: ChangeListener) -> None:
+        self.bus.subscribe(listener)
+
+    def unsubscribe(self, listener: ChangeListener) -> None:
+        self.bus.unsubscribe(listener)
+
+    def add(self, schedule: Schedule) -> ScheduleChange:
+        return self.client.add(schedule)
+
+    def update(self, schedule: Schedule) -> ScheduleChange:
+        return self.client.update(schedule)
+
+    def delete(self, schedule_id: str) -> ScheduleChange:
+        return self.client.delete(schedule_id)
+
+    def _on_push(self, message: dict[str, Any]) -> None:
+        change = change_from_wire(message)
+        # 件数の差分は受信順に反映する（月の読み込みとの前後関係を保つため受信スレッドで行う）
+        with self._lock:
+            if change.old is not None:
+                self.occupancy.remove(change.old)
+                self._count -= 1
+            if change.new is not None:
+                self.occupancy.add(change.new)
+                self._count += 1
+            self.revision += 1
+        self.dispatch(lambda: self.bus.emit(change))
@@ -0,0 +1,184 @@
+"""データファイルの圧縮形式（none / gzip / zlib / lzma）。
+
+ファイル名は変えずに中身だけを圧縮するため、読み込み側は先頭のバイト列から形式を判定する
+（JSON は ``{`` か空白で始まり、圧縮形式はそれぞれ固有のヘッダーで始まる）。
+読み書きはいずれも標準ライブラリのストリーム（gzip.GzipFile / lzma.LZMAFile /
+zlib の compressobj・decompressobj）で少しずつ行い、圧縮前と圧縮後の全体を
+同時にメモリに持たないようにする。
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import lzma
+import zlib
+from pathlib import Path
+from typing import IO, Any, Callable
+
+CODECS = ("none", "gzip", "zlib", "lzma")
+
+# 判定に読む先頭のバイト数（xz のマジックナンバーが 6 バイト）
+HEADER_SIZE = 6
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_XZ_MAGIC = b"\xfd7zXZ\x00"
+
+# 読み込み時の1回あたりの解凍量
+_CHUNK = 1 << 20
+
+
+def detect(header: bytes) -> str:
+    """ファイルの先頭 HEADER_SIZE バイトから圧縮形式を判定する。"""
+    if header.startswith(_GZIP_MAGIC):
+        return "gzip"
+    if header.startswith(_XZ_MAGIC):
+        return "lzma"
+    # zlib: CMF（下位4ビットが 8 = deflate）と FLG の組が 31 の倍数
+    if len(header) >= 2 and header[0] & 0x0F == 8 and (header[0] << 8 | header[1]) % 31 == 0:
+        return "zlib"
+    return "none"
+
+
+def check_codec(codec: str) -> str:
+    """codec が対応している圧縮形式ならそのまま返す。
+
+    Raises:
+        ValueError: 未対応の圧縮形式
+    """
+    if codec not in CODECS:
+        raise ValueError(f"未対応の圧縮形式です: {codec}（{' / '.join(CODECS)}）")
+    return codec
+
+
+class _ZlibReader(io.RawIOBase):
+    """zlib ストリームを少しずつ解凍して読む。"""
+
+    def __init__(self, raw: IO[bytes]) -> None:
+        self._raw = raw
+        self._decompressor = zlib.decompressobj()
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        while not self._buffer:
+            if self._decompressor.eof:
+                return 0
+            # 1回の解凍量を _CHUNK までに抑える（残りの入力は unconsumed_tail に残る）
+            chunk = self._decompressor.unconsumed_tail or self._raw.read(_CHUNK)
+            if not chunk:
+                self._buffer = self._decompressor.flush()
+                if not self._buffer:
+                    raise EOFError("zlib ストリームが途中で終わっています")
+                break
+            self._buffer = self._decompressor.decompress(chunk, _CHUNK)
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+class _ZlibWriter(io.RawIOBase):
+    """書き込んだバイト列を zlib で圧縮しながら raw に書く（close で終端を書く）。"""
+
+    def __init__(self, raw: IO[bytes], level: int) -> None:
+        self._raw = raw
+        self._compressor = zlib.compressobj(level)
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: Any) -> int:
+        self._raw.write(self._compressor.compress(b))
+        return len(b)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._raw.write(self._compressor.flush())
+        super().close()
+
+
+def reader(raw: IO[bytes], codec: str) -> IO[bytes]:
+    """raw（先頭から読むバイナリファイル）を解凍しながら読むファイルオブジェクトを返す。
+
+    close しても raw は閉じない（raw.tell() で圧縮後のバイト数の進捗が分かる）。
+    """
+    if codec == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="rb")
+    if codec == "lzma":
+        return lzma.LZMAFile(raw, "rb")
+    if codec == "zlib":
+        return io.BufferedReader(_ZlibReader(raw), _CHUNK)
+    return raw
+
+
+def writer(raw: IO[bytes], codec: str, level: int | None = None) -> IO[bytes]:
+    """raw に圧縮しながら書くファイルオブジェクトを返す（close で圧縮の終端を書く）。
+
+    level を省略すると、読み書きの速さと大きさの釣り合いのよい既定値を使う。
+    """
+    if codec == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=level if level is not None else 6, mtime=0)
+    if codec == "lzma":
+        return lzma.LZMAFile(raw, "wb", preset=level if level is not None else 1)
+    if codec == "zlib":
+        return _ZlibWriter(raw, level if level is not None else 6)
+    return raw
+
+
+def read_all(
+    raw: IO[bytes],
+    codec: str,
+    chunk_size: int = _CHUNK,
+    progress: Callable[[int], None] | None = None,
+) -> bytearray:
+    """raw を解凍しながら読み、全体を返す。
+
+    解凍したチャンクは1つの bytearray に順に継ぎ足すため、チャンクのリストを
+    最後に連結する場合と違って解凍後の全体を2つ同時に持たない。
+    progress には区切りごとに raw 上の（圧縮後の）読み込み済みバイト数を渡す。
+
+    Raises:
+        ValueError: 圧縮データが壊れている・途中で終わっている
+    """
+    data = bytearray()
+    try:
+        with reader(raw, codec) as f:
+            while chunk := f.read(chunk_size):
+                data += chunk
+                if progress is not None:
+                    progress(raw.tell())
+    except (zlib.error, lzma.LZMAError, gzip.BadGzipFile, EOFError) as e:
+        raise ValueError(f"圧縮データを読み込めません（{codec}）: {e}") from e
+    return data
+
+
+def read_head(raw: IO[bytes], codec: str, size: int) -> bytes:
+    """raw を解凍しながら、先頭の size バイトまでを読む（残りは解凍しない）。
+
+    Raises:
+        ValueError: 圧縮データが壊れている
+    """
+    try:
+        with reader(raw, codec) as f:
+            return f.read(size)
+    except (zlib.error, lzma.LZMAError, gzip.BadGzipFile, EOFError) as e:
+        raise ValueError(f"圧縮データを読み込めません（{codec}）: {e}") from e
+
+
+def load_json(path: Path) -> Any:
+    """圧縮形式を判定して JSON ファイルを読み込む。"""
+    with open(path, "rb") as raw:
+        codec = detect(raw.read(HEADER_SIZE))
+        raw.seek(0)
+        return json.loads(read_all(raw, codec))
+
+
+def json_options(codec: str) -> dict[str, Any]:
+    """json.dumps の整形の指定（圧縮する場合は空白を省く）。"""
+    if codec == "none":
+        return {"ensure_ascii": False, "indent": 2}
+    return {"ensure_ascii": False, "separators": (",", ":")}
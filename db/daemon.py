@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""スケジュールデータを常駐させる共有サーバー（Unix ドメインソケット）。
+
+使い方:
+    python -m db.daemon [--socket PATH] [--watch-interval SECONDS]
+
+起動時に schedules.json を一度だけ読み込み、ScheduleRepository（日付索引・OccupancyIndex）を
+メモリ上に保持したまま、複数のクライアント（``python main.py --connect`` / ``python cli.py``）に
+日付・月・期間・検索の問い合わせと追加・編集・削除を提供する。
+プロトコルは db.protocol を参照。
+
+変更は save_merged で保存し（ロック・version・マージはアプリ単体のときと同じ）、
+保存できた変更は購読中のクライアント（変更を要求したクライアントを含む）へ通知する。他のプロセスがファイルを直接
+書き換えた場合も、アプリと同様にポーリングで検出して差分を通知する。
+ソケットの既定の場所は DATA_DIR/daemon.sock。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+import db.store as store
+from db.events import ScheduleChange
+from db.protocol import ProtocolError, change_to_wire, encode_frame, read_frame
+from db.repository import ScheduleRepository, diff_schedules
+from db.store import MergeConflict, load_schedules_versioned, save_merged
+from db.watcher import DEFAULT_INTERVAL, FileWatcher
+from models.schedule import Schedule
+
+SOCKET_NAME = "daemon.sock"
+
+
+def default_socket_path() -> Path:
+    return store.DATA_DIR / SOCKET_NAME
+
+
+class RequestError(Exception):
+    """クライアントの要求を処理できなかった（エラー応答として返す）。"""
+
+
+_Handler = Callable[["_Connection", dict[str, Any]], Awaitable[Any]]
+
+# 書き込み要求の (保存する内容, 保存後に変更をメモリに反映する関数)
+_Prepared = tuple[list[Schedule], Callable[[], ScheduleChange]]
+
+
+class _Connection:
+    """接続中のクライアント1つ。"""
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+        self.subscribed = False
+
+    def send(self, message: dict[str, Any]) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(encode_frame(message))
+
+
+class ScheduleDaemon:
+    """ScheduleRepository を常駐させ、ソケット経由の要求に応える。"""
+
+    def __init__(
+        self, socket_path: Path, watch_interval: float | None = DEFAULT_INTERVAL
+    ) -> None:
+        self.socket_path = socket_path
+        self.watch_interval = watch_interval
+        self.repo = ScheduleRepository()
+        self.repo.subscribe(self._broadcast)
+        self._base: list[Schedule] = []
+        self._version = 0
+        self._watcher: FileWatcher | None = None
+        self._connections: set[_Connection] = set()
+        self._write_lock = asyncio.Lock()
+        self._server: asyncio.AbstractServer | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._handlers: dict[str, _Handler] = {
+            "hello": self._op_hello,
+            "subscribe": self._op_subscribe,
+            "day": self._op_day,
+            "month": self._op_month,
+            "range": self._op_range,
+            "search": self._op_search,
+            "get": self._op_get,
+            "all": self._op_all,
+            "add": self._op_add,
+            "update": self._op_update,
+            "delete": self._op_delete,
+        }
+
+    # ---- lifecycle ----
+
+    def load(self) -> None:
+        self._watcher = FileWatcher(store.SCHEDULE_FILE)
+        schedules, self._version = load_schedules_versioned()
+        self._base = schedules
+        self.repo.reset(schedules)
+
+    async def start(self) -> None:
+        """データを読み込み、ソケットで待ち受けを開始する。
+
+        Raises:
+            RuntimeError: 同じソケットで別のサーバーが動いている
+        """
+        _remove_stale_socket(self.socket_path)
+        self.load()
+        self._server = await asyncio.start_unix_server(
+            self._handle, path=str(self.socket_path)
+        )
+        if self.watch_interval:
+            self._tasks.append(asyncio.create_task(self._watch_loop()))
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        for conn in list(self._connections):
+            conn.writer.close()
+        self._connections.clear()
+        try:
+            self.socket_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    # ---- connection ----
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        conn = _Connection(writer)
+        self._connections.add(conn)
+        try:
+            while True:
+                try:
+                    message = await read_frame(reader)
+                except ProtocolError:
+                    break
+                if message is None:
+                    break
+                conn.send(await self._dispatch(conn, message))
+                await writer.drain()
+        except (ConnectionError, BrokenPipeError):
+            pass
+        finally:
+            self._connections.discard(conn)
+            writer.close()
+
+    async def _dispatch(
+        self, conn: _Connection, message: dict[str, Any]
+    ) -> dict[str, Any]:
+        request_id = message.get("id")
+        handler = self._handlers.get(message.get("op", ""))
+        if handler is None:
+            error = f"不明な操作です: {message.get('op')!r}"
+            return {"id": request_id, "ok": False, "error": error}
+        try:
+            result = await handler(conn, message)
+        except (RequestError, MergeConflict) as e:
+            return {"id": request_id, "ok": False, "error": str(e)}
+        except (KeyError, TypeError, ValueError) as e:
+            return {"id": request_id, "ok": False, "error": f"不正な要求です: {e!r}"}
+        except OSError as e:
+            return {"id": request_id, "ok": False, "error": f"保存できませんでした: {e}"}
+        return {"id": request_id, "ok": True, "result": result}
+
+    def _broadcast(self, change: ScheduleChange) -> None:
+        message = {"push": "change", **change_to_wire(change), "version": self._version}
+        for conn in self._connections:
+            if conn.subscribed:
+                conn.send(message)
+
+    # ---- read operations ----
+
+    async def _op_hello(self, conn: _Connection, message: dict[str, Any]) -> Any:
+        return {"version": self._version, "count": len(self.repo), "pid": os.getpid()}
+
+    async def _op_subscribe(self, conn: _Connection, message: dict[str, Any]) -> Any:
+        conn.subscribed = bool(message.get("enabled", True))
+        return {"version": self._version}
+
+    async def _op_day(self, conn: _Connection, message: dict[str, Any]) -> Any:
+        d = datetime.date.fromisoformat(message["date"])
+        return [s.to_dict() for s in self.repo.for_date(d)]
+
+    async def _op_month(self, conn: _Connection, message: dict[str, Any]) -> Any:
+        return self.repo.occupancy.counts(int(message["year"]), int(message["month"]))
+
+    async def _op_range(self, conn: _Connection, message: dict[str, Any]) -> Any:
+        start = datetime.date.fromisoformat(message["start"])
+        end = datetime.date.fromisoformat(message["end"])
+        return [s.to_dict() for s in self.repo.between(start, end)]
+
+    async def _op_search(self, conn: _Connection, message: dict[str, Any]) -> Any:
+        return [s.to_dict() for s in self.repo.search(message["query"])]
+
+    async def _op_get(self, conn: _Connection, message: dict[str, Any]) -> Any:
+        schedule = self.repo.get(message["schedule_id"])
+        return schedule.to_dict() if schedule is not None else None
+
+    async def _op_all(self, conn: _Connection, message: dict[str, Any]) -> Any:
+        return [s.to_dict() for s in self.repo.schedules]
+
+    # ---- write operations ----
+
+    async def _op_add(self, conn: _Connection, message: dict[str, Any]) -> Any:
+        schedule = Schedule.from_dict(message["schedule"])
+
+        def prepare() -> _Prepared:
+            if schedule.id in self.repo:
+                raise RequestError(f"id が重複しています: {schedule.id}")
+            return self.repo.schedules + [schedule], lambda: self.repo.add(schedule)
+
+        return await self._commit(conn, prepare)
+
+    async def _op_update(self, conn: _Connection, message: dict[str, Any]) -> Any:
+        schedule = Schedule.from_dict(message["schedule"])
+
+        def prepare() -> _Prepared:
+            if schedule.id not in self.repo:
+                raise RequestError(f"スケジュールがありません: {schedule.id}")
+            ours = [schedule if s.id == schedule.id else s for s in self.repo.schedules]
+            return ours, lambda: self.repo.update(schedule)
+
+        return await self._commit(conn, prepare)
+
+    async def _op_delete(self, conn: _Connection, message: dict[str, Any]) -> Any:
+        schedule_id = message["schedule_id"]
+
+        def prepare() -> _Prepared:
+            if schedule_id not in self.repo:
+                raise RequestError(f"スケジュールがありません: {schedule_id}")
+            ours = [s for s in self.repo.schedules if s.id != schedule_id]
+            return ours, lambda: self.repo.delete(schedule_id)
+
+        return await self._commit(conn, prepare)
+
+    async def _commit(self, conn: _Connection, prepare: Callable[[], _Prepared]) -> Any:
+        """prepare() の内容を保存し、成功したら変更をメモリに反映して購読中のクライアントへ通知する。
+
+        prepare は _write_lock の中で呼び、その時点のメモリの内容から
+        (保存する内容, 変更を反映する関数) を作る（要求の検査もここで行う）。
+        ロックの外で作ると、同時に届いた書き込みが同じ内容を元にして互いを上書きする。
+        保存（JSON の書き出し）はスレッドで行い、その間も読み取りの要求には応える。
+        """
+        async with self._write_lock:
+            ours, apply = prepare()
+            loop = asyncio.get_running_loop()
+            known = self._watcher.synced if self._watcher is not None else None
+            result = await loop.run_in_executor(
+                None, save_merged, self._base, ours, self._version, known
+            )
+            self._base, self._version = result.schedules, result.version
+            if self._watcher is not None:
+                self._watcher.mark_synced(result.signature)
+            if result.conflicts:
+                # 他のプロセスが同じレコードを変更していた。保存された内容（他の変更を含む）に
+                # 合わせて通知し、この要求は失敗として返す
+                for merged in diff_schedules(self.repo.schedules, result.schedules):
+                    self.repo.apply(merged)
+                raise MergeConflict(result.conflicts, result.version)
+            change = apply()
+            if result.merged:
+                for merged in diff_schedules(self.repo.schedules, result.schedules):
+                    self.repo.apply(merged)
+            return {**change_to_wire(change), "version": self._version}
+
+    # ---- external changes ----
+
+    async def _watch_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            if self._watcher is None or not self._watcher.changed():
+                continue
+            async with self._write_lock:
+                try:
+                    await self._sync_from_disk()
+                except (OSError, ValueError, TypeError):
+                    # 書き込み途中などで読めない。次にファイルが変わるまで待つ
+                    self._watcher.mark_synced()
+
+    async def _sync_from_disk(self) -> None:
+        """ファイルを読み直し、メモリとの差分を適用して通知する（_write_lock の中で呼ぶ）。"""
+        loop = asyncio.get_running_loop()
+        signature = self._watcher.signature() if self._watcher is not None else None
+        schedules, version = await loop.run_in_executor(None, load_schedules_versioned)
+        self._base, self._version = schedules, version
+        for change in diff_schedules(self.repo.schedules, schedules):
+            self.repo.apply(change)
+        if self._watcher is not None and signature is not None:
+            self._watcher.mark_synced(signature)
+
+
+def _remove_stale_socket(path: Path) -> None:
+    """前回異常終了したサーバーのソケットファイルを消す。動作中なら RuntimeError。"""
+    if not path.exists():
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+    except (ConnectionRefusedError, FileNotFoundError):
+        path.unlink(missing_ok=True)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"サーバーは既に起動しています: {path}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="スケジュールデータの常駐サーバー")
+    parser.add_argument("--socket", type=Path, default=None, help="ソケットのパス")
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        metavar="SECONDS",
+        help=f"データファイルの外部変更を確認する間隔 (既定: {DEFAULT_INTERVAL}、0 で無効)",
+    )
+    args = parser.parse_args(argv)
+    if not hasattr(socket, "AF_UNIX"):
+        print("[DAEMON] この環境は Unix ドメインソケットに対応していません", file=sys.stderr)
+        return 1
+
+    try:
+        store.configure_compression(store.load_config())
+    except (OSError, ValueError) as e:
+        print(f"[DAEMON] config.json: {e}", file=sys.stderr)
+        return 1
+    path = args.socket or default_socket_path()
+    daemon = ScheduleDaemon(path, watch_interval=args.watch_interval or None)
+    print(f"[DAEMON] {path} で待ち受けます (Ctrl+C で終了)", file=sys.stderr)
+    try:
+        asyncio.run(daemon.serve_forever())
+    except RuntimeError as e:
+        print(f"[DAEMON] {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
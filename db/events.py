@@ -0,0 +1,89 @@
+"""スケジュールの変更イベントと配信用のバス。
+
+ScheduleRepository は追加・編集・削除のたびに、変更前後のスケジュールを持つ
+イベントを購読者へ同期的に配信する。ビューはイベントの日付キーから影響する
+セル・行だけを更新するため、1件の編集でデータ全体を走査し直す必要がない。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, ClassVar
+
+from models.schedule import Schedule
+
+
+@dataclass(frozen=True)
+class ScheduleChange:
+    """スケジュール1件の変更。old / new は変更前後（追加なら old、削除なら new が None）。"""
+
+    kind: ClassVar[str] = "changed"
+
+    old: Schedule | None
+    new: Schedule | None
+
+    @property
+    def schedule_id(self) -> str:
+        schedule = self.new or self.old
+        return schedule.id if schedule is not None else ""
+
+    @property
+    def old_date_key(self) -> str | None:
+        return self.old.date_key if self.old is not None else None
+
+    @property
+    def new_date_key(self) -> str | None:
+        return self.new.date_key if self.new is not None else None
+
+    @property
+    def date_keys(self) -> set[str]:
+        """影響を受ける日付キー (YYMMDD) の集合。"""
+        return {k for k in (self.old_date_key, self.new_date_key) if k is not None}
+
+    def touches(self, date_key: str) -> bool:
+        """date_key の日のスケジュール一覧が変わるかどうか。"""
+        return date_key in self.date_keys
+
+
+@dataclass(frozen=True)
+class ScheduleAdded(ScheduleChange):
+    """スケジュールが追加された。"""
+
+    kind: ClassVar[str] = "added"
+
+
+@dataclass(frozen=True)
+class ScheduleUpdated(ScheduleChange):
+    """スケジュールが編集された（日付が変わった場合は old と new の日付キーが異なる）。"""
+
+    kind: ClassVar[str] = "updated"
+
+
+@dataclass(frozen=True)
+class ScheduleDeleted(ScheduleChange):
+    """スケジュールが削除された。"""
+
+    kind: ClassVar[str] = "deleted"
+
+
+ChangeListener = Callable[[ScheduleChange], None]
+
+
+class ChangeBus:
+    """変更イベントを購読者へ同期的に配信する。"""
+
+    def __init__(self) -> None:
+        self._listeners: list[ChangeListener] = []
+
+    def subscribe(self, listener: ChangeListener) -> None:
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: ChangeListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def emit(self, change: ScheduleChange) -> None:
+        # 購読者の中で購読解除されても影響しないよう、コピーを回す
+        for listener in list(self._listeners):
+            listener(change)
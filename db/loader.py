@@ -0,0 +1,130 @@
+"""複数ファイル（月ごとのシャード・チームごとのカレンダーなど）の並列読み込み。
+
+各ファイルの JSON の読み込み・validate_records による一括検証・Schedule への変換と
+ソートを ProcessPoolExecutor のワーカーで並列に行い、ファイルごとにソート済みの
+結果（ShardLoad）を返す。全体の並びは merge_shards で k-way マージする
+（各ファイルは既にソート済みなので、全体を並べ直す必要はない）。
+
+ファイルの形式は schedules.json と同じ（``{"version": N, "schedules": [...]}``、圧縮も可）。
+検証に失敗したレコードは読み込まず、ShardLoad.invalid に位置とエラーを記録する。
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing.context import BaseContext
+from operator import itemgetter
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+from db import codecs
+from db.schema import validate_records
+from models.schedule import Schedule
+from utils import perf
+from utils.datetime_util import parse_datetime, to_sort_key
+
+
+@dataclass
+class ShardLoad:
+    """1ファイル分の読み込み結果（schedules は日時順）。"""
+
+    path: Path
+    version: int = 0
+    schedules: list[Schedule] = field(default_factory=list)
+    keys: list[int] = field(default_factory=list)   # schedules と同じ順の整数ソートキー
+    invalid: list[tuple[int, list[str]]] = field(default_factory=list)
+
+
+# ワーカーから返す列の順（Schedule のフィールド順と同じ。Schedule(*row) で復元する）
+_COLUMNS = ("id", "date_time", "date_time_type", "title", "memo", "created_at")
+_row = itemgetter(*_COLUMNS)
+
+# (version, ソートキー, 列ごとの値, 不正なレコード)
+_Columns = tuple[int, list[int], list[list[str]], list[tuple[int, list[str]]]]
+
+
+def _read_columns(path: Path) -> _Columns:
+    """1ファイルを読み込み、検証して日時順に並べ、列ごとのリストで返す。
+
+    ワーカープロセスで実行される。Schedule のリストを pickle で受け渡すより
+    文字列のリストのほうが数倍速いため、Schedule の生成は呼び出し側で行う。
+    """
+    if not path.exists():
+        return 0, [], [], []
+    data = codecs.load_json(path)
+    if not isinstance(data, dict) or not isinstance(data.get("schedules", []), list):
+        raise ValueError(f"スケジュールのファイルの形式ではありません: {path.name}")
+    records = data.get("schedules", [])
+    invalid = validate_records(records)
+    bad = {i for i, _ in invalid}
+    rows: list[tuple[int, tuple[str, ...]]] = []
+    for i, record in enumerate(records):
+        if i in bad:
+            continue
+        try:
+            row = _row(record)
+        except KeyError:
+            # 省略されたフィールドは Schedule の既定値で補う
+            s = Schedule.from_dict(record)
+            row = tuple(getattr(s, name) for name in _COLUMNS)
+        dt, _ = parse_datetime(row[1].strip())
+        rows.append((to_sort_key(dt), row))
+    rows.sort(key=itemgetter(0))
+    keys = [key for key, _ in rows]
+    columns = [list(column) for column in zip(*(row for _, row in rows))]
+    return int(data.get("version", 0)), keys, columns, invalid
+
+
+def _to_shard(path: Path, result: _Columns) -> ShardLoad:
+    version, keys, columns, invalid = result
+    schedules = list(map(Schedule, *columns)) if columns else []
+    return ShardLoad(path, version, schedules, keys, invalid)
+
+
+def load_shard(path: Path) -> ShardLoad:
+    """1ファイルを読み込み、検証して日時順に並べる（ファイルが無ければ空）。"""
+    return _to_shard(path, _read_columns(path))
+
+
+def default_workers(n_files: int) -> int:
+    return max(1, min(n_files, os.cpu_count() or 1))
+
+
+@perf.timed("loader.load_shards")
+def load_shards(
+    paths: Sequence[Path],
+    max_workers: int | None = None,
+    mp_context: BaseContext | None = None,
+) -> list[ShardLoad]:
+    """paths を並列に読み込み、paths と同じ順の ShardLoad のリストを返す。
+
+    max_workers が 1 以下、またはファイルが1つだけの場合はプロセスを起動せずに読み込む。
+    mp_context はワーカーの起動方法（スレッドのあるプロセスからは spawn を渡す）。
+    """
+    workers = max_workers if max_workers is not None else default_workers(len(paths))
+    if workers <= 1 or len(paths) <= 1:
+        return [load_shard(path) for path in paths]
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(paths)), mp_context=mp_context
+    ) as pool:
+        results = list(pool.map(_read_columns, paths))
+    return [_to_shard(path, result) for path, result in zip(paths, results)]
+
+
+def merge_shards(shards: Iterable[ShardLoad]) -> Iterator[Schedule]:
+    """ファイルごとの結果を日時順に1列にマージする（同じ日時はファイルの順）。"""
+    merged = heapq.merge(
+        *(zip(shard.keys, shard.schedules) for shard in shards), key=itemgetter(0)
+    )
+    return (schedule for _, schedule in merged)
+
+
+def load_merged(
+    paths: Sequence[Path], max_workers: int | None = None
+) -> tuple[list[Schedule], list[ShardLoad]]:
+    """paths を並列に読み込み、日時順にマージしたスケジュールとファイルごとの結果を返す。"""
+    shards = load_shards(paths, max_workers)
+    return list(merge_shards(shards)), shards
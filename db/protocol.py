@@ -0,0 +1,124 @@
+"""常駐サーバー（db.daemon）とクライアント間の通信プロトコル。
+
+Unix ドメインソケット上で、4バイト（ビッグエンディアン）の長さ＋UTF-8 の JSON 本文を
+1フレームとしてやり取りする。JSON は空白なしの compact 形式。
+
+    要求: {"id": 3, "op": "day", "date": "2026-02-19"}
+    応答: {"id": 3, "ok": true, "result": [...]}
+          {"id": 3, "ok": false, "error": "..."}
+    通知: {"push": "change", "kind": "updated", "old": {...}, "new": {...}, "version": 12}
+
+通知（push）は変更を行ったクライアントを含む、購読中の全クライアントへ送られる。
+応答より先に送られるため、クライアントは受信順に処理すれば常に最新の状態になる。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import socket
+import struct
+from typing import Any
+
+from db.events import ScheduleAdded, ScheduleChange, ScheduleDeleted, ScheduleUpdated
+from models.schedule import Schedule
+
+_HEADER = struct.Struct(">I")
+# 1フレームの上限（壊れた長さで巨大なバッファを確保しないため）
+MAX_FRAME = 64 * 1024 * 1024
+
+_CHANGE_TYPES: dict[str, type[ScheduleChange]] = {
+    cls.kind: cls for cls in (ScheduleAdded, ScheduleUpdated, ScheduleDeleted)
+}
+
+
+class ProtocolError(Exception):
+    """フレームの形式が不正、または接続が途中で切れた。"""
+
+
+def encode_frame(message: dict[str, Any]) -> bytes:
+    body = json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if len(body) > MAX_FRAME:
+        raise ProtocolError(f"フレームが大きすぎます: {len(body):,} bytes")
+    return _HEADER.pack(len(body)) + body
+
+
+def _decode_body(body: bytes) -> dict[str, Any]:
+    try:
+        message = json.loads(body)
+    except ValueError as e:
+        raise ProtocolError(f"不正なフレームです: {e}") from None
+    if not isinstance(message, dict):
+        raise ProtocolError("フレームの本文はオブジェクトである必要があります")
+    return message
+
+
+def _check_length(length: int) -> None:
+    if length > MAX_FRAME:
+        raise ProtocolError(f"フレームが大きすぎます: {length:,} bytes")
+
+
+async def read_frame(reader: asyncio.StreamReader) -> dict[str, Any] | None:
+    """asyncio のストリームから1フレーム読む（接続が閉じられたら None）。"""
+    try:
+        header = await reader.readexactly(_HEADER.size)
+    except asyncio.IncompleteReadError as e:
+        if not e.partial:
+            return None
+        raise ProtocolError("フレームの途中で接続が切れました") from None
+    (length,) = _HEADER.unpack(header)
+    _check_length(length)
+    try:
+        body = await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        raise ProtocolError("フレームの途中で接続が切れました") from None
+    return _decode_body(body)
+
+
+def _recv_exactly(sock: socket.socket, n: int) -> bytes | None:
+    chunks: list[bytes] = []
+    remaining = n
+    while remaining:
+        chunk = sock.recv(remaining)
+        if not chunk:
+            if remaining == n:
+                return None
+            raise ProtocolError("フレームの途中で接続が切れました")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_frame(sock: socket.socket) -> dict[str, Any] | None:
+    """ブロッキングソケットから1フレーム読む（接続が閉じられたら None）。"""
+    header = _recv_exactly(sock, _HEADER.size)
+    if header is None:
+        return None
+    (length,) = _HEADER.unpack(header)
+    _check_length(length)
+    body = _recv_exactly(sock, length) if length else b""
+    if body is None:
+        raise ProtocolError("フレームの途中で接続が切れました")
+    return _decode_body(body)
+
+
+# ---- 変更イベントの変換 ----
+
+
+def change_to_wire(change: ScheduleChange) -> dict[str, Any]:
+    return {
+        "kind": change.kind,
+        "old": change.old.to_dict() if change.old is not None else None,
+        "new": change.new.to_dict() if change.new is not None else None,
+    }
+
+
+def change_from_wire(message: dict[str, Any]) -> ScheduleChange:
+    cls = _CHANGE_TYPES.get(message.get("kind", ""))
+    if cls is None:
+        raise ProtocolError(f"不明な変更種別です: {message.get('kind')!r}")
+    old, new = message.get("old"), message.get("new")
+    return cls(
+        old=Schedule.from_dict(old) if old is not None else None,
+        new=Schedule.from_dict(new) if new is not None else None,
+    )
@@ -1,29 +1,346 @@
-"""検索・フィルタ・ソートエンジン。"""
+"""検索・フィルタ・ソートエンジン。
+
+NumPy がインストールされている場合、整数ソートキー列 (YYMMDDHHMM, int64) に対する
+一括処理（日付範囲マスク・日別ヒストグラム・占有日付の集計・ソート）は
+ベクトル化カーネルで実行する。未インストール時は純 Python 実装にフォールバックする。
+
+カーネルはソートキー列を既に持っている入力（ScheduleTable）に対して使う。
+list[Schedule] から列を作るのはそれ自体が全件の Python ループで、抽出を直接行うのと
+同じコストがかかるため、list[Schedule] に対する問い合わせは純 Python で行う。
+アプリの表示は ScheduleRepository の索引（日付ごとのリストと OccupancyIndex）を使い、
+これらの関数は一括集計・ベンチマーク用。
+"""
 
 from __future__ import annotations
 
+import calendar
 import datetime
+import itertools
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Sequence
+
+from db.events import ScheduleChange
 from models.schedule import Schedule
-from utils.datetime_util import date_to_key
+from models.schedule_table import ScheduleTable
+from utils import perf
+from utils.datetime_util import date_to_key, month_key, to_sort_key
+
+try:
+    import numpy as np
+except ImportError:  # NumPy は任意依存
+    np = None
+
+# NumPy カーネルを使うかどうか（テストで両経路を切り替えられるよう公開）
+USE_NUMPY = np is not None
+# これより小さい入力では変換コストが勝るため純 Python 実装を使う
+NUMPY_MIN_SIZE = 2048
+
+
+def _use_numpy(n: int) -> bool:
+    return USE_NUMPY and np is not None and n >= NUMPY_MIN_SIZE
+
+
+def _as_int64(keys: Sequence[int]):
+    """ソートキー列を int64 の ndarray に変換する（array('q') はコピーなし）。"""
+    if isinstance(keys, array) and keys.typecode == "q" and len(keys):
+        return np.frombuffer(keys, dtype=np.int64)
+    return np.asarray(keys, dtype=np.int64)
+
+
+def _day_start_key(d: datetime.date) -> int:
+    return to_sort_key(datetime.datetime(d.year, d.month, d.day))
+
+
+def sort_key_column(schedules: Iterable[Schedule] | ScheduleTable) -> array:
+    """スケジュール列から int64 ソートキー列を返す。
+
+    ScheduleTable の場合は保持している列をそのまま返す。
+    """
+    if isinstance(schedules, ScheduleTable):
+        return schedules.sort_keys
+    return array("q", (to_sort_key(s.parsed_datetime) for s in schedules))
+
+
+# ---- kernels ----
 
 
+def date_range_mask(
+    keys: Sequence[int], start: datetime.date, end: datetime.date
+) -> list[bool]:
+    """start 〜 end（両端含む）の日付に該当するかの真偽値リストを返す。"""
+    lo = _day_start_key(start)
+    hi = _day_start_key(end + datetime.timedelta(days=1))
+    if _use_numpy(len(keys)):
+        k = _as_int64(keys)
+        return ((k >= lo) & (k < hi)).tolist()
+    return [lo <= k < hi for k in keys]
+
+
+def day_histogram(keys: Sequence[int], year: int) -> list[int]:
+    """指定年の日別件数を返す（インデックスは元日からの通算日 - 1）。"""
+    days = 366 if calendar.isleap(year) else 365
+    offsets = [0] * 13
+    for m in range(1, 13):
+        offsets[m] = offsets[m - 1] + calendar.monthrange(year, m)[1]
+    yy = year - 2000
+
+    if _use_numpy(len(keys)):
+        ymd = _as_int64(keys) // 10_000
+        ymd = ymd[ymd // 10_000 == yy]
+        doy = np.asarray(offsets, dtype=np.int64)[ymd // 100 % 100 - 1] + ymd % 100 - 1
+        return np.bincount(doy, minlength=days).tolist()
+
+    counts = [0] * days
+    for k in keys:
+        ymd = k // 10_000
+        if ymd // 10_000 == yy:
+            counts[offsets[ymd // 100 % 100 - 1] + ymd % 100 - 1] += 1
+    return counts
+
+
+def occupied_date_keys(keys: Sequence[int]) -> set[str]:
+    """ソートキー列から、スケジュールが存在する日付キー (YYMMDD) の集合を返す。"""
+    if _use_numpy(len(keys)):
+        days = np.unique(_as_int64(keys) // 10_000).tolist()
+    else:
+        days = {k // 10_000 for k in keys}
+    return {f"{d:06d}" for d in days}
+
+
+def argsort_keys(keys: Sequence[int]) -> list[int]:
+    """ソートキー列を安定ソートした場合の並び順（インデックス列）を返す。"""
+    if _use_numpy(len(keys)):
+        return np.argsort(_as_int64(keys), kind="stable").tolist()
+    return sorted(range(len(keys)), key=keys.__getitem__)
+
+
+# ---- queries ----
+
+
+@perf.timed("query.filter_by_date")
 def filter_by_date(schedules: list[Schedule], d: datetime.date) -> list[Schedule]:
-    """指定日付のスケジュールを抽出し、時刻順でソートして返す。"""
+    """指定日付のスケジュールを抽出し、時刻順でソートして返す。
+
+    全件を1回走査する（ScheduleTable は ScheduleTable.filter_by_date で二分探索できる）。
+    """
     key = date_to_key(d)
     matched = [s for s in schedules if s.date_key == key]
     matched.sort(key=lambda s: s.parsed_datetime)
     return matched
 
 
-def dates_with_schedules(schedules: list[Schedule]) -> set[str]:
-    """スケジュールが存在する日付キー (YYMMDD) の集合を返す。"""
+@perf.timed("query.dates_with_schedules")
+def dates_with_schedules(schedules: list[Schedule] | ScheduleTable) -> set[str]:
+    """スケジュールが存在する日付キー (YYMMDD) の集合を返す。
+
+    ScheduleTable を渡した場合はソートキー列から一括で集計する（NumPy があれば
+    ベクトル化する）。list[Schedule] は date_key を1回ずつ走査する。
+    """
+    if isinstance(schedules, ScheduleTable):
+        return occupied_date_keys(schedules.sort_keys)
     return {s.date_key for s in schedules}
 
 
+@perf.timed("query.search_schedules")
 def search_schedules(schedules: list[Schedule], query: str) -> list[Schedule]:
     """タイトルまたはメモにクエリを含むスケジュールを検索する。"""
     q = query.lower()
-    return [
-        s for s in schedules
-        if q in s.title.lower() or q in s.memo.lower()
-    ]
+    return [s for s in schedules if _matches(s, q)]
+
+
+def _matches(schedule: Schedule, q: str) -> bool:
+    """q（小文字にしたクエリ）をタイトルまたはメモに含むか。"""
+    return q in schedule.title.lower() or q in schedule.memo.lower()
+
+
+def _by_datetime(schedule: Schedule) -> datetime.datetime:
+    return schedule.parsed_datetime
+
+
+class SearchCursor:
+    """検索結果を日時順に保持し、前後のヒットへ移動するカーソル。
+
+    データの変更は apply で1件ずつ反映し、検索をやり直さない。
+    """
+
+    def __init__(self, query: str, results: list[Schedule]) -> None:
+        self.query = query
+        self._q = query.lower()
+        self.results: list[Schedule] = sorted(results, key=_by_datetime)
+        self.index = 0
+        self._date_counts: dict[str, int] = {}
+        for s in self.results:
+            self._date_counts[s.date_key] = self._date_counts.get(s.date_key, 0) + 1
+        self.date_keys: set[str] = set(self._date_counts)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    @property
+    def current(self) -> Schedule | None:
+        """現在位置のスケジュールを返す（結果なしなら None）。"""
+        if not self.results:
+            return None
+        return self.results[self.index]
+
+    def next(self) -> Schedule | None:
+        """次のヒットへ進む（末尾の次は先頭に戻る）。"""
+        if not self.results:
+            return None
+        self.index = (self.index + 1) % len(self.results)
+        return self.results[self.index]
+
+    def prev(self) -> Schedule | None:
+        """前のヒットへ戻る（先頭の前は末尾に回る）。"""
+        if not self.results:
+            return None
+        self.index = (self.index - 1) % len(self.results)
+        return self.results[self.index]
+
+    def apply(self, change: ScheduleChange) -> bool:
+        """1件の変更を結果に反映し、結果が変わったかを返す。
+
+        変更前のスケジュールを除き、変更後がクエリに一致すれば日時順の位置に入れる。
+        現在位置は同じスケジュール（除かれた場合はその次のヒット）を指したままにする。
+        """
+        current = self.current
+        removed = change.old is not None and self._remove(change.old)
+        added = change.new is not None and _matches(change.new, self._q)
+        if added:
+            self._insert(change.new)
+        if not (removed or added):
+            return False
+        if not self.results:
+            self.index = 0
+            return True
+        if current is not None and change.old is not None and current.id == change.old.id:
+            current = change.new if added else None
+        if current is None:
+            # 除かれたヒットの次のヒットを指す（末尾だった場合は next と同じく先頭に戻る）
+            self.index %= len(self.results)
+        else:
+            self.index = self._position(current)
+        return True
+
+    def _position(self, schedule: Schedule) -> int:
+        """results 中の schedule（同じ id）の位置。無ければ -1。"""
+        i = bisect_left(self.results, schedule.parsed_datetime, key=_by_datetime)
+        for j in range(i, len(self.results)):
+            s = self.results[j]
+            if s.id == schedule.id:
+                return j
+            if s.parsed_datetime != schedule.parsed_datetime:
+                break
+        return -1
+
+    def _remove(self, schedule: Schedule) -> bool:
+        i = self._position(schedule)
+        if i < 0:
+            return False
+        del self.results[i]
+        key = schedule.date_key
+        self._date_counts[key] -= 1
+        if not self._date_counts[key]:
+            del self._date_counts[key]
+            self.date_keys.discard(key)
+        return True
+
+    def _insert(self, schedule: Schedule) -> None:
+        i = bisect_right(self.results, schedule.parsed_datetime, key=_by_datetime)
+        self.results.insert(i, schedule)
+        key = schedule.date_key
+        self._date_counts[key] = self._date_counts.get(key, 0) + 1
+        self.date_keys.add(key)
+
+    def date_keys_in_month(self, year: int, month: int) -> set[str]:
+        """指定月に含まれるヒットの日付キー (YYMMDD) を返す。"""
+        prefix = month_key(year, month)
+        return {k for k in self.date_keys if k.startswith(prefix)}
+
+
+# OccupancyIndex.generation の採番元（全インスタンスで一意・単調増加）
+_GENERATIONS = itertools.count(1)
+
+
+class OccupancyIndex:
+    """YYMM ごとの占有ビットマスクと日別件数を保持するインデックス。
+
+    ビット ``day - 1`` が立っている日はスケジュールが1件以上ある。
+    追加・編集・削除のたびに差分更新するため、描画時にデータ全体を走査しない。
+
+    ``generation`` は内容が変わるたびに更新される世代番号で、インスタンス間でも
+    重複しない。派生データのキャッシュはこの値が変わったら作り直す。
+    """
+
+    def __init__(self, schedules: Iterable[Schedule] = ()) -> None:
+        self._masks: dict[str, int] = {}
+        self._counts: dict[str, list[int]] = {}
+        for s in schedules:
+            self._add(s)
+        self.generation = next(_GENERATIONS)
+
+    @staticmethod
+    def _split(schedule: Schedule) -> tuple[str, int] | None:
+        key = schedule.date_key
+        if len(key) != 6 or not key.isdigit():
+            return None
+        day = int(key[4:6])
+        if not 1 <= day <= 31:
+            return None
+        return key[:4], day
+
+    def add(self, schedule: Schedule) -> None:
+        """スケジュール1件分を加算する。"""
+        if self._add(schedule):
+            self.generation = next(_GENERATIONS)
+
+    def _add(self, schedule: Schedule) -> bool:
+        split = self._split(schedule)
+        if split is None:
+            return False
+        yymm, day = split
+        counts = self._counts.get(yymm)
+        if counts is None:
+            counts = self._counts[yymm] = [0] * 31
+            self._masks[yymm] = 0
+        counts[day - 1] += 1
+        self._masks[yymm] |= 1 << (day - 1)
+        return True
+
+    def remove(self, schedule: Schedule) -> None:
+        """スケジュール1件分を減算する。"""
+        split = self._split(schedule)
+        if split is None:
+            return
+        yymm, day = split
+        counts = self._counts.get(yymm)
+        if counts is None or counts[day - 1] == 0:
+            return
+        counts[day - 1] -= 1
+        if counts[day - 1] == 0:
+            self._masks[yymm] &= ~(1 << (day - 1))
+            if self._masks[yymm] == 0:
+                del self._masks[yymm]
+                del self._counts[yymm]
+        # 世代は内容の変更後に進める（先読み中の古い計算結果が新しい世代で保存されないように）
+        self.generation = next(_GENERATIONS)
+
+    def replace(self, old: Schedule, new: Schedule) -> None:
+        """編集による日付の移動を反映する。"""
+        self.remove(old)
+        self.add(new)
+
+    def mask(self, year: int, month: int) -> int:
+        """指定月の占有ビットマスクを返す。"""
+        return self._masks.get(month_key(year, month), 0)
+
+    def counts(self, year: int, month: int) -> list[int]:
+        """指定月の日別件数（31要素、インデックスは day - 1）を返す。"""
+        counts = self._counts.get(month_key(year, month))
+        return list(counts) if counts is not None else [0] * 31
+
+    def count(self, d: datetime.date) -> int:
+        """指定日のスケジュール件数を返す。"""
+        counts = self._counts.get(month_key(d.year, d.month))
+        return counts[d.day - 1] if counts is not None else 0
@@ -0,0 +1,188 @@
+"""メモリ上のスケジュール集合と、変更イベントの発行。
+
+ScheduleRepository はアプリが保持するスケジュールの唯一の持ち主で、
+id 順（読み込み順）の一覧・日付キーごとの索引・OccupancyIndex を同時に差分更新する。
+追加・編集・削除のたびに db.events の変更イベントを購読者へ配信する。
+ファイルへの保存は行わない（db.store の役割）。
+"""
+
+from __future__ import annotations
+
+import datetime
+from typing import Iterable
+
+from db.events import (
+    ChangeBus,
+    ChangeListener,
+    ScheduleAdded,
+    ScheduleChange,
+    ScheduleDeleted,
+    ScheduleUpdated,
+)
+from db.query import OccupancyIndex, search_schedules
+from models.schedule import Schedule
+from utils.datetime_util import date_to_key
+
+
+def diff_schedules(
+    current: Iterable[Schedule], incoming: Iterable[Schedule]
+) -> list[ScheduleChange]:
+    """current を incoming に一致させるための変更イベントの列を返す。
+
+    id で対応を取り、内容が異なれば編集とする。ただし created_at が異なる場合は
+    同じ id を再利用した別レコードとみなし、削除と追加に分ける。
+    """
+    before = {s.id: s for s in current}
+    after = {s.id: s for s in incoming}
+    changes: list[ScheduleChange] = []
+    for schedule_id, old in before.items():
+        new = after.get(schedule_id)
+        if new is None or new.created_at != old.created_at:
+            changes.append(ScheduleDeleted(old=old, new=None))
+        elif new != old:
+            changes.append(ScheduleUpdated(old=old, new=new))
+    for schedule_id, new in after.items():
+        old = before.get(schedule_id)
+        if old is None or new.created_at != old.created_at:
+            changes.append(ScheduleAdded(old=None, new=new))
+    return changes
+
+
+class ScheduleRepository:
+    """スケジュールの一覧と派生インデックスを保持し、変更を通知する。"""
+
+    def __init__(self, schedules: Iterable[Schedule] = ()) -> None:
+        self.bus = ChangeBus()
+        self._by_id: dict[str, Schedule] = {}
+        self._by_date: dict[str, list[Schedule]] = {}
+        self.occupancy = OccupancyIndex()
+        # 内容が変わるたびに進む番号（バックグラウンド処理中の変更の検出用）
+        self.revision = 0
+        self._build(schedules)
+
+    def _build(self, schedules: Iterable[Schedule]) -> None:
+        # id が重複している場合は後のレコードを採用する
+        self._by_id = {s.id: s for s in schedules}
+        self._by_date = {}
+        for s in self._by_id.values():
+            self._by_date.setdefault(s.date_key, []).append(s)
+        self.occupancy = OccupancyIndex(self._by_id.values())
+        self.revision += 1
+
+    def reset(self, schedules: Iterable[Schedule]) -> None:
+        """内容を丸ごと置き換える（イベントは発行しない。呼び出し側で全体を再描画する）。"""
+        self._build(schedules)
+
+    # ---- read ----
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, schedule_id: str) -> bool:
+        return schedule_id in self._by_id
+
+    @property
+    def schedules(self) -> list[Schedule]:
+        """全スケジュール（読み込み・追加順）。"""
+        return list(self._by_id.values())
+
+    def get(self, schedule_id: str) -> Schedule | None:
+        return self._by_id.get(schedule_id)
+
+    def for_date(self, d: datetime.date) -> list[Schedule]:
+        """指定日付のスケジュールを時刻順で返す（filter_by_date と同じ結果）。"""
+        same_day = self._by_date.get(date_to_key(d), ())
+        return sorted(same_day, key=lambda s: s.parsed_datetime)
+
+    def between(self, start: datetime.date, end: datetime.date) -> list[Schedule]:
+        """start 〜 end（両端含む）の日付のスケジュールを日時順で返す。"""
+        lo, hi = date_to_key(start), date_to_key(end)
+        matched = [
+            s for key, same_day in self._by_date.items() if lo <= key <= hi
+            for s in same_day
+        ]
+        return sorted(matched, key=lambda s: s.parsed_datetime)
+
+    def search(self, query: str) -> list[Schedule]:
+        """タイトルまたはメモにクエリを含むスケジュールを返す。"""
+        return search_schedules(self.schedules, query)
+
+    # ---- write ----
+
+    def subscribe(self, listener: ChangeListener) -> None:
+        self.bus.subscribe(listener)
+
+    def unsubscribe(self, listener: ChangeListener) -> None:
+        self.bus.unsubscribe(listener)
+
+    def add(self, schedule: Schedule) -> ScheduleAdded:
+        """スケジュールを追加する。
+
+        Raises:
+            ValueError: 同じ id のスケジュールが既にある
+        """
+        if schedule.id in self._by_id:
+            raise ValueError(f"id が重複しています: {schedule.id}")
+        self._insert(schedule)
+        change = ScheduleAdded(old=None, new=schedule)
+        self.bus.emit(change)
+        return change
+
+    def update(self, schedule: Schedule) -> ScheduleUpdated:
+        """同じ id のスケジュールを置き換える（一覧上の位置は変えない）。
+
+        Raises:
+            KeyError: 該当する id が無い
+        """
+        old = self._by_id.get(schedule.id)
+        if old is None:
+            raise KeyError(schedule.id)
+        self._unindex(old)
+        # 既存のキーへの代入なので一覧上の位置は保たれる
+        self._insert(schedule)
+        change = ScheduleUpdated(old=old, new=schedule)
+        self.bus.emit(change)
+        return change
+
+    def delete(self, schedule_id: str) -> ScheduleDeleted:
+        """スケジュールを削除する。
+
+        Raises:
+            KeyError: 該当する id が無い
+        """
+        old = self._by_id.pop(schedule_id, None)
+        if old is None:
+            raise KeyError(schedule_id)
+        self._unindex(old)
+        change = ScheduleDeleted(old=old, new=None)
+        self.bus.emit(change)
+        return change
+
+    def apply(self, change: ScheduleChange) -> ScheduleChange:
+        """diff_schedules などで作った変更を、通常の追加・編集・削除として適用する。"""
+        if isinstance(change, ScheduleAdded):
+            return self.add(change.new)
+        if isinstance(change, ScheduleUpdated):
+            return self.update(change.new)
+        if isinstance(change, ScheduleDeleted):
+            return self.delete(change.old.id)
+        raise TypeError(f"未対応の変更です: {change!r}")
+
+    def _insert(self, schedule: Schedule) -> None:
+        self.revision += 1
+        self._by_id[schedule.id] = schedule
+        self._by_date.setdefault(schedule.date_key, []).append(schedule)
+        self.occupancy.add(schedule)
+
+    def _unindex(self, schedule: Schedule) -> None:
+        """日付索引と OccupancyIndex から取り除く（_by_id は呼び出し側で扱う）。"""
+        self.revision += 1
+        key = schedule.date_key
+        same_day = self._by_date.get(key, [])
+        for i, s in enumerate(same_day):
+            if s.id == schedule.id:
+                del same_day[i]
+                break
+        if not same_day:
+            self._by_date.pop(key, None)
+        self.occupancy.remove(schedule)
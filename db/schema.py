@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import re
+from operator import itemgetter
+
 from utils.datetime_util import parse_datetime
 
 
@@ -26,3 +29,93 @@ def validate_schedule(data: dict) -> list[str]:
         errors.append(f"不正な date_time_type: {dt_type}")
 
     return errors
+
+
+# ---- 読み込み時の一括検証 ----
+
+_FIELDS = ("id", "date_time", "date_time_type", "title", "memo", "created_at")
+_DEFAULTS = {"id": "", "date_time": "", "date_time_type": "exact", "title": "", "memo": "",
+             "created_at": ""}
+_DATE_TIME_TYPES = frozenset(("exact", "until", "from"))
+_DATE_TIME = re.compile(r"(~?)(\d{6})_(\d{4})(~?)", re.ASCII)
+_DAYS_IN_MONTH = (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_row = itemgetter(*_FIELDS)
+
+
+def _valid_key(key: int) -> bool:
+    """YYMMDDHHMM の整数が存在する日時か。"""
+    mm = key // 1_000_000 % 100
+    dd = key // 10_000 % 100
+    return (
+        1 <= mm <= 12
+        and 1 <= dd <= _DAYS_IN_MONTH[mm]
+        and key // 100 % 100 < 24
+        and key % 100 < 60
+        and not (mm == 2 and dd == 29 and key // 100_000_000 % 4)
+    )
+
+
+def _valid_date_time(raw: str) -> bool:
+    """parse_datetime が受け付ける日時文字列か（datetime を生成せずに判定する）。"""
+    n = len(raw)
+    # 前後に空白のない3形式（11 / 12 文字）は正規表現を使わずに判定する
+    if n == 11 or (n == 12 and (raw[0] == "~") != (raw[11] == "~")):
+        s = raw[1:] if raw[0] == "~" else raw
+        if s[6] == "_":
+            digits = s[:6] + s[7:11]
+            if digits.isdigit() and digits.isascii():
+                return _valid_key(int(digits))
+    m = _DATE_TIME.fullmatch(raw.strip())
+    if m is None or (m[1] and m[4]):
+        return False
+    return _valid_key(int(m[2] + m[3]))
+
+
+def _is_valid(record: object) -> bool:
+    """validate_records の高速判定（正常なレコードではリストなどを生成しない）。"""
+    try:
+        # 6項目すべてを持つレコード（保存したファイルは常にこの形）は1回で取り出す
+        id_, date_time, date_time_type, title, memo, created_at = _row(record)
+    except (KeyError, TypeError):
+        if type(record) is not dict:
+            return False
+        # 省略された項目は Schedule の既定値で補われる
+        return _is_valid({**_DEFAULTS, **record})
+    return (
+        type(title) is str
+        and type(date_time) is str
+        and type(id_) is str
+        and type(memo) is str
+        and type(created_at) is str
+        and type(date_time_type) is str
+        and date_time_type in _DATE_TIME_TYPES
+        and not title.isspace()
+        and title != ""
+        and _valid_date_time(date_time)
+    )
+
+
+def _reasons(record: object) -> list[str]:
+    """不正なレコードのエラーメッセージ（validate_schedule に型の検査を加えたもの）。"""
+    if not isinstance(record, dict):
+        return ["レコードがオブジェクトではありません"]
+    errors = [
+        f"{name} は文字列で指定してください"
+        for name in _FIELDS
+        if not isinstance(record.get(name, ""), str)
+    ]
+    if errors:
+        return errors
+    # 全角数字の日時など、高速判定だけが受け付けないもの
+    return validate_schedule(record) or ["日時は半角数字の YYMMDD_HHMM で指定してください"]
+
+
+def validate_records(records: list) -> list[tuple[int, list[str]]]:
+    """読み込んだレコードを一括で検証し、不正なレコードの (位置, エラー) を返す。
+
+    各レコードはまず高速判定（項目をまとめて取り出し、型・必須項目・日時の形式と
+    範囲を調べる）だけを通し、不正と判定したものだけエラーを組み立てる。
+    正常なレコードでは datetime やエラーのリストを生成しない。
+    """
+    is_valid = _is_valid
+    return [(i, _reasons(r)) for i, r in enumerate(records) if not is_valid(r)]
@@ -1,47 +1,548 @@
-"""JSON ファイル読み書き・バックアップ管理。"""
+"""JSON ファイル読み書き・バックアップ管理。
+
+schedules.json は ``{"version": N, "schedules": [...]}`` の形式で、version は保存のたびに
+1 ずつ増える（version が無いファイルは 0 として扱う）。書き込みは
+``schedules.json.lock`` に対する fcntl の排他ロック（advisory lock）の中で行い、
+一時ファイルに書いてから置き換えるため、読み込み側が書きかけの内容を見ることはない。
+
+複数のインスタンスが同じデータを開いている場合は save_merged を使う。
+読み込んだときの version と一致すればそのまま書き、別のインスタンスが先に保存していれば、
+読み込み時点の内容を共通の祖先とした3方向マージで、互いに重ならない変更を両方残す。
+同じレコードを双方が変更していた場合は、そのレコードだけ先に保存された側の内容を採用して
+書き込み、衝突した id を SaveResult.conflicts で返す（重ならない変更は失わない）。
+
+``a`` で始まる関数（aload_schedules / asave_merged など）は同じ処理の asyncio 版で、
+ファイルの読み書きと JSON の変換を既定のスレッドプールで行う。progress には
+(段階, 処理済み, 全体) がイベントループのスレッドで通知される。段階は読み込みが
+"read"（バイト）→ "decode"（件数）、保存が "encode"（件数）→ "write"（バイト）。
+待っているタスクをキャンセルすると、スレッド側も次の区切りで中断する。
+保存はファイルを置き換える直前まで中断でき、中断した場合はファイルを変更しない。
+
+config.json の ``"compression"``（none / gzip / zlib / lzma、db.codecs）を指定すると、
+schedules.json を圧縮して（空白を省いた JSON で）保存する。ファイル名は変わらず、
+読み込み時は先頭のバイト列から形式を判定するため、途中で設定を変えても読み込める。
+圧縮する場合の保存は、件数ごとに JSON へ変換しながら圧縮して書き込み（段階は "write"）、
+変換後の全体をメモリに持たない。
+
+読み込んだレコードは db.schema.validate_records で一括して検証し、不正なレコード
+（日時の形式が誤っているなど）は読み込まずに ``schedules.quarantine.json`` へ理由と
+ともに移す（隔離）。隔離したレコードは次の保存で schedules.json からも消える。
+"""
 
 from __future__ import annotations
 
+import asyncio
 import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Callable, Iterator, TypeVar
 
+from db import codecs
+from db.schema import validate_records
+from db.watcher import FileSignature, file_signature
 from models.schedule import Schedule
+from models.schedule_table import ScheduleTable
+from utils import perf
 from utils.backup import create_backup
 
+try:
+    import fcntl
+except ImportError:  # Windows では排他ロックなしで動作する
+    fcntl = None
+
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 SCHEDULE_FILE = DATA_DIR / "schedules.json"
 CONFIG_FILE = DATA_DIR / "config.json"
 
+# schedules.json の保存時の圧縮形式（configure_compression で設定する）
+COMPRESSION = "none"
+
+# 保存時に version だけを読む場合の、先頭の読み込み量と形式
+# （保存するファイルは常に version を最初のキーとして書く）
+_VERSION_PEEK = 64
+_VERSION_HEADER = re.compile(rb'\s*\{\s*"version"\s*:\s*(\d+)\s*[,}]')
+
+# 進捗の通知と中断の確認を行う単位
+_IO_CHUNK = 1 << 20
+_RECORD_CHUNK = 5000
+
+# (段階, 処理済み, 全体)
+ProgressCallback = Callable[[str, int, int], None]
+
+T = TypeVar("T")
+
+
+class VersionConflict(Exception):
+    """保存しようとした version が、ファイルの現在の version と一致しない。"""
+
+    def __init__(self, expected: int, actual: int) -> None:
+        super().__init__(
+            f"データは他で更新されています (読み込み時 version {expected}, 現在 {actual})"
+        )
+        self.expected = expected
+        self.actual = actual
+
+
+class MergeConflict(Exception):
+    """同じスケジュールを、こちらと他のインスタンスの双方が変更していた（変更を要求した側に通知する）。"""
+
+    def __init__(self, ids: list[str], version: int) -> None:
+        super().__init__(f"同じスケジュールが他で変更されています: {', '.join(ids)}")
+        self.ids = ids
+        self.version = version
+
+
+@dataclass(frozen=True)
+class SaveResult:
+    """save_merged の結果。"""
+
+    schedules: list[Schedule]          # 保存した内容（マージした場合は他の変更を含む）
+    version: int                       # 保存後の version
+    merged: bool                       # 他の変更とマージしたかどうか
+    signature: FileSignature | None    # 保存直後のファイルのシグネチャ
+    # 双方が変更していたため、他の内容を採用したレコードの id
+    conflicts: list[str] = field(default_factory=list)
+
+
+@dataclass
+class LoadReport:
+    """読み込み1回分の内訳。呼び出し側で作って渡すと、読み込みの中で記入される。"""
+
+    # 段階（"read" / "validate" / "decode"）ごとの所要時間（秒）
+    timings: dict[str, float] = field(default_factory=dict)
+    quarantined: int = 0    # 隔離したレコードの件数
+
+
+class _Cancelled(Exception):
+    """待っていたタスクがキャンセルされたため、スレッド側の処理を中断した。"""
+
+
+class _Job:
+    """スレッドで実行する読み書き1回分の、中断要求と進捗の通知先。"""
+
+    def __init__(self, progress: ProgressCallback | None = None) -> None:
+        self._cancelled = threading.Event()
+        self._progress = progress
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def check(self) -> None:
+        if self._cancelled.is_set():
+            raise _Cancelled
+
+    def report(self, phase: str, done: int, total: int) -> None:
+        self.check()
+        if self._progress is not None:
+            self._progress(phase, done, total)
+
+
+# 同期版の関数が使う（中断されず、進捗も通知しない）
+_NO_JOB = _Job()
+
+
+async def _run_job(
+    fn: Callable[..., T], *args: Any, progress: ProgressCallback | None
+) -> T:
+    """fn(*args, job) を既定のスレッドプールで実行し、結果を待つ。"""
+    loop = asyncio.get_running_loop()
+    report = None
+    if progress is not None:
+
+        def report(phase: str, done: int, total: int) -> None:
+            loop.call_soon_threadsafe(progress, phase, done, total)
+
+    job = _Job(report)
+    try:
+        return await loop.run_in_executor(None, fn, *args, job)
+    except asyncio.CancelledError:
+        job.cancel()
+        raise
+
 
 def _ensure_data_dir() -> None:
     DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 
+@contextmanager
+def file_lock() -> Iterator[None]:
+    """schedules.json への書き込み用の排他ロック（プロセス間の advisory lock）。"""
+    _ensure_data_dir()
+    lock_path = SCHEDULE_FILE.with_suffix(SCHEDULE_FILE.suffix + ".lock")
+    with open(lock_path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def configure_compression(config: dict[str, Any]) -> str:
+    """config.json の compression を保存時の圧縮形式として設定し、設定した形式を返す。
+
+    Raises:
+        ValueError: 未対応の圧縮形式
+    """
+    global COMPRESSION
+    COMPRESSION = codecs.check_codec(config.get("compression", "none"))
+    return COMPRESSION
+
+
+def _read_payload(job: _Job = _NO_JOB) -> dict[str, Any]:
+    if not SCHEDULE_FILE.exists():
+        return {}
+    with open(SCHEDULE_FILE, "rb") as f:
+        total = os.fstat(f.fileno()).st_size
+        codec = codecs.detect(f.read(codecs.HEADER_SIZE))
+        f.seek(0)
+        # 進捗はファイル上の（圧縮後の）バイト数で通知する
+        data = codecs.read_all(
+            f, codec, _IO_CHUNK, lambda done: job.report("read", done, total)
+        )
+    return json.loads(data)
+
+
+def _read_version(job: _Job = _NO_JOB) -> int:
+    """schedules.json の version を返す。
+
+    先頭に version があれば残りは読まない（手で書いたファイルなどで無ければ全体を読む）。
+    """
+    if not SCHEDULE_FILE.exists():
+        return 0
+    with open(SCHEDULE_FILE, "rb") as f:
+        codec = codecs.detect(f.read(codecs.HEADER_SIZE))
+        f.seek(0)
+        m = _VERSION_HEADER.match(codecs.read_head(f, codec, _VERSION_PEEK))
+    if m is not None:
+        return int(m[1])
+    return int(_read_payload(job).get("version", 0))
+
+
+def _decode_schedules(records: list[dict[str, Any]], job: _Job = _NO_JOB) -> list[Schedule]:
+    schedules: list[Schedule] = []
+    for start in range(0, len(records), _RECORD_CHUNK):
+        schedules.extend(
+            Schedule.from_dict(d) for d in records[start:start + _RECORD_CHUNK]
+        )
+        job.report("decode", len(schedules), len(records))
+    return schedules
+
+
+def _write_plain(
+    f: IO[bytes], schedules: list[Schedule], version: int, job: _Job
+) -> None:
+    """整形した JSON を書く（全体を変換してから少しずつ書く）。"""
+    records: list[dict[str, Any]] = []
+    for start in range(0, len(schedules), _RECORD_CHUNK):
+        records.extend(s.to_dict() for s in schedules[start:start + _RECORD_CHUNK])
+        job.report("encode", len(records), len(schedules))
+    payload: dict[str, Any] = {"version": version, "schedules": records}
+    data = json.dumps(payload, **codecs.json_options("none")).encode("utf-8")
+    del records, payload
+    job.check()
+    for start in range(0, len(data), _IO_CHUNK):
+        f.write(data[start:start + _IO_CHUNK])
+        job.report("write", min(start + _IO_CHUNK, len(data)), len(data))
+
+
+def _write_stream(
+    f: IO[bytes], schedules: list[Schedule], version: int, job: _Job
+) -> None:
+    """_RECORD_CHUNK 件ずつ JSON に変換して f（圧縮ストリーム）に書く。"""
+    options = codecs.json_options(COMPRESSION)
+    f.write(b'{"version":%d,"schedules":[' % version)
+    for start in range(0, len(schedules), _RECORD_CHUNK):
+        chunk = [s.to_dict() for s in schedules[start:start + _RECORD_CHUNK]]
+        if start:
+            f.write(b",")
+        f.write(json.dumps(chunk, **options)[1:-1].encode("utf-8"))
+        job.report("write", start + len(chunk), len(schedules))
+    f.write(b"]}")
+
+
+def _write_payload(schedules: list[Schedule], version: int, job: _Job = _NO_JOB) -> None:
+    """バックアップを取り、一時ファイル経由で置き換える（ロックの中で呼ぶ）。"""
+    job.check()
+    # 置き換えで元のファイルは書き換わらないため、コピーせずにリンクで残す
+    create_backup(SCHEDULE_FILE, link=True)
+    tmp = SCHEDULE_FILE.with_suffix(SCHEDULE_FILE.suffix + ".tmp")
+    try:
+        with open(tmp, "wb") as raw:
+            if COMPRESSION == "none":
+                _write_plain(raw, schedules, version, job)
+            else:
+                with codecs.writer(raw, COMPRESSION) as f:
+                    _write_stream(f, schedules, version, job)
+    except _Cancelled:
+        tmp.unlink(missing_ok=True)
+        raise
+    # ここから先は中断しない（置き換えた時点で保存は完了している）
+    os.replace(tmp, SCHEDULE_FILE)
+
+
+def quarantine_path() -> Path:
+    return SCHEDULE_FILE.with_name(SCHEDULE_FILE.stem + ".quarantine.json")
+
+
+def _quarantine(records: list[Any], invalid: list[tuple[int, list[str]]]) -> None:
+    """不正なレコードを理由とともに隔離ファイルへ追記する（同じ内容のものは1件だけ残す）。
+
+    schedules.json のロックは取らない（保存中の読み込みからも呼ばれるため）。
+    一時ファイル名をプロセスごとに分け、置き換えで書き込む。
+    """
+    path = quarantine_path()
+    entries: list[dict[str, Any]] = []
+    if path.exists():
+        try:
+            with open(path, encoding="utf-8") as f:
+                entries = json.load(f).get("records", [])
+        except (OSError, ValueError):
+            entries = []
+    seen = {json.dumps(e.get("record"), sort_keys=True) for e in entries}
+    now = datetime.now().isoformat(timespec="seconds")
+    added = False
+    for i, errors in invalid:
+        key = json.dumps(records[i], sort_keys=True)
+        if key in seen:
+            continue
+        seen.add(key)
+        entries.append({
+            "quarantined_at": now,
+            "source": SCHEDULE_FILE.name,
+            "index": i,
+            "errors": errors,
+            "record": records[i],
+        })
+        added = True
+    if not added:
+        return
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"records": entries}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def _valid_schedules(
+    records: list[Any], job: _Job = _NO_JOB, report: LoadReport | None = None
+) -> list[Schedule]:
+    """レコードを一括で検証し、不正なものを隔離してから Schedule に変換する。"""
+    start = time.perf_counter()
+    invalid = validate_records(records)
+    if invalid:
+        _quarantine(records, invalid)
+        bad = {i for i, _ in invalid}
+        records = [r for i, r in enumerate(records) if i not in bad]
+    validated = time.perf_counter()
+    job.check()
+    schedules = _decode_schedules(records, job)
+    if report is not None:
+        report.timings["validate"] = validated - start
+        report.timings["decode"] = time.perf_counter() - validated
+        report.quarantined = len(invalid)
+    return schedules
+
+
+def _load_versioned(
+    report: LoadReport | None = None, job: _Job = _NO_JOB
+) -> tuple[list[Schedule], int]:
+    _ensure_data_dir()
+    start = time.perf_counter()
+    data = _read_payload(job)
+    if report is not None:
+        report.timings["read"] = time.perf_counter() - start
+    schedules = _valid_schedules(data.get("schedules", []), job, report)
+    return schedules, int(data.get("version", 0))
+
+
+@perf.timed("store.load_schedules")
+def load_schedules_versioned(
+    report: LoadReport | None = None,
+) -> tuple[list[Schedule], int]:
+    """schedules.json からスケジュールと version を読み込む。
+
+    report を渡すと、段階ごとの所要時間と隔離した件数を記入する。
+    """
+    return _load_versioned(report)
+
+
+@perf.timed("store.aload_schedules")
+async def aload_schedules_versioned(
+    progress: ProgressCallback | None = None,
+    report: LoadReport | None = None,
+) -> tuple[list[Schedule], int]:
+    """load_schedules_versioned の asyncio 版。"""
+    return await _run_job(_load_versioned, report, progress=progress)
+
+
+async def aload_schedules(progress: ProgressCallback | None = None) -> list[Schedule]:
+    """load_schedules の asyncio 版。"""
+    return (await aload_schedules_versioned(progress))[0]
+
+
 def load_schedules() -> list[Schedule]:
     """schedules.json からスケジュールを読み込む。"""
+    return load_schedules_versioned()[0]
+
+
+@perf.timed("store.load_schedule_table")
+def load_schedule_table() -> ScheduleTable:
+    """schedules.json を列指向の ScheduleTable として読み込む（大規模データ向け）。"""
     _ensure_data_dir()
     if not SCHEDULE_FILE.exists():
-        return []
-    with open(SCHEDULE_FILE, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return [Schedule.from_dict(d) for d in data.get("schedules", [])]
+        return ScheduleTable()
+    data = codecs.load_json(SCHEDULE_FILE)
+    return ScheduleTable.from_dicts(data.get("schedules", []))
 
 
-def save_schedules(schedules: list[Schedule]) -> None:
-    """スケジュールを schedules.json に書き込む（バックアップ付き）。"""
-    _ensure_data_dir()
-    if SCHEDULE_FILE.exists():
-        create_backup(SCHEDULE_FILE)
-    payload: dict[str, Any] = {
-        "schedules": [s.to_dict() for s in schedules]
-    }
-    with open(SCHEDULE_FILE, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+@perf.timed("store.save_schedules")
+def save_schedules(
+    schedules: list[Schedule], expected_version: int | None = None
+) -> int:
+    """スケジュールを schedules.json に書き込み（バックアップ付き）、新しい version を返す。
+
+    expected_version を指定すると、ファイルの version が一致する場合だけ書き込む。
+
+    Raises:
+        VersionConflict: expected_version がファイルの version と一致しない
+    """
+    return _save(schedules, expected_version)
 
 
+def _save(
+    schedules: list[Schedule], expected_version: int | None, job: _Job = _NO_JOB
+) -> int:
+    with file_lock():
+        current = _read_version(job)
+        if expected_version is not None and expected_version != current:
+            raise VersionConflict(expected_version, current)
+        _write_payload(schedules, current + 1, job)
+        return current + 1
+
+
+@perf.timed("store.asave_schedules")
+async def asave_schedules(
+    schedules: list[Schedule],
+    expected_version: int | None = None,
+    progress: ProgressCallback | None = None,
+) -> int:
+    """save_schedules の asyncio 版。"""
+    return await _run_job(_save, schedules, expected_version, progress=progress)
+
+
+def merge_schedules(
+    base: list[Schedule], ours: list[Schedule], theirs: list[Schedule]
+) -> tuple[list[Schedule], list[str]]:
+    """共通の祖先 base に対する ours と theirs の変更を id 単位でマージする。
+
+    片方だけが変更（追加・編集・削除）したレコードはその変更を採用し、
+    双方が異なる内容に変更したレコードは theirs の内容を採用して、衝突として id を返す。
+    並び順は theirs の順で、ours だけで追加したレコードを末尾に続ける。
+
+    Returns:
+        (マージ結果, 衝突したレコードの id のリスト)
+    """
+    base_by_id = {s.id: s for s in base}
+    ours_by_id = {s.id: s for s in ours}
+    theirs_by_id = {s.id: s for s in theirs}
+
+    merged: list[Schedule] = []
+    conflicts: list[str] = []
+    for schedule_id in dict.fromkeys([*theirs_by_id, *ours_by_id]):
+        b = base_by_id.get(schedule_id)
+        o = ours_by_id.get(schedule_id)
+        t = theirs_by_id.get(schedule_id)
+        if o == t:
+            result = o
+        elif o == b:
+            result = t   # こちらは未変更
+        elif t == b:
+            result = o   # 他は未変更
+        else:
+            conflicts.append(schedule_id)
+            result = t   # 先に保存された側を採用する
+        if result is not None:
+            merged.append(result)
+    return merged, conflicts
+
+
+@perf.timed("store.save_merged")
+def save_merged(
+    base: list[Schedule],
+    ours: list[Schedule],
+    base_version: int,
+    known_signature: FileSignature | None = None,
+) -> SaveResult:
+    """version を確認して保存する（compare-and-swap）。他で保存されていればマージする。
+
+    双方が変更していたレコードは他の内容を採用して保存し、その id を
+    SaveResult.conflicts で返す（こちらの他の変更はそのまま保存する）。
+
+    Args:
+        base:            base_version の時点でファイルから読んだ内容
+        ours:            保存したい内容
+        base_version:    base を読んだときの version
+        known_signature: base_version 時点のファイルのシグネチャ。ロック取得後も
+                         一致すれば、ファイルを読み直さずに version が同じと判断する
+    """
+    return _save_merged(base, ours, base_version, known_signature)
+
+
+def _save_merged(
+    base: list[Schedule],
+    ours: list[Schedule],
+    base_version: int,
+    known_signature: FileSignature | None,
+    job: _Job = _NO_JOB,
+) -> SaveResult:
+    with file_lock():
+        signature = file_signature(SCHEDULE_FILE)
+        if known_signature is not None and signature == known_signature:
+            current, theirs = base_version, None
+        else:
+            data = _read_payload(job)
+            current = int(data.get("version", 0))
+            theirs = _valid_schedules(data.get("schedules", []), job)
+
+        merged = False
+        conflicts: list[str] = []
+        if current != base_version and theirs is not None:
+            ours, conflicts = merge_schedules(base, ours, theirs)
+            merged = True
+        _write_payload(ours, current + 1, job)
+        return SaveResult(
+            ours, current + 1, merged, file_signature(SCHEDULE_FILE), conflicts
+        )
+
+
+@perf.timed("store.asave_merged")
+async def asave_merged(
+    base: list[Schedule],
+    ours: list[Schedule],
+    base_version: int,
+    known_signature: FileSignature | None = None,
+    progress: ProgressCallback | None = None,
+) -> SaveResult:
+    """save_merged の asyncio 版。"""
+    return await _run_job(
+        _save_merged, base, ours, base_version, known_signature, progress=progress
+    )
+
+
+@perf.timed("store.load_config")
 def load_config() -> dict[str, Any]:
     """config.json を読み込む。"""
+    return _load_config()
+
+
+def _load_config(job: _Job = _NO_JOB) -> dict[str, Any]:
     _ensure_data_dir()
     if not CONFIG_FILE.exists():
         return {}
@@ -49,8 +550,25 @@ def load_config() -> dict[str, Any]:
         return json.load(f)
 
 
+@perf.timed("store.save_config")
 def save_config(config: dict[str, Any]) -> None:
     """config.json を書き込む。"""
+    _save_config(config)
+
+
+def _save_config(config: dict[str, Any], job: _Job = _NO_JOB) -> None:
     _ensure_data_dir()
+    data = json.dumps(config, ensure_ascii=False, indent=2)
+    job.check()
     with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-        json.dump(config, f, ensure_ascii=False, indent=2)
+        f.write(data)
+
+
+async def aload_config() -> dict[str, Any]:
+    """load_config の asyncio 版。"""
+    return await _run_job(_load_config, progress=None)
+
+
+async def asave_config(config: dict[str, Any]) -> None:
+    """save_config の asyncio 版。"""
+    await _run_job(_save_config, config, progress=None)
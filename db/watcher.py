@@ -0,0 +1,61 @@
+"""データファイルの外部変更の検出（stat のポーリング）。
+
+スクリプトや別のインスタンスが schedules.json を書き換えたことを、
+更新時刻（ナノ秒）・サイズ・inode の組み合わせで検出する。
+アトミックな置き換え（別ファイルに書いて rename）では inode が変わり、
+同じ秒・同じサイズの上書きでも mtime_ns が変わるため、いずれかの差で判定する。
+外部依存（inotify など）は使わず、os.stat だけで動作する。
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+# 既定のポーリング間隔（秒）
+DEFAULT_INTERVAL = 1.0
+
+
+class FileSignature(NamedTuple):
+    """ファイルの同一性の判定に使う stat の値。"""
+
+    mtime_ns: int
+    size: int
+    inode: int
+
+
+def file_signature(path: Path) -> FileSignature | None:
+    """path の現在のシグネチャを返す（ファイルが無ければ None）。"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return FileSignature(st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class FileWatcher:
+    """最後に同期したときのシグネチャと比べて、ファイルの変更を検出する。
+
+    自分で書き込んだ直後や読み込み直後に mark_synced() を呼ぶと、
+    その時点の内容は「変更なし」として扱われる。
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._synced = file_signature(path)
+
+    @property
+    def synced(self) -> FileSignature | None:
+        return self._synced
+
+    def signature(self) -> FileSignature | None:
+        return file_signature(self.path)
+
+    def changed(self) -> bool:
+        """最後の同期以降にファイルが変わったかどうか。"""
+        return self.signature() != self._synced
+
+    def mark_synced(self, signature: FileSignature | None = None) -> None:
+        """signature（省略時は現在の状態）を同期済みとして記録する。"""
+        self._synced = signature if signature is not None else self.signature()
@@ -1,12 +1,137 @@
 #!/usr/bin/env python3
-"""JSON スケジュール管理 TUI — エントリポイント。"""
+"""JSON スケジュール管理 TUI — エントリポイント。
+
+使い方:
+    python main.py [--perf-log] [--sample-profile [--sample-hz HZ]] [--record-trace [PATH]]
+                   [--watch-interval SECONDS] [--connect [SOCKET]]
+
+オプション:
+    --perf-log        処理時間を log/perf_*.jsonl に記録する（python -m utils.perf_summary で集計）
+    --sample-profile  スタックサンプラーを起動時から動かし、F9 で停止・再開する。
+                      停止ごとに log/profile_*.collapsed（フレームグラフ用）を書き出す
+    --sample-hz       サンプリング周波数（既定: 100）
+    --record-trace    キー・マウス入力を log/trace_*.jsonl（または PATH）に記録する。
+                      python -m benchmarks.replay_trace で再生できる
+    --watch-interval  data/schedules.json の外部変更を確認する間隔（秒、既定: 1.0、0 で無効）
+    --connect         常駐サーバー（python -m db.daemon）に接続し、データを持たずに動かす。
+                      SOCKET を省略すると data/daemon.sock
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import sys
+from pathlib import Path
 
 from app import ScheduleApp
+from db.watcher import DEFAULT_INTERVAL
+from utils.perf_log import LOG_DIR
+from utils.sampler import DEFAULT_HZ, StackSampler
+from utils.trace import TraceRecorder
 
 
 def main() -> None:
-    app = ScheduleApp()
-    app.run()
+    parser = argparse.ArgumentParser(description="JSON スケジュール管理 TUI")
+    parser.add_argument(
+        "--perf-log",
+        action="store_true",
+        help="処理時間を log/perf_*.jsonl に記録する",
+    )
+    parser.add_argument(
+        "--sample-profile",
+        action="store_true",
+        help="スタックサンプリングを有効にする（F9 で停止・再開）",
+    )
+    parser.add_argument(
+        "--sample-hz",
+        type=float,
+        default=DEFAULT_HZ,
+        help=f"サンプリング周波数 (既定: {DEFAULT_HZ})",
+    )
+    parser.add_argument(
+        "--record-trace",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="キー・マウス入力をトレースとして記録する",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        metavar="SECONDS",
+        help=f"データファイルの外部変更を確認する間隔 (既定: {DEFAULT_INTERVAL}、0 で無効)",
+    )
+    parser.add_argument(
+        "--connect",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="SOCKET",
+        help="常駐サーバーに接続して動かす (既定: data/daemon.sock)",
+    )
+    args = parser.parse_args()
+    if args.watch_interval < 0:
+        parser.error("--watch-interval は 0 以上で指定してください")
+
+    remote = None
+    if args.connect is not None:
+        from db.client import DaemonClient, DaemonError, RemoteRepository
+        from db.daemon import default_socket_path
+
+        socket_path = Path(args.connect) if args.connect else default_socket_path()
+        try:
+            remote = RemoteRepository(DaemonClient(socket_path))
+        except DaemonError as e:
+            print(f"[CONNECT] {e}", file=sys.stderr)
+            sys.exit(1)
+
+    logger = None
+    if args.perf_log:
+        from utils import perf_log
+
+        logger = perf_log.start()
+
+    sampler = None
+    if args.sample_profile:
+        if args.sample_hz <= 0:
+            parser.error("--sample-hz は正の値で指定してください")
+        sampler = StackSampler(args.sample_hz)
+        sampler.start()
+
+    trace = None
+    if args.record_trace is not None:
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = (
+            Path(args.record_trace)
+            if args.record_trace
+            else LOG_DIR / f"trace_{timestamp}.jsonl"
+        )
+        trace = TraceRecorder(path)
+
+    app = ScheduleApp(
+        sampler=sampler,
+        trace=trace,
+        watch_interval=args.watch_interval or None,
+        remote=remote,
+    )
+    try:
+        app.run()
+    finally:
+        if remote is not None:
+            remote.client.close()
+        if trace is not None:
+            trace.close()
+            print(f"[TRACE] トレース: {trace.path} ({trace.events} イベント)")
+        if sampler is not None:
+            path = sampler.stop()
+            if path is not None:
+                print(f"[PROFILE] プロファイル: {path}")
+        if logger is not None:
+            perf_log.stop(logger)
+            print(f"[PERF] ログファイル: {logger.path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,282 @@
+"""列指向 (struct-of-arrays) のスケジュールテーブル。
+
+``list[Schedule]`` はレコードごとに dataclass インスタンスと複数の str を持つため、
+100 万件規模ではメモリの大半をオブジェクトヘッダが占める。
+ScheduleTable は各フィールドを列として保持する読み取り専用コンテナ:
+
+  - 日時:   ``array('q')`` の整数ソートキー (YYMMDDHHMM) ＋ ``array('b')`` のタイプコード
+            （下位2ビットが date_time_type、その上が date_time の ``~`` の位置）
+  - 文字列: UTF-8 で1本の共有バッファに連結し、``array('q')`` のオフセットで参照
+
+行はソートキー昇順に並べて格納するため、日付範囲の抽出は二分探索で行える。
+"""
+
+from __future__ import annotations
+
+import datetime
+from array import array
+from bisect import bisect_left
+from typing import Any, Iterable, Iterator
+
+from models.schedule import Schedule
+from utils.datetime_util import (
+    format_datetime,
+    from_sort_key,
+    parse_datetime,
+    to_sort_key,
+)
+
+DATE_TIME_TYPES = ("exact", "until", "from")
+TYPE_CODES = {name: code for code, name in enumerate(DATE_TIME_TYPES)}
+_SHAPE_SHIFT = 2
+_TYPE_MASK = (1 << _SHAPE_SHIFT) - 1
+
+
+def _type_code(date_time_type: str, shape: str) -> int:
+    """date_time_type と date_time の ``~`` の位置（parse_datetime の判定）をまとめたコードを返す。
+
+    Raises:
+        ValueError: date_time_type が exact / until / from のいずれでもない
+    """
+    try:
+        return TYPE_CODES[date_time_type] | TYPE_CODES[shape] << _SHAPE_SHIFT
+    except KeyError:
+        raise ValueError(f"不明な date_time_type です: {date_time_type!r}") from None
+
+
+def _date_lower_bound(d: datetime.date) -> int:
+    """日付 d の 00:00 に対応するソートキーを返す。"""
+    return to_sort_key(datetime.datetime(d.year, d.month, d.day))
+
+
+class StringColumn:
+    """文字列を1本の UTF-8 バッファに連結して保持する列。"""
+
+    __slots__ = ("_buffer", "_offsets")
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._offsets = array("q", [0])
+
+    def append(self, value: str) -> None:
+        self._buffer += value.encode("utf-8")
+        self._offsets.append(len(self._buffer))
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        start = self._offsets[i]
+        end = self._offsets[i + 1]
+        return self._buffer[start:end].decode("utf-8")
+
+    def permuted(self, order: Iterable[int]) -> StringColumn:
+        """order の順に要素を並べ替えた新しい列を返す。"""
+        out = StringColumn()
+        buf = self._buffer
+        offsets = self._offsets
+        for i in order:
+            out._buffer += buf[offsets[i]:offsets[i + 1]]
+            out._offsets.append(len(out._buffer))
+        return out
+
+    def nbytes(self) -> int:
+        """バッファとオフセット配列のバイト数を返す。"""
+        return len(self._buffer) + self._offsets.itemsize * len(self._offsets)
+
+
+class ScheduleRow:
+    """ScheduleTable の1行を Schedule と同じ属性で参照するビュー。"""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: ScheduleTable, index: int) -> None:
+        self._table = table
+        self._index = index
+
+    @property
+    def id(self) -> str:
+        return self._table._ids[self._index]
+
+    @property
+    def date_time(self) -> str:
+        shape = DATE_TIME_TYPES[self._table.type_codes[self._index] >> _SHAPE_SHIFT]
+        return format_datetime(self.parsed_datetime, shape)
+
+    @property
+    def date_time_type(self) -> str:
+        return DATE_TIME_TYPES[self._table.type_codes[self._index] & _TYPE_MASK]
+
+    @property
+    def title(self) -> str:
+        return self._table._titles[self._index]
+
+    @property
+    def memo(self) -> str:
+        return self._table._memos[self._index]
+
+    @property
+    def created_at(self) -> str:
+        return self._table._created_at[self._index]
+
+    @property
+    def sort_key(self) -> int:
+        return self._table.sort_keys[self._index]
+
+    @property
+    def date_key(self) -> str:
+        """YYMMDD 部分を返す（日付マッチ用）。"""
+        return f"{self.sort_key // 10_000:06d}"
+
+    @property
+    def parsed_datetime(self) -> datetime.datetime:
+        """datetime オブジェクトを返す。"""
+        return from_sort_key(self.sort_key)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "date_time": self.date_time,
+            "date_time_type": self.date_time_type,
+            "title": self.title,
+            "memo": self.memo,
+            "created_at": self.created_at,
+        }
+
+    def to_schedule(self) -> Schedule:
+        """通常の Schedule インスタンスに変換する。"""
+        return Schedule(**self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"ScheduleRow({self.to_dict()!r})"
+
+
+class ScheduleTable:
+    """ソートキー順に並んだ読み取り専用のスケジュール列テーブル。"""
+
+    def __init__(self) -> None:
+        self.sort_keys = array("q")
+        self.type_codes = array("b")
+        self._ids = StringColumn()
+        self._titles = StringColumn()
+        self._memos = StringColumn()
+        self._created_at = StringColumn()
+
+    # ---- bulk loaders ----
+
+    @classmethod
+    def from_dicts(cls, records: Iterable[dict[str, Any]]) -> ScheduleTable:
+        """schedules.json のレコード (dict) 列から直接構築する。
+
+        Schedule インスタンスを経由しないため、大規模データの読み込みに向く。
+
+        Raises:
+            ValueError: date_time または date_time_type が不正なレコードを含む
+        """
+        table = cls()
+        for d in records:
+            dt, shape = parse_datetime(d.get("date_time", ""))
+            table._append(
+                to_sort_key(dt),
+                _type_code(d.get("date_time_type", shape), shape),
+                d.get("id", ""),
+                d.get("title", ""),
+                d.get("memo", ""),
+                d.get("created_at", ""),
+            )
+        return table._sorted()
+
+    @classmethod
+    def from_schedules(cls, schedules: Iterable[Schedule]) -> ScheduleTable:
+        """Schedule のリスト（load_schedules の戻り値など）から構築する。
+
+        Raises:
+            ValueError: date_time または date_time_type が不正な Schedule を含む
+        """
+        table = cls()
+        for s in schedules:
+            dt, shape = parse_datetime(s.date_time)
+            table._append(
+                to_sort_key(dt),
+                _type_code(s.date_time_type, shape),
+                s.id,
+                s.title,
+                s.memo,
+                s.created_at,
+            )
+        return table._sorted()
+
+    def _append(
+        self, key: int, code: int, id_: str, title: str, memo: str, created_at: str
+    ) -> None:
+        self.sort_keys.append(key)
+        self.type_codes.append(code)
+        self._ids.append(id_)
+        self._titles.append(title)
+        self._memos.append(memo)
+        self._created_at.append(created_at)
+
+    def _sorted(self) -> ScheduleTable:
+        """ソートキー順に並べ替えたテーブルを返す（整列済みなら自身を返す）。
+
+        行をタプルとして一括保持せず列ごとに並べ替えるため、一時メモリは1列分で済む。
+        """
+        keys = self.sort_keys
+        if all(keys[i] <= keys[i + 1] for i in range(len(keys) - 1)):
+            return self
+        order = array("q", sorted(range(len(keys)), key=keys.__getitem__))
+        table = type(self)()
+        table.sort_keys = array("q", (keys[i] for i in order))
+        table.type_codes = array("b", (self.type_codes[i] for i in order))
+        for name in ("_ids", "_titles", "_memos", "_created_at"):
+            src: StringColumn = getattr(self, name)
+            setattr(table, name, src.permuted(order))
+            setattr(self, name, StringColumn())
+        return table
+
+    # ---- sequence protocol ----
+
+    def __len__(self) -> int:
+        return len(self.sort_keys)
+
+    def __getitem__(self, i: int) -> ScheduleRow:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("ScheduleTable index out of range")
+        return ScheduleRow(self, i)
+
+    def __iter__(self) -> Iterator[ScheduleRow]:
+        for i in range(len(self)):
+            yield ScheduleRow(self, i)
+
+    # ---- range filtering ----
+
+    def range_indices(self, start: datetime.date, end: datetime.date) -> range:
+        """start 〜 end（両端含む）の日付に該当する行番号の範囲を返す。"""
+        lo = bisect_left(self.sort_keys, _date_lower_bound(start))
+        hi = bisect_left(
+            self.sort_keys, _date_lower_bound(end + datetime.timedelta(days=1))
+        )
+        return range(lo, max(lo, hi))
+
+    def filter_date_range(
+        self, start: datetime.date, end: datetime.date
+    ) -> list[ScheduleRow]:
+        """start 〜 end（両端含む）のスケジュールを時刻順で返す。"""
+        return [ScheduleRow(self, i) for i in self.range_indices(start, end)]
+
+    def filter_by_date(self, d: datetime.date) -> list[ScheduleRow]:
+        """指定日付のスケジュールを時刻順で返す。"""
+        return self.filter_date_range(d, d)
+
+    def nbytes(self) -> int:
+        """列データが占めるおおよそのバイト数を返す。"""
+        return (
+            self.sort_keys.itemsize * len(self.sort_keys)
+            + self.type_codes.itemsize * len(self.type_codes)
+            + self._ids.nbytes()
+            + self._titles.nbytes()
+            + self._memos.nbytes()
+            + self._created_at.nbytes()
+        )
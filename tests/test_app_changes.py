@@ -0,0 +1,351 @@
+"""ScheduleApp の差分更新（変更イベントによるビュー更新）のテスト。"""
+
+import asyncio
+import datetime
+
+import pytest
+
+from app import ScheduleApp
+from db.store import load_schedules, save_schedules
+from models.schedule import Schedule
+from ui.calendar_view import CalendarView
+from ui.detail_view import DetailView, ScheduleItem
+
+DAY = datetime.date(2026, 2, 19)
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    import db.store as store_mod
+
+    monkeypatch.setattr(store_mod, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(store_mod, "SCHEDULE_FILE", tmp_path / "schedules.json")
+    monkeypatch.setattr(store_mod, "CONFIG_FILE", tmp_path / "config.json")
+    save_schedules([
+        Schedule(id="a", date_time="260219_0900", title="朝会"),
+        Schedule(id="b", date_time="260219_1400", title="午後会議"),
+        Schedule(id="c", date_time="260225_1000", title="別の日"),
+    ])
+    return tmp_path
+
+
+def _run(scenario):
+    async def main():
+        app = ScheduleApp()
+        async with app.run_test(size=(120, 40)) as pilot:
+            cal = app.query_one(CalendarView)
+            detail = app.query_one(DetailView)
+            cal.select_date(DAY)
+            await pilot.pause()
+            rebuilds = []
+            original = cal._rebuild_calendar
+
+            def counting() -> None:
+                rebuilds.append(1)
+                original()
+
+            cal._rebuild_calendar = counting
+            await scenario(app, cal, detail, pilot, rebuilds)
+
+    asyncio.run(main())
+
+
+def _titles(detail: DetailView) -> list[str]:
+    return [item.schedule.title for item in detail.query(ScheduleItem)]
+
+
+class TestIncrementalUpdate:
+    """追加・編集・削除が影響するセル・行だけを更新することのテスト。"""
+
+    def test_add_same_day(self, data_dir):
+        async def scenario(app, cal, detail, pilot, rebuilds):
+            app._on_schedule_form_result(
+                Schedule(id="d", date_time="260219_1200", title="昼")
+            )
+            await pilot.pause()
+            assert rebuilds == []
+            assert cal._cells[19].schedule_count == 3
+            assert _titles(detail) == ["朝会", "昼", "午後会議"]
+            assert detail.highlighted_schedule.id == "d"
+
+        _run(scenario)
+
+    def test_edit_moves_to_other_day(self, data_dir):
+        async def scenario(app, cal, detail, pilot, rebuilds):
+            app._on_edit_form_result(
+                Schedule(id="b", date_time="260225_1500", title="午後会議")
+            )
+            await pilot.pause()
+            assert rebuilds == []
+            assert cal._cells[19].schedule_count == 1
+            assert cal._cells[25].schedule_count == 2
+            assert cal._cells[25].is_selected and not cal._cells[19].is_selected
+            assert detail.selected_date == datetime.date(2026, 2, 25)
+            assert _titles(detail) == ["別の日", "午後会議"]
+
+        _run(scenario)
+
+    def test_delete_last_item_shows_placeholder(self, data_dir):
+        async def scenario(app, cal, detail, pilot, rebuilds):
+            app._repo.delete("a")
+            app._repo.delete("b")
+            await pilot.pause()
+            assert rebuilds == []
+            assert not cal._cells[19].has_schedule
+            assert _titles(detail) == []
+            assert len(detail.query_one("#schedule-list")) == 1
+
+        _run(scenario)
+
+    def test_change_outside_visible_month(self, data_dir):
+        async def scenario(app, cal, detail, pilot, rebuilds):
+            app._repo.add(Schedule(id="x", date_time="260410_0900", title="先の予定"))
+            await pilot.pause()
+            assert rebuilds == []
+            assert _titles(detail) == ["朝会", "午後会議"]
+
+        _run(scenario)
+
+
+class TestSearchDuringEdit:
+    """検索中の編集が、検索をやり直さずにカーソルへ反映されることのテスト。"""
+
+    def test_edit_keeps_search_position(self, data_dir, monkeypatch):
+        async def scenario(app, cal, detail, pilot, rebuilds):
+            app._on_search_result("会")
+            await pilot.pause()
+            app.action_search_next()
+            await pilot.pause()
+            cursor = app._search_cursor
+            assert cursor.current.id == "b"
+
+            def fail(*args, **kwargs):
+                raise AssertionError("検索をやり直した")
+
+            monkeypatch.setattr(app._calendars, "search", fail)
+            app._on_schedule_form_result(
+                Schedule(id="d", date_time="260219_0800", title="早朝会議")
+            )
+            await pilot.pause()
+            assert [s.id for s in cursor.results] == ["d", "a", "b"]
+            assert app._search_cursor is cursor and cursor.current.id == "b"
+
+        _run(scenario)
+
+
+class TestExternalReload:
+    """データファイルの外部変更の読み込みのテスト。"""
+
+    def test_applies_delta(self, data_dir):
+        async def scenario(app, cal, detail, pilot, rebuilds):
+            schedules = {s.id: s for s in app._repo.schedules}
+            edited = Schedule(**{**schedules["a"].to_dict(), "title": "朝会（外部）"})
+            save_schedules([
+                edited,
+                schedules["c"],
+                Schedule(id="e", date_time="260219_1800", title="外部追加"),
+            ])
+            app._poll_data_file()
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            await pilot.pause()
+            assert rebuilds == []
+            assert sorted(s.id for s in app._repo.schedules) == ["a", "c", "e"]
+            assert _titles(detail) == ["朝会（外部）", "外部追加"]
+            assert cal._cells[19].schedule_count == 2
+            assert not app._watcher.changed()
+
+        _run(scenario)
+
+    def test_own_save_is_not_reloaded(self, data_dir):
+        async def scenario(app, cal, detail, pilot, rebuilds):
+            app._on_schedule_form_result(
+                Schedule(id="d", date_time="260219_1200", title="昼")
+            )
+            # 保存中はポーリングしない
+            app._poll_data_file()
+            assert not app._reloading
+            await app.wait_for_save()
+            assert not app._watcher.changed()
+            app._poll_data_file()
+            assert not app._reloading
+
+        _run(scenario)
+
+    def test_unreadable_file_is_skipped(self, data_dir):
+        async def scenario(app, cal, detail, pilot, rebuilds):
+            (data_dir / "schedules.json").write_text("{", encoding="utf-8")
+            app._poll_data_file()
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            assert len(app._repo) == 3
+            assert not app._watcher.changed()
+
+        _run(scenario)
+
+
+class TestConcurrentSave:
+    """他のインスタンスが先に保存していた場合の保存のテスト。"""
+
+    def test_merges_other_instance_changes(self, data_dir):
+        async def scenario(app, cal, detail, pilot, rebuilds):
+            schedules = {s.id: s for s in app._repo.schedules}
+            other = Schedule(**{**schedules["c"].to_dict(), "title": "他で編集"})
+            save_schedules([schedules["a"], schedules["b"], other])
+            app._on_schedule_form_result(
+                Schedule(id="d", date_time="260219_1200", title="昼")
+            )
+            await app.wait_for_save()
+            await pilot.pause()
+            assert app._repo.get("c").title == "他で編集"
+            assert sorted(s.id for s in load_schedules()) == ["a", "b", "c", "d"]
+            assert app._version == 3
+
+        _run(scenario)
+
+    def test_conflict_keeps_other_instance_version(self, data_dir):
+        async def scenario(app, cal, detail, pilot, rebuilds):
+            schedules = {s.id: s for s in app._repo.schedules}
+            a = schedules["a"].to_dict()
+            save_schedules([Schedule(**{**a, "title": "他"}), schedules["b"], schedules["c"]])
+            app._on_edit_form_result(Schedule(**{**a, "title": "こちら"}))
+            await app.wait_for_save()
+            await pilot.pause()
+            assert app._repo.get("a").title == "他"
+            assert _titles(detail) == ["他", "午後会議"]
+            assert [s.title for s in load_schedules() if s.id == "a"] == ["他"]
+
+        _run(scenario)
+
+    def test_conflict_keeps_unrelated_edits(self, data_dir):
+        async def scenario(app, cal, detail, pilot, rebuilds):
+            schedules = {s.id: s for s in app._repo.schedules}
+            a, b = schedules["a"].to_dict(), schedules["b"].to_dict()
+            save_schedules([Schedule(**{**a, "title": "他"}), schedules["b"], schedules["c"]])
+            # a（他でも編集済み）と b（こちらだけ）の編集を1回の保存にまとめる
+            app._on_edit_form_result(Schedule(**{**a, "title": "こちら"}))
+            app._on_edit_form_result(Schedule(**{**b, "title": "朝会（こちら）"}))
+            await app.wait_for_save()
+            await pilot.pause()
+            assert app._repo.get("a").title == "他"
+            assert app._repo.get("b").title == "朝会（こちら）"
+            titles = {s.id: s.title for s in load_schedules()}
+            assert (titles["a"], titles["b"]) == ("他", "朝会（こちら）")
+
+        _run(scenario)
+
+
+class TestAsyncSave:
+    """保存をバックグラウンドで行うことのテスト。"""
+
+    @pytest.fixture
+    def during_save(self, monkeypatch):
+        """保存の開始時（内容を確定した後）に一度だけ実行する処理を登録する。"""
+        import app as app_mod
+
+        hooks = []
+        saved = []
+        original = app_mod.asave_merged
+
+        async def hooked(base, ours, *args, **kwargs):
+            saved.append(sorted(s.id for s in ours))
+            if hooks:
+                hooks.pop()()
+            return await original(base, ours, *args, **kwargs)
+
+        monkeypatch.setattr(app_mod, "asave_merged", hooked)
+        return hooks, saved
+
+    def test_edits_during_save_are_coalesced(self, data_dir, during_save):
+        hooks, saved = during_save
+
+        async def scenario(app, cal, detail, pilot, rebuilds):
+            def add_more():
+                for i in (1, 2):
+                    app._on_schedule_form_result(
+                        Schedule(id=f"n{i}", date_time="260219_1200", title=f"追加{i}")
+                    )
+
+            hooks.append(add_more)
+            app._on_schedule_form_result(
+                Schedule(id="n0", date_time="260219_1200", title="追加0")
+            )
+            # 画面はファイルの書き込みを待たずに更新される
+            assert cal._cells[19].schedule_count == 3
+            await app.wait_for_save()
+            assert cal._cells[19].schedule_count == 5
+            assert saved == [
+                ["a", "b", "c", "n0"],
+                ["a", "b", "c", "n0", "n1", "n2"],
+            ]
+            assert app._version == 3
+            assert len(load_schedules()) == 6
+
+        _run(scenario)
+
+    def test_merge_keeps_edit_made_during_save(self, data_dir, during_save):
+        hooks, _ = during_save
+
+        async def scenario(app, cal, detail, pilot, rebuilds):
+            schedules = {s.id: s for s in app._repo.schedules}
+            c = schedules["c"].to_dict()
+            save_schedules([schedules["a"], schedules["b"], Schedule(**{**c, "title": "他"})])
+            # 他で変更されたレコードを、マージ中の保存の最中に手元でも変更する
+            hooks.append(lambda: app._on_edit_form_result(Schedule(**{**c, "title": "手元"})))
+            app._on_schedule_form_result(
+                Schedule(id="d", date_time="260219_1200", title="昼")
+            )
+            await app.wait_for_save()
+            assert app._repo.get("c").title == "手元"
+            assert [s.title for s in load_schedules() if s.id == "c"] == ["手元"]
+
+        _run(scenario)
+
+    def test_delete_notifies_after_save(self, data_dir):
+        async def scenario(app, cal, detail, pilot, rebuilds):
+            notices = []
+            app.notify = lambda message, **kwargs: notices.append(message)
+            detail.query_one("#schedule-list").index = 0
+            await pilot.pause()
+            app._on_delete_confirm(True)
+            assert notices == []
+            await app.wait_for_save()
+            assert notices == ["削除しました"]
+            assert "a" not in {s.id for s in load_schedules()}
+
+        _run(scenario)
+
+
+class TestStartupValidation:
+    """起動時の検証（不正なレコードの隔離）と起動の内訳のテスト。"""
+
+    def test_malformed_record_is_quarantined(self, data_dir):
+        import json
+
+        from db.store import quarantine_path
+        from ui.stats_panel import format_stats
+        from utils import perf
+
+        path = data_dir / "schedules.json"
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        payload["schedules"].append(
+            {"id": "bad", "date_time": "26-02-19 09:00", "title": "壊れた日時"}
+        )
+        path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+        async def main():
+            app = ScheduleApp(watch_interval=None)
+            async with app.run_test(size=(120, 40)) as pilot:
+                cal = app.query_one(CalendarView)
+                cal.select_date(DAY)
+                await pilot.pause()
+                assert _titles(app.query_one(DetailView)) == ["朝会", "午後会議"]
+                assert len(app._repo) == 3
+
+        asyncio.run(main())
+        entries = json.loads(quarantine_path().read_text(encoding="utf-8"))["records"]
+        assert [e["record"]["id"] for e in entries] == ["bad"]
+        startup = perf.breakdowns()["startup"]
+        assert {"config", "read", "validate", "decode", "load", "render", "total"} <= set(startup)
+        text = format_stats()
+        assert "起動 (ms):" in text and "隔離したレコード: 1" in text
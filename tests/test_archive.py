@@ -0,0 +1,199 @@
+"""過去のスケジュールのアーカイブ（db.archive）のテスト。"""
+
+import asyncio
+import datetime
+import gzip
+import json
+
+import pytest
+from textual.widgets import ListView
+
+from app import ScheduleApp
+from db.archive import (
+    Archive,
+    archive_expired,
+    archive_months,
+    archive_path,
+    cutoff_key,
+    load_index,
+    read_year,
+    split_expired,
+)
+from db.store import load_schedules_versioned, save_schedules
+from models.schedule import Schedule
+from ui.calendar_view import CalendarView
+from ui.detail_view import DetailView, ScheduleItem
+
+TODAY = datetime.date(2026, 2, 19)
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    import db.store as store_mod
+
+    monkeypatch.setattr(store_mod, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(store_mod, "SCHEDULE_FILE", tmp_path / "schedules.json")
+    monkeypatch.setattr(store_mod, "CONFIG_FILE", tmp_path / "config.json")
+    save_schedules([
+        Schedule(id="old1", date_time="241105_0900", title="昔の会議"),
+        Schedule(id="old2", date_time="250110_1000", title="去年の会議"),
+        Schedule(id="keep", date_time="250201_0900", title="最近の会議"),
+        Schedule(id="now", date_time="260219_0900", title="今日の会議"),
+    ])
+    return tmp_path
+
+
+class TestPolicy:
+    """アーカイブの設定と対象の判定のテスト。"""
+
+    def test_archive_months(self):
+        assert archive_months({}) is None
+        assert archive_months({"archive": {"older_than_months": 12}}) == 12
+        for bad in ({"archive": {}}, {"archive": {"older_than_months": 0}},
+                    {"archive": {"older_than_months": True}}, {"archive": 12}):
+            with pytest.raises(ValueError):
+                archive_months(bad)
+
+    def test_cutoff_is_month_granular(self):
+        assert cutoff_key(TODAY, 12) == "2502"
+        assert cutoff_key(TODAY, 2) == "2512"
+
+    def test_split_expired(self):
+        schedules = [
+            Schedule(id="a", date_time="~250131_2300", title="t", date_time_type="until"),
+            Schedule(id="b", date_time="250201_0000", title="t"),
+            Schedule(id="c", date_time="241231_1200", title="t"),
+        ]
+        keep, expired = split_expired(schedules, "2502")
+        assert [s.id for s in keep] == ["b"]
+        assert {year: [s.id for s in moved] for year, moved in expired.items()} == {
+            2025: ["a"], 2024: ["c"],
+        }
+
+
+class TestArchiveExpired:
+    """schedules.json からアーカイブへの移動のテスト。"""
+
+    def test_moves_old_records(self, data_dir):
+        assert archive_expired(12, today=TODAY) == 2
+        schedules, version = load_schedules_versioned()
+        assert [s.id for s in schedules] == ["keep", "now"]
+        assert version == 2
+        assert [s.id for s in read_year(2024)] == ["old1"]
+        assert [s.id for s in read_year(2025)] == ["old2"]
+        # 年ごとの gzip ファイルと月ごとの件数の索引
+        with gzip.open(archive_path(2025), "rb") as f:
+            assert json.load(f)["schedules"][0]["id"] == "old2"
+        assert load_index() == {2024: {"2411": 1}, 2025: {"2501": 1}}
+
+    def test_appends_to_existing_year(self, data_dir):
+        archive_expired(12, today=TODAY)
+        archive_expired(1, today=TODAY)
+        assert [s.id for s in read_year(2025)] == ["old2", "keep"]
+        assert load_index()[2025] == {"2501": 1, "2502": 1}
+        assert [s.id for s in load_schedules_versioned()[0]] == ["now"]
+
+    def test_nothing_to_move(self, data_dir):
+        assert archive_expired(48, today=TODAY) == 0
+        assert load_schedules_versioned()[1] == 1
+        assert not archive_path(2024).exists()
+
+
+class TestArchive:
+    """年単位の遅延読み込みのテスト。"""
+
+    def test_covers_and_add_year(self, data_dir):
+        archive_expired(12, today=TODAY)
+        archive = Archive()
+        assert archive and archive.pending_years == [2024, 2025]
+        assert archive.covers(2024, 11) and not archive.covers(2024, 12)
+        archive.add_year(2024, read_year(2024))
+        assert not archive.covers(2024, 11)
+        assert archive.pending_years == [2025]
+        assert [s.id for s in archive.repo.schedules] == ["old1"]
+
+    def test_empty(self, data_dir):
+        assert not Archive()
+
+
+def _titles(detail: DetailView) -> list[str]:
+    return [item.schedule.title for item in detail.query(ScheduleItem)]
+
+
+class TestAppArchive:
+    """ScheduleApp でのアーカイブの遅延読み込みと検索のテスト。"""
+
+    @pytest.fixture
+    def archived(self, data_dir):
+        # 起動時の移動（今日の日付に依存する）の代わりに、先に移しておく
+        archive_expired(12, today=TODAY)
+        return data_dir
+
+    def test_startup_applies_policy(self, data_dir):
+        (data_dir / "config.json").write_text(
+            json.dumps({"archive": {"older_than_months": 1}}), encoding="utf-8"
+        )
+
+        async def main():
+            app = ScheduleApp(watch_interval=None)
+            async with app.run_test(size=(120, 40)) as pilot:
+                await pilot.pause()
+                assert len(app._repo) <= 1
+                assert app._archive is not None
+
+        asyncio.run(main())
+        assert archive_path(2024).exists()
+
+    def test_loads_year_on_navigation(self, archived):
+        async def main():
+            app = ScheduleApp(watch_interval=None)
+            async with app.run_test(size=(120, 40)) as pilot:
+                cal = app.query_one(CalendarView)
+                detail = app.query_one(DetailView)
+                assert app._archive.loaded == set()
+                cal.select_date(datetime.date(2025, 1, 10))
+                await pilot.pause()
+                await app.workers.wait_for_complete()
+                await pilot.pause()
+                assert app._archive.loaded == {2025}
+                assert _titles(detail) == ["去年の会議"]
+                assert cal._cells[10].schedule_count == 1
+
+        asyncio.run(main())
+
+    def test_search_includes_archive_only_when_asked(self, archived):
+        async def main():
+            app = ScheduleApp(watch_interval=None)
+            async with app.run_test(size=(120, 40)) as pilot:
+                app._on_search_result("会議")
+                await pilot.pause()
+                assert [s.id for s in app._search_cursor.results] == ["keep", "now"]
+
+                app._on_archive_search_result("会議")
+                await app.workers.wait_for_complete()
+                await pilot.pause()
+                assert app._archive.loaded == {2024, 2025}
+                assert [s.id for s in app._search_cursor.results] == [
+                    "old1", "old2", "keep", "now",
+                ]
+
+        asyncio.run(main())
+
+    def test_archived_schedule_is_read_only(self, archived):
+        async def main():
+            app = ScheduleApp(watch_interval=None)
+            async with app.run_test(size=(120, 40)) as pilot:
+                cal = app.query_one(CalendarView)
+                cal.select_date(datetime.date(2024, 11, 5))
+                await app.workers.wait_for_complete()
+                await pilot.pause()
+                detail = app.query_one(DetailView)
+                detail.query_one("#schedule-list", ListView).index = 0
+                await pilot.pause()
+                assert detail.highlighted_schedule.id == "old1"
+                await pilot.press("d")
+                await pilot.pause()
+                assert app.screen is app.screen_stack[0]
+                assert len(app._archive.repo) == 1
+
+        asyncio.run(main())
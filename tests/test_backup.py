@@ -42,3 +42,16 @@ class TestCreateBackup:
         create_backup(original)
 
         assert original.read_text(encoding="utf-8") == "original content"
+
+    def test_link_mode_survives_replace(self, tmp_path):
+        original = tmp_path / "test.json"
+        original.write_text("version1", encoding="utf-8")
+        bak = create_backup(original, link=True)
+        assert bak.stat().st_ino == original.stat().st_ino
+
+        # 置き換えた後も、バックアップには置き換え前の内容が残る
+        tmp = tmp_path / "test.json.tmp"
+        tmp.write_text("version2", encoding="utf-8")
+        tmp.replace(original)
+        assert bak.read_text(encoding="utf-8") == "version1"
+        assert create_backup(original, link=True).read_text(encoding="utf-8") == "version2"
@@ -0,0 +1,176 @@
+"""ベンチマーク回帰ゲートのテスト。"""
+
+import json
+import pytest
+
+from benchmarks.compare import (
+    NoiseAllowance,
+    compare,
+    load_gate,
+    load_noise,
+    main,
+    merge_reports,
+)
+
+
+def _report(calibration: float, **medians: float) -> dict:
+    return {
+        "calibration_s": calibration,
+        "results": [
+            {"name": name, "records": 1000, "median_s": value}
+            for name, value in medians.items()
+        ],
+    }
+
+
+class TestCompare:
+    """compare のテスト。"""
+
+    def test_within_threshold(self):
+        result = compare(
+            _report(1.0, load_schedules=1.0),
+            _report(1.0, load_schedules=1.2),
+        )
+        assert result[0].ratio == pytest.approx(1.2)
+        assert not result[0].regressed
+
+    def test_regression_beyond_threshold(self):
+        result = compare(
+            _report(1.0, filter_by_date=1.0),
+            _report(1.0, filter_by_date=1.31),
+        )
+        assert result[0].regressed
+
+    def test_normalizes_by_calibration(self):
+        # 現在のマシンが2倍遅い → 計測値が2倍でも回帰ではない
+        result = compare(
+            _report(1.0, load_schedules=1.0),
+            _report(2.0, load_schedules=2.0),
+        )
+        assert result[0].ratio == pytest.approx(1.0)
+        assert not result[0].regressed
+
+    def test_per_benchmark_threshold(self):
+        result = compare(
+            _report(1.0, save_schedules=1.0, load_schedules=1.0),
+            _report(1.0, save_schedules=1.4, load_schedules=1.4),
+            thresholds={"save_schedules": 0.5},
+        )
+        by_name = {c.name: c for c in result}
+        assert not by_name["save_schedules"].regressed
+        assert by_name["load_schedules"].regressed
+
+    def test_missing_in_current(self):
+        result = compare(_report(1.0, load_schedules=1.0), _report(1.0))
+        assert result[0].current is None
+        assert result[0].ratio is None
+        assert not result[0].regressed
+
+    def test_prefers_min_over_median(self):
+        entry = {"name": "load_schedules", "records": 1000}
+        base = {"results": [{**entry, "min_s": 1.0, "median_s": 1.0}]}
+        cur = {"results": [{**entry, "min_s": 1.1, "median_s": 2.0}]}
+        assert compare(base, cur)[0].ratio == pytest.approx(1.1)
+
+    def test_uses_p50_for_ui_results(self):
+        base = {"results": [{"name": "ui.day_click", "records": 10, "p50_s": 0.1}]}
+        cur = {"results": [{"name": "ui.day_click", "records": 10, "p50_s": 0.2}]}
+        assert compare(base, cur)[0].regressed
+
+
+class TestNoiseAllowance:
+    """揺れやすいエントリのしきい値のテスト。"""
+
+    def _compare(self, base, cur, records=1000):
+        report = lambda value: {  # noqa: E731
+            "calibration_s": 1.0,
+            "results": [{"name": "search_schedules", "records": records, "median_s": value}],
+        }
+        noise = NoiseAllowance(threshold=0.5, below_s=0.001, min_records=100_000)
+        return compare(report(base), report(cur), noise=noise)[0]
+
+    def test_sub_millisecond_entry(self):
+        c = self._compare(0.0005, 0.0007)
+        assert c.threshold == 0.5 and not c.regressed
+        assert self._compare(0.0005, 0.0008).regressed
+
+    def test_large_entry(self):
+        assert not self._compare(0.5, 0.7, records=100_000).regressed
+
+    def test_other_entries_keep_threshold(self):
+        c = self._compare(0.5, 0.7)
+        assert c.threshold == pytest.approx(0.3) and c.regressed
+
+    def test_explicit_threshold_beats_noise(self):
+        # 1 ms 未満かつ 100,000 件でも、個別に指定した 30% で判定する
+        report = lambda value: {  # noqa: E731
+            "calibration_s": 1.0,
+            "results": [{"name": "filter_by_date", "records": 100_000, "min_s": value}],
+        }
+        noise = NoiseAllowance(threshold=0.5, below_s=0.001, min_records=100_000)
+        [c] = compare(
+            report(0.0005), report(0.0007),
+            thresholds={"filter_by_date": 0.30}, noise=noise,
+        )
+        assert c.threshold == 0.30 and c.ratio == pytest.approx(1.4) and c.regressed
+
+    def test_per_benchmark_threshold_can_be_wider(self):
+        noise = NoiseAllowance(threshold=0.5, below_s=1.0)
+        result = compare(
+            _report(1.0, save_schedules=0.5), _report(1.0, save_schedules=0.5),
+            thresholds={"save_schedules": 0.8}, noise=noise,
+        )
+        assert result[0].threshold == 0.8
+
+
+class TestMergeReports:
+    """merge_reports のテスト。"""
+
+    def test_min_of_runs(self):
+        merged = merge_reports([
+            _report(2.0, load_schedules=2.0),
+            _report(3.0, load_schedules=5.0),
+            _report(1.0, load_schedules=1.5),
+        ])
+        assert merged["calibration_s"] == 1.0
+        assert merged["results"][0]["median_s"] == 1.5
+        assert merged["results"][0]["runs"] == 3
+
+
+class TestMain:
+    """コマンドライン実行のテスト。"""
+
+    def _write(self, path, report):
+        path.write_text(json.dumps(report), encoding="utf-8")
+        return path
+
+    def test_exit_code_on_regression(self, tmp_path):
+        base = self._write(tmp_path / "base.json", _report(1.0, load_schedules=1.0))
+        cur = self._write(tmp_path / "cur.json", _report(1.0, load_schedules=2.0))
+        gate = tmp_path / "gate.json"
+        args = ["--baseline", str(base), "--current", str(cur), "--gate", str(gate)]
+        assert main(args) == 1
+        assert main(args + ["--threshold-for", "load_schedules=1.5"]) == 0
+
+    def test_gate_file(self, tmp_path):
+        gate = self._write(
+            tmp_path / "gate.json",
+            {"default_threshold": 0.1, "thresholds": {"save_schedules": 0.5}},
+        )
+        assert load_gate(gate) == (0.1, {"save_schedules": 0.5})
+        assert load_gate(tmp_path / "missing.json")[0] == pytest.approx(0.3)
+        assert load_noise(gate) is None
+
+    def test_noisy_in_gate_file(self, tmp_path):
+        gate = self._write(
+            tmp_path / "gate.json",
+            {"noisy": {"threshold": 0.5, "below_s": 0.001, "min_records": 100000}},
+        )
+        assert load_noise(gate) == NoiseAllowance(0.5, 0.001, 100000)
+        assert load_noise(tmp_path / "missing.json") is None
+
+    def test_write_baseline(self, tmp_path):
+        cur = self._write(tmp_path / "cur.json", _report(1.0, load_schedules=1.0))
+        base = tmp_path / "base.json"
+        assert main(["--baseline", str(base), "--current", str(cur), "--write-baseline"]) == 0
+        assert json.loads(base.read_text(encoding="utf-8")) == _report(1.0, load_schedules=1.0)
@@ -0,0 +1,51 @@
+"""ベンチマーク用データジェネレータのテスト。"""
+
+import json
+import pytest
+
+from benchmarks.generator import generate_records, parse_size, write_dataset
+from db.schema import validate_schedule
+from models.schedule import Schedule
+
+
+class TestGenerateRecords:
+    """generate_records のテスト。"""
+
+    def test_deterministic(self):
+        assert list(generate_records(200, seed=1)) == list(generate_records(200, seed=1))
+
+    def test_seed_changes_output(self):
+        assert list(generate_records(50, seed=1)) != list(generate_records(50, seed=2))
+
+    def test_records_are_valid(self):
+        for d in generate_records(500):
+            assert validate_schedule(d) == []
+            assert Schedule.from_dict(d).to_dict() == d
+
+    def test_count(self):
+        assert sum(1 for _ in generate_records(123)) == 123
+
+
+class TestParseSize:
+    """parse_size のテスト。"""
+
+    @pytest.mark.parametrize("size, expected", [
+        ("1k", 1_000),
+        ("100k", 100_000),
+        ("1m", 1_000_000),
+        ("1M", 1_000_000),
+        ("2500", 2_500),
+        ("10k", 10_000),
+    ])
+    def test_sizes(self, size, expected):
+        assert parse_size(size) == expected
+
+
+class TestWriteDataset:
+    """write_dataset のテスト。"""
+
+    def test_same_bytes_for_same_seed(self, tmp_path):
+        a = write_dataset(tmp_path / "a.json", 100)
+        b = write_dataset(tmp_path / "b.json", 100)
+        assert a.read_bytes() == b.read_bytes()
+        assert len(json.loads(a.read_text(encoding="utf-8"))["schedules"]) == 100
@@ -0,0 +1,77 @@
+"""フェーズ別メモリプロファイラのテスト。"""
+
+import asyncio
+import tracemalloc
+
+import pytest
+
+from benchmarks.profile_memory import MemoryProfiler, _profiled_app_class
+from db.store import save_schedules
+from models.schedule import Schedule
+
+
+@pytest.fixture
+def tracing():
+    tracemalloc.start()
+    yield
+    tracemalloc.stop()
+
+
+class TestMemoryProfiler:
+    """MemoryProfiler のテスト。"""
+
+    def test_peak_and_retained(self, tracing):
+        profiler = MemoryProfiler(top=3)
+        kept = []
+        with profiler.phase("alloc"):
+            transient = [bytearray(1024) for _ in range(1000)]
+            del transient
+            kept.append(bytearray(100_000))
+        phase = profiler.phases[0]
+        assert phase["name"] == "alloc"
+        assert phase["retained_bytes"] >= 100_000
+        assert phase["peak_bytes"] >= 1000 * 1024 > phase["retained_bytes"]
+        assert "tests/test_bench_profile_memory.py" in phase["top"][0]["site"]
+
+    def test_top_limit(self, tracing):
+        profiler = MemoryProfiler(top=1)
+        with profiler.phase("alloc"):
+            data = [str(i) * 10 for i in range(1000)]
+        assert len(profiler.phases[0]["top"]) == 1
+        assert data
+
+    def test_unbalanced_phases(self, tracing):
+        profiler = MemoryProfiler()
+        with pytest.raises(RuntimeError):
+            profiler.end()
+        profiler.begin("a")
+        with pytest.raises(RuntimeError):
+            profiler.begin("b")
+        profiler.end()
+        assert [p["name"] for p in profiler.phases] == ["a"]
+
+
+
+class TestProfiledApp:
+    """フェーズを記録する ScheduleApp のサブクラスのテスト。"""
+
+    def test_startup_phases(self, tracing, tmp_path, monkeypatch):
+        import db.store as store_mod
+
+        monkeypatch.setattr(store_mod, "DATA_DIR", tmp_path)
+        monkeypatch.setattr(store_mod, "SCHEDULE_FILE", tmp_path / "schedules.json")
+        monkeypatch.setattr(store_mod, "CONFIG_FILE", tmp_path / "config.json")
+        save_schedules([Schedule(id="a", date_time="250115_0900", title="会議")])
+        profiler = MemoryProfiler(top=1)
+
+        async def main():
+            app = _profiled_app_class(profiler)(watch_interval=None)
+            async with app.run_test(size=(120, 50)) as pilot:
+                await pilot.pause()
+                profiler.end()
+                assert len(app._repo) == 1
+
+        asyncio.run(main())
+        assert [p["name"] for p in profiler.phases] == [
+            "load_schedules", "index_build", "first_refresh_views",
+        ]
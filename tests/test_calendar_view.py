@@ -0,0 +1,149 @@
+"""CalendarView の月移動のテスト。"""
+
+import asyncio
+import datetime
+
+from textual import events
+from textual.app import App, ComposeResult
+
+from ui.calendar_view import CalendarView
+
+
+class CalendarApp(App):
+    """CalendarView だけを置いたテスト用アプリ。"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.month_changes: list[tuple[int, int]] = []
+        self.rebuilds = 0
+
+    def compose(self) -> ComposeResult:
+        yield CalendarView(id="calendar-view")
+
+    def on_calendar_view_month_changed(self, event: CalendarView.MonthChanged) -> None:
+        self.month_changes.append((event.year, event.month))
+
+    def on_key(self, event: events.Key) -> None:
+        cal = self.query_one(CalendarView)
+        if event.key == "greater_than_sign":
+            cal.go_next_month()
+        elif event.key == "less_than_sign":
+            cal.go_prev_month()
+
+
+def _run(scenario):
+    async def main():
+        app = CalendarApp()
+        async with app.run_test(size=(60, 20)) as pilot:
+            cal = app.query_one(CalendarView)
+            cal.select_date(datetime.date(2025, 11, 15))
+            await pilot.pause()
+            original = cal._rebuild_calendar
+
+            def counting() -> None:
+                app.rebuilds += 1
+                original()
+
+            cal._rebuild_calendar = counting
+            await scenario(app, cal, pilot)
+
+    asyncio.run(main())
+
+
+class TestMonthNavigation:
+    """月移動の描画まとめ（デバウンス）のテスト。"""
+
+    def test_burst_renders_once(self):
+        async def scenario(app, cal, pilot):
+            for _ in range(5):
+                app.post_message(events.Key("greater_than_sign", ">"))
+            await pilot.pause()
+            assert (cal.current_year, cal.current_month) == (2026, 4)
+            assert app.rebuilds == 1
+            assert cal.skipped_rebuilds == 4
+            assert app.month_changes == [(2026, 4)]
+            assert "2026年04月" in str(cal.query_one("#month-label").render())
+
+        _run(scenario)
+
+    def test_single_steps_render_each_month(self):
+        async def scenario(app, cal, pilot):
+            await pilot.press("less_than_sign")
+            await pilot.press("less_than_sign")
+            await pilot.pause()
+            assert (cal.current_year, cal.current_month) == (2025, 9)
+            assert app.month_changes == [(2025, 10), (2025, 9)]
+            assert app.rebuilds == 2
+            assert cal.skipped_rebuilds == 0
+
+        _run(scenario)
+
+    def test_year_wrap_rebuilds_once(self):
+        async def scenario(app, cal, pilot):
+            await pilot.press("greater_than_sign")
+            await pilot.press("greater_than_sign")
+            await pilot.pause()
+            assert (cal.current_year, cal.current_month) == (2026, 1)
+            assert app.rebuilds == 2
+
+        _run(scenario)
+
+    def test_select_date_cancels_pending_navigation(self):
+        async def scenario(app, cal, pilot):
+            cal.go_next_month()
+            cal.go_next_month()
+            cal.select_date(datetime.date(2024, 3, 1))
+            await pilot.pause()
+            assert (cal.current_year, cal.current_month) == (2024, 3)
+            assert app.month_changes == []
+            assert app.rebuilds == 1
+
+        _run(scenario)
+
+
+class TestMonthPrefetch:
+    """前後の月の先読みのテスト。"""
+
+    def test_paging_hits_prefetched_month(self):
+        async def scenario(app, cal, pilot):
+            await app.workers.wait_for_complete()
+            assert (2025, 10) in cal.month_cache
+            assert (2025, 12) in cal.month_cache
+            misses = cal.month_cache.misses
+            await pilot.press("greater_than_sign")
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            assert cal.month_cache.misses == misses
+            assert (2026, 1) in cal.month_cache
+
+        _run(scenario)
+
+    def test_rapid_paging_keeps_one_prefetch(self):
+        async def scenario(app, cal, pilot):
+            await app.workers.wait_for_complete()
+            for _ in range(5):
+                cal._prefetch_adjacent(2026, 1)
+            live = [
+                w for w in app.workers
+                if w.group == "month-prefetch" and not w.is_cancelled
+            ]
+            assert len(live) == 1
+            await live[0].wait()
+            assert (2026, 2) in cal.month_cache
+
+        _run(scenario)
+
+
+class TestSelection:
+    """同じ月の中での日付選択のテスト。"""
+
+    def test_same_month_moves_selection_without_rebuild(self):
+        async def scenario(app, cal, pilot):
+            cal.select_date(datetime.date(2025, 11, 3))
+            await pilot.pause()
+            assert app.rebuilds == 0
+            assert cal._cells[3].is_selected
+            assert not cal._cells[15].is_selected
+            assert cal.selected_date == datetime.date(2025, 11, 3)
+
+        _run(scenario)
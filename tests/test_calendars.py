@@ -0,0 +1,241 @@
+"""複数カレンダーのマージ表示（db.calendars）のテスト。"""
+
+import asyncio
+import datetime
+import json
+
+import pytest
+from textual.widgets import ListView
+
+from app import ScheduleApp
+from db.calendars import (
+    Calendar,
+    CalendarSet,
+    calendar_configs,
+    load_calendars,
+)
+from db.repository import ScheduleRepository
+from db.store import save_schedules
+from models.schedule import Schedule
+from ui.calendar_view import CalendarView
+from ui.detail_view import DetailView, ScheduleItem
+
+DAY = datetime.date(2026, 2, 19)
+
+
+def _calendar(name, *schedules, writable=False):
+    return Calendar(name, None, ScheduleRepository(schedules), writable=writable)
+
+
+@pytest.fixture
+def calendars():
+    return CalendarSet([
+        _calendar(
+            "自分",
+            Schedule(id="m1", date_time="260219_1400", title="レビュー"),
+            Schedule(id="m2", date_time="260219_0900", title="朝会"),
+            writable=True,
+        ),
+        _calendar(
+            "チームA",
+            Schedule(id="a1", date_time="260219_0900", title="チーム朝会"),
+            Schedule(id="a2", date_time="260220_1000", title="レビュー会"),
+        ),
+        _calendar(
+            "チームB",
+            Schedule(id="b1", date_time="260219_1100", title="定例"),
+        ),
+    ])
+
+
+def _ids(schedules):
+    return [s.id for s in schedules]
+
+
+class TestCalendarSet:
+    """カレンダーごとの結果の k-way マージと表示切り替えのテスト。"""
+
+    def test_for_date_merges_by_time(self, calendars):
+        # 同じ時刻はカレンダーの順
+        assert _ids(calendars.for_date(DAY)) == ["m2", "a1", "b1", "m1"]
+
+    def test_between_and_search(self, calendars):
+        end = DAY + datetime.timedelta(days=1)
+        assert _ids(calendars.between(DAY, end)) == ["m2", "a1", "b1", "m1", "a2"]
+        assert _ids(calendars.search("レビュー")) == ["m1", "a2"]
+
+    def test_merge_is_lazy(self, calendars):
+        assert next(calendars.iter_date(DAY)).id == "m2"
+
+    def test_toggle_excludes_calendar(self, calendars):
+        hidden = calendars.toggle(1)
+        assert hidden.name == "チームA" and not hidden.enabled
+        assert _ids(calendars.for_date(DAY)) == ["m2", "b1", "m1"]
+        assert len(calendars) == 3
+        calendars.toggle(1)
+        assert len(calendars) == 5
+
+    def test_occupancy_sums_enabled(self, calendars):
+        occupancy = calendars.occupancy
+        assert occupancy.count(DAY) == 4
+        assert occupancy.counts(2026, 2)[18:20] == [4, 1]
+        assert occupancy.mask(2026, 2) == (1 << 18) | (1 << 19)
+        calendars.toggle(1)
+        assert occupancy.count(DAY) == 3
+        assert occupancy.mask(2026, 2) == 1 << 18
+
+    def test_generation_changes_on_toggle_and_edit(self, calendars):
+        occupancy = calendars.occupancy
+        first = occupancy.generation
+        assert occupancy.generation == first
+        calendars.toggle(2)
+        toggled = occupancy.generation
+        assert toggled != first
+        calendars.calendars[0].source.add(
+            Schedule(id="m3", date_time="260301_0900", title="新規")
+        )
+        assert occupancy.generation != toggled
+
+    def test_calendar_of(self, calendars):
+        [schedule] = calendars.search("定例")
+        assert calendars.calendar_of(schedule).name == "チームB"
+
+
+class TestCalendarConfigs:
+    """config.json の calendars の解釈のテスト。"""
+
+    @pytest.fixture(autouse=True)
+    def data_dir(self, tmp_path, monkeypatch):
+        import db.store as store_mod
+
+        monkeypatch.setattr(store_mod, "DATA_DIR", tmp_path)
+        monkeypatch.setattr(store_mod, "SCHEDULE_FILE", tmp_path / "schedules.json")
+        return tmp_path
+
+    def test_primary_first(self, tmp_path):
+        configs = calendar_configs({"calendars": [
+            {"name": "チームA", "file": "team_a.json", "enabled": False},
+            {"file": "team_a.json"},
+            {"name": "自分", "file": "schedules.json"},
+        ]})
+        assert [(c.name, c.path, c.enabled) for c in configs] == [
+            ("自分", tmp_path / "schedules.json", True),
+            ("チームA", tmp_path / "team_a.json", False),
+        ]
+
+    def test_default(self, tmp_path):
+        [primary] = calendar_configs({})
+        assert primary.path == tmp_path / "schedules.json"
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            calendar_configs({"calendars": [{"name": "ファイルなし"}]})
+
+    def test_load_calendars_keeps_broken_file_empty(self, tmp_path):
+        (tmp_path / "ok.json").write_text(json.dumps({"schedules": [
+            {"id": "x", "date_time": "260219_0900", "title": "予定"},
+        ]}), encoding="utf-8")
+        (tmp_path / "broken.json").write_text("{", encoding="utf-8")
+        configs = calendar_configs({"calendars": [
+            {"file": "ok.json"}, {"file": "broken.json"},
+        ]})[1:]
+        ok, broken = load_calendars(configs, max_workers=1)
+        assert len(ok.source) == 1 and ok.error is None and not ok.writable
+        assert len(broken.source) == 0 and broken.error
+
+    @pytest.mark.parametrize("content", ["[]", '"text"', '{"schedules": 1}'])
+    def test_load_calendars_keeps_non_object_file_empty(self, tmp_path, content):
+        (tmp_path / "ok.json").write_text(json.dumps({"schedules": [
+            {"id": "x", "date_time": "260219_0900", "title": "予定"},
+        ]}), encoding="utf-8")
+        (tmp_path / "list.json").write_text(content, encoding="utf-8")
+        configs = calendar_configs({"calendars": [
+            {"file": "ok.json"}, {"file": "list.json"},
+        ]})[1:]
+        ok, bad = load_calendars(configs, max_workers=1)
+        assert len(ok.source) == 1 and ok.error is None
+        assert len(bad.source) == 0 and "形式" in bad.error
+
+
+@pytest.fixture
+def team_dir(tmp_path, monkeypatch):
+    import db.store as store_mod
+
+    monkeypatch.setattr(store_mod, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(store_mod, "SCHEDULE_FILE", tmp_path / "schedules.json")
+    monkeypatch.setattr(store_mod, "CONFIG_FILE", tmp_path / "config.json")
+    save_schedules([Schedule(id="m1", date_time="260219_1400", title="レビュー")])
+    (tmp_path / "team.json").write_text(json.dumps({"schedules": [
+        {"id": "t1", "date_time": "260219_0900", "title": "チーム朝会"},
+    ]}, ensure_ascii=False), encoding="utf-8")
+    (tmp_path / "config.json").write_text(json.dumps({"calendars": [
+        {"name": "チーム", "file": "team.json"},
+    ]}, ensure_ascii=False), encoding="utf-8")
+    return tmp_path
+
+
+def _titles(detail: DetailView) -> list[str]:
+    return [item.schedule.title for item in detail.query(ScheduleItem)]
+
+
+class TestAppCalendars:
+    """ScheduleApp での複数カレンダーの表示のテスト。"""
+
+    def test_merged_view_and_toggle(self, team_dir):
+        async def main():
+            app = ScheduleApp(watch_interval=None)
+            async with app.run_test(size=(120, 40)) as pilot:
+                cal = app.query_one(CalendarView)
+                detail = app.query_one(DetailView)
+                cal.select_date(DAY)
+                await pilot.pause()
+                assert _titles(detail) == ["チーム朝会", "レビュー"]
+                assert cal._cells[19].schedule_count == 2
+
+                await pilot.press("2")
+                await pilot.pause()
+                assert _titles(detail) == ["レビュー"]
+                assert cal._cells[19].schedule_count == 1
+
+                await pilot.press("2")
+                await pilot.pause()
+                assert _titles(detail) == ["チーム朝会", "レビュー"]
+
+        asyncio.run(main())
+
+    def test_extra_calendar_is_read_only(self, team_dir):
+        async def main():
+            app = ScheduleApp(watch_interval=None)
+            async with app.run_test(size=(120, 40)) as pilot:
+                cal = app.query_one(CalendarView)
+                detail = app.query_one(DetailView)
+                cal.select_date(DAY)
+                await pilot.pause()
+                detail.query_one("#schedule-list", ListView).index = 0
+                await pilot.pause()
+                assert detail.highlighted_schedule.id == "t1"
+                await pilot.press("d")
+                await pilot.pause()
+                # 確認ダイアログを出さずに警告する
+                assert app.screen is app.screen_stack[0]
+                assert _titles(detail) == ["チーム朝会", "レビュー"]
+
+        asyncio.run(main())
+
+    def test_extra_calendar_reload(self, team_dir):
+        async def main():
+            app = ScheduleApp(watch_interval=None)
+            async with app.run_test(size=(120, 40)) as pilot:
+                cal = app.query_one(CalendarView)
+                detail = app.query_one(DetailView)
+                cal.select_date(DAY)
+                await pilot.pause()
+                (team_dir / "team.json").write_text(json.dumps({"schedules": [
+                    {"id": "t2", "date_time": "260219_1000", "title": "差し替え"},
+                ]}, ensure_ascii=False), encoding="utf-8")
+                app._poll_calendars()
+                await app.workers.wait_for_complete()
+                await pilot.pause()
+                assert _titles(detail) == ["差し替え", "レビュー"]
+
+        asyncio.run(main())
@@ -0,0 +1,85 @@
+"""データファイルの圧縮形式（db.codecs）のテスト。"""
+
+import io
+import json
+import tracemalloc
+
+import pytest
+
+from db import codecs
+
+COMPRESSED = ("gzip", "zlib", "lzma")
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    raw = io.BytesIO()
+    with codecs.writer(raw, codec) as f:
+        for start in range(0, len(data), 7):
+            f.write(data[start:start + 7])
+    return raw.getvalue()
+
+
+class TestCodecs:
+    """圧縮・解凍と形式の判定のテスト。"""
+
+    DATA = json.dumps({"schedules": [{"title": "日本語" * 50}]}, ensure_ascii=False).encode()
+
+    @pytest.mark.parametrize("codec", COMPRESSED)
+    def test_roundtrip_and_detect(self, codec):
+        compressed = _compress(self.DATA, codec)
+        assert len(compressed) < len(self.DATA)
+        assert codecs.detect(compressed[:codecs.HEADER_SIZE]) == codec
+        assert codecs.read_all(io.BytesIO(compressed), codec, chunk_size=5) == self.DATA
+
+    @pytest.mark.parametrize("header", [b'{"vers', b"  {", b"\n{", b"", b"[]"])
+    def test_plain_json_is_not_compressed(self, header):
+        assert codecs.detect(header) == "none"
+
+    def test_progress_reports_compressed_bytes(self):
+        compressed = _compress(self.DATA, "zlib")
+        seen = []
+        codecs.read_all(io.BytesIO(compressed), "zlib", 16, seen.append)
+        assert seen and seen[-1] == len(compressed)
+
+    @pytest.mark.parametrize("codec", COMPRESSED)
+    def test_truncated_data(self, codec):
+        compressed = _compress(self.DATA, codec)
+        with pytest.raises(ValueError):
+            codecs.read_all(io.BytesIO(compressed[: len(compressed) // 2]), codec)
+
+    @pytest.mark.parametrize("codec", ["gzip", "zlib"])  # lzma の level は preset（0 でも圧縮する）
+    def test_level_zero(self, codec):
+        raw = io.BytesIO()
+        with codecs.writer(raw, codec, level=0) as f:
+            f.write(self.DATA)
+        # level 0 は無圧縮で格納する（既定の level に置き換えない）
+        assert len(raw.getvalue()) > len(self.DATA)
+        assert codecs.read_all(io.BytesIO(raw.getvalue()), codec) == self.DATA
+
+    @pytest.mark.parametrize("codec", ("none",) + COMPRESSED)
+    def test_read_all_peak_memory(self, codec):
+        data = b"x" * (16 << 20)
+        compressed = data
+        if codec != "none":
+            raw = io.BytesIO()
+            with codecs.writer(raw, codec) as f:
+                f.write(data)
+            compressed = raw.getvalue()
+        tracemalloc.start()
+        try:
+            codecs.read_all(io.BytesIO(compressed), codec)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # 解凍後の全体を2つ同時に持たない
+        assert peak < len(data) * 1.5
+
+    def test_load_json(self, tmp_path):
+        path = tmp_path / "data.json"
+        path.write_bytes(_compress(self.DATA, "lzma"))
+        assert codecs.load_json(path) == json.loads(self.DATA)
+
+    def test_check_codec(self):
+        assert codecs.check_codec("gzip") == "gzip"
+        with pytest.raises(ValueError):
+            codecs.check_codec("zstd")
@@ -0,0 +1,285 @@
+"""常駐サーバー（db.daemon）とクライアント（db.client）のテスト。"""
+
+import asyncio
+import datetime
+import socket
+import threading
+import time
+
+import pytest
+
+from db.client import DaemonClient, DaemonError, RemoteRepository
+from db.daemon import ScheduleDaemon
+from db.events import ScheduleAdded, ScheduleDeleted
+from db.protocol import ProtocolError, encode_frame, recv_frame
+from db.store import load_schedules, load_schedules_versioned, save_schedules
+from models.schedule import Schedule
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix ドメインソケットが必要"
+)
+
+DAY = datetime.date(2026, 2, 19)
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    import db.store as store_mod
+
+    monkeypatch.setattr(store_mod, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(store_mod, "SCHEDULE_FILE", tmp_path / "schedules.json")
+    save_schedules([
+        Schedule(id="a", date_time="260219_1400", title="午後会議"),
+        Schedule(id="b", date_time="260219_0900", title="朝会", memo="定例"),
+        Schedule(id="c", date_time="260225_1000", title="別の日"),
+    ])
+    return tmp_path
+
+
+@pytest.fixture
+def daemon(data_dir):
+    """別スレッドのイベントループでサーバーを動かす。"""
+    server = ScheduleDaemon(data_dir / "d.sock", watch_interval=0.05)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run() -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert started.wait(5)
+    yield server
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+@pytest.fixture
+def client(daemon):
+    client = DaemonClient(daemon.socket_path, timeout=5)
+    yield client
+    client.close()
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "タイムアウト"
+        time.sleep(0.01)
+
+
+class TestProtocol:
+    """フレームの読み書きのテスト。"""
+
+    def test_roundtrip(self):
+        left, right = socket.socketpair()
+        with left, right:
+            left.sendall(encode_frame({"id": 1, "op": "day", "title": "日本語"}))
+            left.sendall(encode_frame({}))
+            assert recv_frame(right) == {"id": 1, "op": "day", "title": "日本語"}
+            assert recv_frame(right) == {}
+            left.close()
+            assert recv_frame(right) is None
+
+    def test_truncated_frame(self):
+        left, right = socket.socketpair()
+        with right:
+            left.sendall(encode_frame({"id": 1})[:-2])
+            left.close()
+            with pytest.raises(ProtocolError):
+                recv_frame(right)
+
+    def test_compact_json(self):
+        frame = encode_frame({"a": [1, 2]})
+        assert frame[4:] == b'{"a":[1,2]}'
+        assert int.from_bytes(frame[:4], "big") == len(frame) - 4
+
+
+class TestDaemon:
+    """要求・応答と変更通知のテスト。"""
+
+    def test_reads(self, client):
+        assert client.hello()["count"] == 3
+        assert [s.title for s in client.day(DAY)] == ["朝会", "午後会議"]
+        assert client.month_counts(2026, 2)[18] == 2
+        assert [s.id for s in client.between(DAY, datetime.date(2026, 2, 28))] == [
+            "b", "a", "c",
+        ]
+        assert [s.id for s in client.search("定例")] == ["b"]
+        assert client.get("c").title == "別の日"
+        assert client.get("zzz") is None
+
+    def test_add_saves_and_pushes(self, daemon, client):
+        other = DaemonClient(daemon.socket_path, timeout=5)
+        pushes = []
+        other.on_push = pushes.append
+        other.subscribe()
+        try:
+            change = client.add(Schedule(id="d", date_time="260219_1200", title="昼"))
+            assert isinstance(change, ScheduleAdded)
+            _wait_for(lambda: pushes)
+            assert pushes[0]["kind"] == "added" and pushes[0]["new"]["id"] == "d"
+            assert sorted(s.id for s in load_schedules()) == ["a", "b", "c", "d"]
+            assert [s.id for s in client.day(DAY)] == ["b", "d", "a"]
+        finally:
+            other.close()
+
+    def test_errors(self, client):
+        with pytest.raises(DaemonError):
+            client.delete("zzz")
+        with pytest.raises(DaemonError):
+            client.add(Schedule(id="a", date_time="260219_1200"))
+        with pytest.raises(DaemonError):
+            client.request("unknown")
+        assert client.hello()["count"] == 3
+
+    def test_concurrent_writes_are_all_saved(self, daemon):
+        clients = [DaemonClient(daemon.socket_path, timeout=5) for _ in range(4)]
+        errors = []
+
+        def add(client, i):
+            try:
+                client.add(Schedule(id=f"n{i}", date_time="260219_1200", title=f"追加{i}"))
+            except DaemonError as e:
+                errors.append(e)
+
+        threads = [
+            threading.Thread(target=add, args=(c, i)) for i, c in enumerate(clients)
+        ]
+        try:
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(5)
+        finally:
+            for c in clients:
+                c.close()
+        assert errors == []
+        expected = ["a", "b", "c", "n0", "n1", "n2", "n3"]
+        assert sorted(s.id for s in daemon.repo.schedules) == expected
+        assert sorted(s.id for s in load_schedules()) == expected
+
+    def test_save_error_is_returned(self, daemon, client, monkeypatch):
+        import db.daemon as daemon_mod
+
+        def fail(*args):
+            raise OSError("ディスクがいっぱいです")
+
+        monkeypatch.setattr(daemon_mod, "save_merged", fail)
+        with pytest.raises(DaemonError, match="保存できませんでした"):
+            client.add(Schedule(id="d", date_time="260219_1200", title="昼"))
+        assert client.hello()["count"] == 3
+
+    def test_conflict_keeps_other_changes(self, daemon, client, monkeypatch):
+        import db.daemon as daemon_mod
+
+        original = daemon_mod.save_merged
+
+        def other_saves_first(base, ours, *args):
+            # 他のプロセスが a（同じレコード）と c（別のレコード）を先に保存する
+            theirs = {s.id: s for s in load_schedules()}
+            theirs["a"] = Schedule(**{**theirs["a"].to_dict(), "title": "他"})
+            theirs["c"] = Schedule(**{**theirs["c"].to_dict(), "title": "他で編集"})
+            save_schedules(list(theirs.values()))
+            return original(base, ours, *args)
+
+        monkeypatch.setattr(daemon_mod, "save_merged", other_saves_first)
+        a = client.get("a")
+        with pytest.raises(DaemonError, match="他で変更"):
+            client.update(Schedule(**{**a.to_dict(), "title": "こちら"}))
+        assert client.get("a").title == "他"
+        assert client.get("c").title == "他で編集"
+        titles = {s.id: s.title for s in load_schedules()}
+        assert (titles["a"], titles["c"]) == ("他", "他で編集")
+
+    def test_external_change_is_pushed(self, data_dir, client):
+        pushes = []
+        client.on_push = pushes.append
+        client.subscribe()
+        schedules, _ = load_schedules_versioned()
+        save_schedules([s for s in schedules if s.id != "c"])
+        _wait_for(lambda: pushes)
+        assert [(p["kind"], p["old"]["id"]) for p in pushes] == [("deleted", "c")]
+        assert client.hello()["count"] == 2
+
+    def test_second_daemon_refused(self, daemon):
+        with pytest.raises(RuntimeError):
+            asyncio.run(ScheduleDaemon(daemon.socket_path).start())
+
+    def test_disconnect(self, daemon):
+        closed = threading.Event()
+        client = DaemonClient(daemon.socket_path, on_disconnect=closed.set, timeout=5)
+        client.close()
+        assert not closed.is_set()
+        with pytest.raises(DaemonError):
+            client.hello()
+
+
+class TestRemoteRepository:
+    """RemoteRepository のテスト。"""
+
+    def test_changes_arrive_as_events(self, daemon, client):
+        repo = RemoteRepository(client)
+        changes = []
+        repo.subscribe(changes.append)
+        repo.reset()
+        repo.start()
+        assert len(repo) == 3
+        assert repo.occupancy.count(DAY) == 2
+
+        repo.delete("b")
+        _wait_for(lambda: changes)
+        assert isinstance(changes[0], ScheduleDeleted)
+        assert repo.occupancy.count(DAY) == 1
+        assert len(repo) == 2
+        assert [s.id for s in repo.for_date(DAY)] == ["a"]
+
+    def test_unloaded_month_is_fetched_later(self, daemon, client):
+        repo = RemoteRepository(client)
+        repo.reset()
+        repo.start()
+        client.add(Schedule(id="x", date_time="260410_0900"))
+        _wait_for(lambda: len(repo) == 4)
+        assert repo.occupancy.count(datetime.date(2026, 4, 10)) == 1
+
+
+class TestThinClientApp:
+    """ScheduleApp をサーバーに接続して動かすテスト。"""
+
+    def test_add_from_app_and_other_client(self, daemon, client):
+        from app import ScheduleApp
+        from ui.calendar_view import CalendarView
+        from ui.detail_view import DetailView, ScheduleItem
+
+        other = DaemonClient(daemon.socket_path, timeout=5)
+
+        async def main():
+            app = ScheduleApp(remote=RemoteRepository(client))
+            async with app.run_test(size=(120, 40)) as pilot:
+                cal = app.query_one(CalendarView)
+                detail = app.query_one(DetailView)
+                cal.select_date(DAY)
+                await pilot.pause()
+                app._on_schedule_form_result(
+                    Schedule(id="d", date_time="260219_1200", title="昼")
+                )
+                other.add(Schedule(id="e", date_time="260219_1800", title="他から"))
+                for _ in range(50):
+                    await pilot.pause(0.02)
+                    if len(list(detail.query(ScheduleItem))) == 4:
+                        break
+                titles = [item.schedule.title for item in detail.query(ScheduleItem)]
+                assert titles == ["朝会", "昼", "午後会議", "他から"]
+                assert cal._cells[19].schedule_count == 4
+                assert app._watcher is None
+
+        try:
+            asyncio.run(main())
+        finally:
+            other.close()
+        assert len(load_schedules()) == 5
@@ -9,7 +9,11 @@ from utils.datetime_util import (
     format_time_display,
     now_formatted,
     date_to_key,
+    month_key,
     extract_date_key,
+    to_sort_key,
+    from_sort_key,
+    parse_many,
 )
 
 
@@ -68,6 +72,70 @@ class TestParseDatetime:
         with pytest.raises(ValueError):
             parse_datetime("260219_2530")
 
+    def test_until_with_whitespace(self):
+        dt, dt_type = parse_datetime(" ~260219_1430 ")
+        assert dt == datetime.datetime(2026, 2, 19, 14, 30)
+        assert dt_type == "until"
+
+    def test_from_with_whitespace(self):
+        dt, dt_type = parse_datetime("260219_1430~\n")
+        assert dt_type == "from"
+
+    def test_memoized(self):
+        a, _ = parse_datetime("260219_1430")
+        b, _ = parse_datetime("260219_1430")
+        assert a is b
+
+    def test_invalid_is_not_cached(self):
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                parse_datetime("260230_1430")
+
+
+# ── parse_many ──────────────────────────────────────────────
+
+
+class TestParseMany:
+    """parse_many のテスト。"""
+
+    def test_three_forms(self):
+        assert parse_many(["260219_1430", "~260219_1430", "260219_1430~"]) == [
+            2602191430, 2602191430, 2602191430,
+        ]
+
+    def test_matches_parse_datetime(self):
+        raws = ["000101_0000", " 261231_2359 ", "~240229_1200", "250614_0900~"]
+        expected = [to_sort_key(parse_datetime(r)[0]) for r in raws]
+        assert parse_many(raws) == expected
+
+    def test_empty(self):
+        assert parse_many([]) == []
+
+    @pytest.mark.parametrize("raw", [
+        "2602_1430",
+        "26021914300",
+        "261319_1430",
+        "260232_1430",
+        "260230_1430",
+        "250229_1200",
+        "260219_2530",
+        "260219_1460",
+        "2602a9_1430",
+    ])
+    def test_invalid_raises_like_parse_datetime(self, raw):
+        with pytest.raises(ValueError):
+            parse_datetime(raw)
+        with pytest.raises(ValueError):
+            parse_many(["260219_1430", raw])
+
+    def test_rejects_non_ascii_digits(self):
+        with pytest.raises(ValueError):
+            parse_many(["260219_１４30"])
+
+    def test_error_reports_index(self):
+        with pytest.raises(ValueError, match="index 1"):
+            parse_many(["260219_1430", "invalid"])
+
 
 # ── format_datetime ─────────────────────────────────────────
 
@@ -163,6 +231,39 @@ class TestDateToKey:
         assert date_to_key(d) == "001231"
 
 
+# ── to_sort_key / from_sort_key ─────────────────────────────
+
+
+class TestSortKey:
+    """to_sort_key / from_sort_key のテスト。"""
+
+    def test_to_sort_key(self):
+        dt = datetime.datetime(2026, 2, 19, 14, 30)
+        assert to_sort_key(dt) == 2602191430
+
+    def test_roundtrip(self):
+        dt = datetime.datetime(2000, 1, 1, 0, 0)
+        assert from_sort_key(to_sort_key(dt)) == dt
+
+    def test_order_matches_datetime(self):
+        a = datetime.datetime(2026, 2, 19, 23, 59)
+        b = datetime.datetime(2026, 2, 20, 0, 0)
+        assert to_sort_key(a) < to_sort_key(b)
+
+
+# ── month_key ───────────────────────────────────────────────
+
+
+class TestMonthKey:
+    """month_key のテスト。"""
+
+    def test_basic(self):
+        assert month_key(2026, 2) == "2602"
+
+    def test_year_2000(self):
+        assert month_key(2000, 12) == "0012"
+
+
 # ── extract_date_key ────────────────────────────────────────
 
 
@@ -0,0 +1,90 @@
+"""複数ファイルの並列読み込み（db.loader）のテスト。"""
+
+import json
+
+import pytest
+
+from db.loader import load_merged, load_shard, load_shards, merge_shards
+
+
+def _write(path, records, version=None):
+    payload = {"schedules": records}
+    if version is not None:
+        payload["version"] = version
+    path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def _record(id_, date_time, title="予定", **kwargs):
+    return {"id": id_, "date_time": date_time, "title": title, **kwargs}
+
+
+@pytest.fixture
+def shards(tmp_path):
+    return [
+        _write(tmp_path / "team_a.json", [
+            _record("a2", "260219_1400"),
+            _record("a1", "260219_0900"),
+            _record("a3", "260301_0900"),
+        ], version=4),
+        _write(tmp_path / "team_b.json", [
+            _record("b1", "260219_0900"),
+            _record("b2", "~260220_1000", date_time_type="until"),
+        ]),
+        _write(tmp_path / "team_c.json", [
+            _record("c1", "260101_0800"),
+        ]),
+    ]
+
+
+class TestLoadShard:
+    """1ファイルの読み込みのテスト。"""
+
+    def test_sorted_with_keys(self, shards):
+        shard = load_shard(shards[0])
+        assert [s.id for s in shard.schedules] == ["a1", "a2", "a3"]
+        assert shard.keys == [2602190900, 2602191400, 2603010900]
+        assert shard.version == 4
+
+    def test_invalid_records_are_skipped(self, tmp_path):
+        path = _write(tmp_path / "bad.json", [
+            _record("ok", "260219_0900"),
+            _record("no-title", "260219_1000", title=" "),
+            _record("bad-date", "260230_1000"),
+        ])
+        shard = load_shard(path)
+        assert [s.id for s in shard.schedules] == ["ok"]
+        assert [i for i, _ in shard.invalid] == [1, 2]
+        assert "タイトルは必須です" in shard.invalid[0][1]
+
+    def test_missing_fields_use_defaults(self, tmp_path):
+        record = {"date_time": "260219_0900", "title": "t"}
+        path = _write(tmp_path / "partial.json", [record])
+        [schedule] = load_shard(path).schedules
+        assert schedule.id and schedule.created_at
+        assert schedule.memo == "" and schedule.date_time_type == "exact"
+
+    def test_missing_file(self, tmp_path):
+        shard = load_shard(tmp_path / "none.json")
+        assert shard.schedules == [] and shard.version == 0
+
+
+class TestLoadMerged:
+    """並列読み込みと k-way マージのテスト。"""
+
+    def test_merge_order(self, shards):
+        merged, loaded = load_merged(shards, max_workers=1)
+        # 同じ日時はファイルの順
+        assert [s.id for s in merged] == ["c1", "a1", "b1", "a2", "b2", "a3"]
+        assert [shard.path for shard in loaded] == shards
+
+    def test_process_pool_matches_in_process(self, shards):
+        parallel = load_shards(shards, max_workers=2)
+        serial = load_shards(shards, max_workers=1)
+        assert [s.schedules for s in parallel] == [s.schedules for s in serial]
+        assert [s.keys for s in parallel] == [s.keys for s in serial]
+        assert [s.version for s in parallel] == [4, 0, 0]
+
+    def test_merge_is_lazy(self, shards):
+        merged = merge_shards(load_shards(shards, max_workers=1))
+        assert next(merged).id == "c1"
@@ -0,0 +1,88 @@
+"""月表示モデルと LRU キャッシュのテスト。"""
+
+import datetime
+
+import pytest
+
+from db.query import OccupancyIndex
+from models.schedule import Schedule
+from ui.month_model import MonthModelCache, build_month_model
+
+
+def _index(*date_times: str) -> OccupancyIndex:
+    return OccupancyIndex(Schedule(date_time=dt, title="テスト") for dt in date_times)
+
+
+class TestBuildMonthModel:
+    """build_month_model のテスト。"""
+
+    def test_layout_and_counts(self):
+        index = _index("260201_0900", "260219_0900", "260219_1400")
+        model = build_month_model(index, 2026, 2)
+        assert model.weeks[0][:6] == (0, 0, 0, 0, 0, 0)  # 2026-02-01 は日曜
+        assert model.weeks[0][6] == 1
+        assert len(model.date_keys) == len(model.counts) == 28
+        assert model.date_keys[18] == "260219"
+        assert model.counts[0] == 1
+        assert model.counts[18] == 2
+        assert model.mask == (1 << 0) | (1 << 18)
+        assert model.date(19) == datetime.date(2026, 2, 19)
+        assert model.generation == index.generation
+
+
+class TestMonthModelCache:
+    """MonthModelCache のテスト。"""
+
+    def test_hit_and_miss(self):
+        cache = MonthModelCache()
+        index = _index("260219_0900")
+        first = cache.get(index, 2026, 2)
+        assert cache.get(index, 2026, 2) is first
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_invalidated_by_generation(self):
+        cache = MonthModelCache()
+        index = _index("260219_0900")
+        cache.get(index, 2026, 2)
+        index.add(Schedule(date_time="260219_1000", title="追加"))
+        model = cache.get(index, 2026, 2)
+        assert model.counts[18] == 2
+        assert cache.misses == 2
+
+    def test_new_index_does_not_reuse_entries(self):
+        cache = MonthModelCache()
+        cache.get(_index("260219_0900"), 2026, 2)
+        model = cache.get(_index(), 2026, 2)
+        assert model.counts[18] == 0
+        assert cache.misses == 2
+
+    def test_lru_eviction(self):
+        cache = MonthModelCache(capacity=2)
+        index = _index()
+        cache.get(index, 2026, 1)
+        cache.get(index, 2026, 2)
+        cache.get(index, 2026, 1)      # 1月を最近使ったものにする
+        cache.get(index, 2026, 3)      # 2月が追い出される
+        assert (2026, 1) in cache
+        assert (2026, 2) not in cache
+        assert len(cache) == 2
+
+    def test_century_collision(self):
+        cache = MonthModelCache()
+        index = _index()
+        cache.get(index, 2026, 2)
+        model = cache.get(index, 1926, 2)
+        assert model.year == 1926
+        assert cache.misses == 2
+
+    def test_prefetch(self):
+        cache = MonthModelCache()
+        index = _index("260301_0900")
+        assert cache.prefetch(index, 2026, 3) is True
+        assert cache.prefetch(index, 2026, 3) is False
+        assert cache.get(index, 2026, 3).counts[0] == 1
+        assert (cache.hits, cache.misses) == (1, 0)
+
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError):
+            MonthModelCache(capacity=0)
@@ -0,0 +1,176 @@
+"""計測スパンのテスト。"""
+
+import asyncio
+import threading
+
+import pytest
+
+from utils import perf
+
+
+@pytest.fixture(autouse=True)
+def clean_perf():
+    perf.reset()
+    perf.enable(False)
+    yield
+    perf.reset()
+    perf.enable(False)
+
+
+class TestSpan:
+    """span / timed のテスト。"""
+
+    def test_disabled_records_nothing(self):
+        with perf.span("x"):
+            pass
+        perf.count("mounts", 3)
+        assert perf.stats() == []
+        assert perf.counter("mounts") == 0
+
+    def test_disabled_span_is_shared(self):
+        assert perf.span("a") is perf.span("b")
+
+    def test_span_records_when_enabled(self):
+        perf.enable()
+        with perf.span("x"):
+            pass
+        [s] = perf.stats()
+        assert s.name == "x"
+        assert s.count == 1
+        assert s.last >= 0
+
+    def test_timed_decorator(self):
+        @perf.timed("f")
+        def f(a, b=1):
+            return a + b
+
+        assert f(1) == 2
+        assert perf.stats() == []
+        perf.enable()
+        assert f(1, b=2) == 3
+        assert [s.name for s in perf.stats()] == ["f"]
+
+    def test_timed_records_on_exception(self):
+        @perf.timed("boom")
+        def boom():
+            raise ValueError
+
+        perf.enable()
+        with pytest.raises(ValueError):
+            boom()
+        assert perf.stats()[0].count == 1
+
+    def test_timed_coroutine(self):
+        @perf.timed("slow")
+        async def slow():
+            await asyncio.sleep(0.01)
+            return 1
+
+        perf.enable()
+        assert asyncio.run(slow()) == 1
+        [s] = perf.stats()
+        assert s.last >= 0.01
+
+
+class TestRollingStats:
+    """ローリング統計のテスト。"""
+
+    def test_window(self):
+        perf.enable()
+        for i in range(perf.WINDOW + 10):
+            perf.record("x", float(i))
+        [s] = perf.stats()
+        assert s.count == perf.WINDOW + 10
+        assert s.last == perf.WINDOW + 9
+        assert s.max == perf.WINDOW + 9
+        # 最初の10件は窓から外れている
+        assert s.mean == pytest.approx(sum(range(10, perf.WINDOW + 10)) / perf.WINDOW)
+
+    def test_counters_and_gauges(self):
+        perf.enable()
+        perf.count("mounts", 42)
+        perf.count("mounts")
+        assert perf.counter("mounts") == 43
+        perf.enable(False)
+        perf.gauge("dataset.records", 10)
+        assert perf.gauges()["dataset.records"] == 10
+
+    def test_reset_keeps_gauges(self):
+        perf.enable()
+        perf.record("x", 1.0)
+        perf.count("mounts")
+        perf.gauge("dataset.records", 5)
+        perf.reset()
+        assert perf.stats() == []
+        assert perf.counter("mounts") == 0
+        assert perf.gauges()["dataset.records"] == 5
+
+
+class TestThreads:
+    """ワーカースレッドからの記録のテスト。"""
+
+    def test_record_waits_for_readers(self):
+        perf.enable()
+        worker = threading.Thread(target=lambda: (perf.record("x", 1.0), perf.count("n")))
+        with perf._lock:
+            # stats() などがコピーを取っている間は、記録側が待つ
+            worker.start()
+            worker.join(0.1)
+            assert worker.is_alive()
+            assert perf._timings == {}
+        worker.join(5)
+        assert [s.count for s in perf.stats()] == [1]
+        assert perf.counter("n") == 1
+
+    def test_record_from_threads_while_reading_stats(self):
+        perf.enable()
+        per_thread = 2000
+        errors = []
+
+        def work(i):
+            try:
+                for j in range(per_thread):
+                    perf.record(f"t{i}.{j % 100}", 0.001)
+                    perf.count("calls")
+            except Exception as e:  # pragma: no cover - 失敗時の報告用
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        while any(t.is_alive() for t in threads):
+            perf.stats()
+            perf.gauges()
+        for t in threads:
+            t.join()
+        assert errors == []
+        assert perf.counter("calls") == 4 * per_thread
+        assert sum(s.count for s in perf.stats()) == 4 * per_thread
+
+
+class TestBreakdown:
+    """1回だけ行う処理の段階ごとの計測のテスト。"""
+
+    def test_laps_are_recorded_while_disabled(self):
+        startup = perf.Breakdown("startup")
+        startup.lap("config")
+        startup.lap("load")
+        startup.lap("config")
+        parts = startup.finish()
+        assert list(parts) == ["config", "load", "total"]
+        assert parts["total"] >= parts["config"] + parts["load"]
+        assert perf.breakdowns() == {"startup": parts}
+        # 無効時はローリング統計には入らない
+        assert perf.stats() == []
+
+    def test_parts_go_to_sinks_and_survive_reset(self):
+        seen = []
+        sink = lambda name, seconds: seen.append(name)  # noqa: E731
+        perf.add_sink(sink)
+        try:
+            perf.breakdown("startup", {"read": 0.5, "total": 1.0})
+        finally:
+            perf.remove_sink(sink)
+        assert seen == ["startup.read", "startup.total"]
+        perf.reset()
+        assert perf.breakdowns()["startup"] == {"read": 0.5, "total": 1.0}
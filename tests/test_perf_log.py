@@ -0,0 +1,122 @@
+"""パフォーマンスログとヒストグラムのテスト。"""
+
+import json
+
+import pytest
+
+from utils import perf, perf_log
+from utils.perf_log import LatencyHistogram, PerfLogger
+from utils.perf_summary import main as summary_main
+from utils.perf_summary import read_histograms, summarize
+
+
+class TestLatencyHistogram:
+    """LatencyHistogram のテスト。"""
+
+    def test_bucket_index_monotonic_and_bounded(self):
+        h = LatencyHistogram()
+        prev = -1
+        for v in range(0, 200_000, 7):
+            idx = h.bucket_index(v)
+            assert idx >= prev
+            prev = idx
+            upper = h.bucket_upper(idx)
+            assert v <= upper
+            # 相対誤差は 1/2**SUB_BUCKET_BITS 以内
+            assert upper - v <= max(1, v) / 2 ** h.sub_bucket_bits
+
+    def test_small_values_exact(self):
+        h = LatencyHistogram()
+        for v in range(64):
+            assert h.bucket_upper(h.bucket_index(v)) == v
+
+    def test_percentiles(self):
+        h = LatencyHistogram()
+        for v in range(1, 1001):
+            h.record(v * 1000)
+        assert h.count == 1000
+        assert h.min == 1000 and h.max == 1_000_000
+        assert h.percentile(50) == pytest.approx(500_000, rel=0.04)
+        assert h.percentile(99) == pytest.approx(990_000, rel=0.04)
+        assert h.percentile(100) == 1_000_000
+
+    def test_empty(self):
+        assert LatencyHistogram().percentile(99) == 0
+
+    def test_merge_and_roundtrip(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        for v in (10, 20, 30):
+            a.record(v)
+        for v in (5, 5000):
+            b.record(v)
+        a.merge(b)
+        assert (a.count, a.min, a.max, a.total) == (5, 5, 5000, 5065)
+        restored = LatencyHistogram.from_dict(json.loads(json.dumps(a.to_dict())))
+        assert restored.buckets == a.buckets
+        assert restored.percentile(50) == a.percentile(50)
+
+    def test_merge_rejects_different_precision(self):
+        with pytest.raises(ValueError):
+            LatencyHistogram(5).merge(LatencyHistogram(3))
+
+
+class TestPerfLogger:
+    """PerfLogger のテスト。"""
+
+    def _records(self, path):
+        return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+    def test_writes_spans_and_histograms(self, tmp_path):
+        logger = perf_log.start(tmp_path)
+        try:
+            with perf.span("store.load_schedules"):
+                pass
+            perf.record("query.search_schedules", 0.002)
+        finally:
+            perf_log.stop(logger)
+        assert not perf._active
+
+        records = self._records(logger.path)
+        assert logger.path.parent == tmp_path
+        assert records[0]["type"] == "start"
+        spans = [r for r in records if r["type"] == "span"]
+        assert [s["name"] for s in spans] == ["store.load_schedules", "query.search_schedules"]
+        assert spans[1]["ms"] == pytest.approx(2.0)
+        hists = {r["name"]: r for r in records if r["type"] == "histogram"}
+        assert hists["query.search_schedules"]["count"] == 1
+
+    def test_close_is_idempotent(self, tmp_path):
+        logger = PerfLogger(tmp_path / "perf.jsonl")
+        logger("x", 0.001)
+        logger.close()
+        logger.close()
+        assert sum(r["type"] == "histogram" for r in self._records(logger.path)) == 1
+
+
+class TestPerfSummary:
+    """perf_summary のテスト。"""
+
+    def test_falls_back_to_spans(self, tmp_path):
+        path = tmp_path / "perf_crash.jsonl"
+        path.write_text(
+            '{"type": "span", "name": "x", "ms": 1.0}\n'
+            '{"type": "span", "name": "x", "ms": 3.0}\n'
+            '{"type": "span", "na',
+            encoding="utf-8",
+        )
+        hist = read_histograms(path)["x"]
+        assert hist.count == 2
+        assert hist.max == 3000
+
+    def test_merges_logs(self, tmp_path, capsys):
+        for i in range(2):
+            logger = PerfLogger(tmp_path / f"perf_{i}.jsonl")
+            logger("app._refresh_views", 0.010)
+            logger.close()
+        paths = sorted(tmp_path.glob("perf_*.jsonl"))
+        assert summarize(paths)["app._refresh_views"].count == 2
+
+        assert summary_main([str(p) for p in paths]) == 0
+        out = capsys.readouterr().out
+        assert "app._refresh_views" in out
+        assert "p99" in out
@@ -1,10 +1,25 @@
 """query モジュールのテスト。"""
 
 import datetime
+import random
 import pytest
 
+import db.query as query_mod
+from db.events import ScheduleAdded, ScheduleDeleted, ScheduleUpdated
 from models.schedule import Schedule
-from db.query import filter_by_date, dates_with_schedules, search_schedules
+from models.schedule_table import ScheduleTable
+from db.query import (
+    OccupancyIndex,
+    SearchCursor,
+    argsort_keys,
+    date_range_mask,
+    dates_with_schedules,
+    day_histogram,
+    filter_by_date,
+    occupied_date_keys,
+    search_schedules,
+    sort_key_column,
+)
 
 
 def _make_schedule(date_time: str, title: str = "テスト", memo: str = "") -> Schedule:
@@ -65,6 +80,15 @@ class TestFilterByDate:
         assert len(result) == 1
         assert result[0].title == "から"
 
+    def test_same_time_keeps_input_order(self):
+        schedules = [
+            _make_schedule("260219_1400", title="午後"),
+            _make_schedule("~260219_0900", title="朝"),
+            _make_schedule("260219_0900~", title="朝2"),
+        ]
+        result = filter_by_date(schedules, datetime.date(2026, 2, 19))
+        assert [s.title for s in result] == ["朝", "朝2", "午後"]
+
 
 class TestDatesWithSchedules:
     """dates_with_schedules のテスト。"""
@@ -143,3 +167,303 @@ class TestSearchSchedules:
         ]
         result = search_schedules(schedules, "プロジェクト")
         assert len(result) == 1
+
+
+class TestSearchCursor:
+    """SearchCursor のテスト。"""
+
+    def _cursor(self) -> SearchCursor:
+        schedules = [
+            _make_schedule("260305_1000", title="会議C"),
+            _make_schedule("260219_0900", title="会議A"),
+            _make_schedule("260219_1400", title="会議B"),
+        ]
+        return SearchCursor("会議", schedules)
+
+    def test_results_sorted_by_datetime(self):
+        cursor = self._cursor()
+        assert [s.title for s in cursor.results] == ["会議A", "会議B", "会議C"]
+        assert cursor.current.title == "会議A"
+
+    def test_next_wraps_around(self):
+        cursor = self._cursor()
+        assert cursor.next().title == "会議B"
+        assert cursor.next().title == "会議C"
+        assert cursor.next().title == "会議A"
+
+    def test_prev_wraps_around(self):
+        cursor = self._cursor()
+        assert cursor.prev().title == "会議C"
+        assert cursor.prev().title == "会議B"
+
+    def test_empty_cursor(self):
+        cursor = SearchCursor("なし", [])
+        assert len(cursor) == 0
+        assert cursor.current is None
+        assert cursor.next() is None
+        assert cursor.prev() is None
+
+    def test_date_keys_in_month(self):
+        cursor = self._cursor()
+        assert cursor.date_keys_in_month(2026, 2) == {"260219"}
+        assert cursor.date_keys_in_month(2026, 3) == {"260305"}
+        assert cursor.date_keys_in_month(2026, 4) == set()
+
+
+class TestSearchCursorApply:
+    """SearchCursor.apply（変更1件の反映）のテスト。"""
+
+    def _cursor(self):
+        a = _make_schedule("260219_0900", title="会議A")
+        b = _make_schedule("260219_1400", title="会議B")
+        c = _make_schedule("260305_1000", title="会議C")
+        return SearchCursor("会議", [c, a, b]), a, b, c
+
+    def _titles(self, cursor):
+        return [s.title for s in cursor.results]
+
+    def test_add_keeps_position(self):
+        cursor, a, b, c = self._cursor()
+        cursor.next()
+        assert cursor.apply(ScheduleAdded(None, _make_schedule("260210_1000", title="会議0")))
+        assert self._titles(cursor) == ["会議0", "会議A", "会議B", "会議C"]
+        assert cursor.current is b
+        assert cursor.date_keys == {"260210", "260219", "260305"}
+
+    def test_non_matching_changes_are_ignored(self):
+        cursor, a, b, c = self._cursor()
+        other = _make_schedule("260219_1000", title="昼食")
+        assert not cursor.apply(ScheduleAdded(None, other))
+        assert len(cursor) == 3
+
+    def test_delete_current_moves_to_next_hit(self):
+        cursor, a, b, c = self._cursor()
+        cursor.next()
+        assert cursor.apply(ScheduleDeleted(b, None))
+        assert self._titles(cursor) == ["会議A", "会議C"]
+        assert cursor.current is c
+        assert cursor.date_keys_in_month(2026, 2) == {"260219"}
+
+    def test_delete_current_last_hit_wraps_to_first(self):
+        cursor, a, b, c = self._cursor()
+        cursor.prev()
+        assert cursor.current is c
+        assert cursor.apply(ScheduleDeleted(c, None))
+        # next と同じく、末尾の次は先頭
+        assert cursor.current is a
+
+    def test_delete_last_hit_of_a_day(self):
+        cursor, a, b, c = self._cursor()
+        cursor.apply(ScheduleDeleted(c, None))
+        assert cursor.date_keys == {"260219"}
+        assert cursor.current is a
+
+    def test_update_moves_and_keeps_current(self):
+        cursor, a, b, c = self._cursor()
+        moved = Schedule(id=a.id, date_time="260401_0900", title="会議A'")
+        assert cursor.apply(ScheduleUpdated(a, moved))
+        assert self._titles(cursor) == ["会議B", "会議C", "会議A'"]
+        assert cursor.current is moved
+        assert cursor.date_keys == {"260219", "260305", "260401"}
+
+    def test_update_that_no_longer_matches(self):
+        cursor, a, b, c = self._cursor()
+        cursor.next()
+        renamed = Schedule(id=b.id, date_time=b.date_time, title="昼食")
+        assert cursor.apply(ScheduleUpdated(b, renamed))
+        assert self._titles(cursor) == ["会議A", "会議C"]
+        assert cursor.current is c
+
+    def test_delete_everything(self):
+        cursor, a, b, c = self._cursor()
+        for s in (a, b, c):
+            cursor.apply(ScheduleDeleted(s, None))
+        assert len(cursor) == 0 and cursor.current is None and cursor.date_keys == set()
+
+
+class TestOccupancyIndex:
+    """OccupancyIndex のテスト。"""
+
+    def test_mask_and_counts(self):
+        index = OccupancyIndex([
+            _make_schedule("260201_0900"),
+            _make_schedule("260219_0900"),
+            _make_schedule("~260219_1400"),
+            _make_schedule("260301_1000"),
+        ])
+        assert index.mask(2026, 2) == (1 << 0) | (1 << 18)
+        counts = index.counts(2026, 2)
+        assert len(counts) == 31
+        assert counts[0] == 1
+        assert counts[18] == 2
+        assert index.count(datetime.date(2026, 3, 1)) == 1
+
+    def test_generation(self):
+        a = OccupancyIndex()
+        b = OccupancyIndex()
+        assert a.generation != b.generation
+        s = _make_schedule("260219_0900")
+        before = a.generation
+        a.add(s)
+        assert a.generation > before
+        before = a.generation
+        a.remove(_make_schedule("260220_0900"))  # 存在しない日の削除は変更なし
+        assert a.generation == before
+        a.remove(s)
+        assert a.generation > before
+
+    def test_empty_month(self):
+        index = OccupancyIndex()
+        assert index.mask(2026, 2) == 0
+        assert index.counts(2026, 2) == [0] * 31
+        assert index.count(datetime.date(2026, 2, 19)) == 0
+
+    def test_add_and_remove(self):
+        index = OccupancyIndex()
+        a = _make_schedule("260219_0900")
+        b = _make_schedule("260219_1400")
+        index.add(a)
+        index.add(b)
+        index.remove(a)
+        assert index.count(datetime.date(2026, 2, 19)) == 1
+        assert index.mask(2026, 2) == 1 << 18
+        index.remove(b)
+        assert index.mask(2026, 2) == 0
+
+    def test_replace_moves_date(self):
+        old = _make_schedule("260219_0900")
+        new = Schedule(id=old.id, date_time="260305_0900", title="移動")
+        index = OccupancyIndex([old])
+        index.replace(old, new)
+        assert index.mask(2026, 2) == 0
+        assert index.count(datetime.date(2026, 3, 5)) == 1
+
+    def test_matches_dates_with_schedules(self):
+        schedules = [
+            _make_schedule("260219_0900"),
+            _make_schedule("260220_1000"),
+            _make_schedule("260331_1000"),
+        ]
+        index = OccupancyIndex(schedules)
+        keys = set()
+        for year, month in [(2026, 2), (2026, 3)]:
+            mask = index.mask(year, month)
+            for day in range(1, 32):
+                if mask >> (day - 1) & 1:
+                    keys.add(f"{year % 100:02d}{month:02d}{day:02d}")
+        assert keys == dates_with_schedules(schedules)
+
+    def test_ignores_malformed_date_time(self):
+        index = OccupancyIndex([_make_schedule("invalid")])
+        index.remove(_make_schedule("invalid"))
+        assert index.mask(2026, 2) == 0
+
+
+def _random_schedules(n: int, seed: int = 0) -> list[Schedule]:
+    rng = random.Random(seed)
+    schedules = []
+    for i in range(n):
+        raw = (
+            f"{rng.choice((24, 25, 26))}{rng.randint(1, 12):02d}"
+            f"{rng.randint(1, 28):02d}_{rng.randint(0, 23):02d}{rng.choice((0, 30)):02d}"
+        )
+        schedules.append(_make_schedule(raw, title=f"予定{i}"))
+    return schedules
+
+
+@pytest.fixture(params=["python", "numpy"])
+def kernel_path(request, monkeypatch):
+    """純 Python 経路と NumPy 経路の両方でテストを実行する。"""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(query_mod, "USE_NUMPY", True)
+    else:
+        monkeypatch.setattr(query_mod, "USE_NUMPY", False)
+    monkeypatch.setattr(query_mod, "NUMPY_MIN_SIZE", 0)
+    return request.param
+
+
+class TestBulkKernels:
+    """一括処理カーネルのテスト（両経路）。"""
+
+    def test_date_range_mask(self, kernel_path):
+        keys = sort_key_column([
+            _make_schedule("260218_2359"),
+            _make_schedule("260219_0000"),
+            _make_schedule("260220_2359"),
+            _make_schedule("260221_0000"),
+        ])
+        mask = date_range_mask(
+            keys, datetime.date(2026, 2, 19), datetime.date(2026, 2, 20)
+        )
+        assert mask == [False, True, True, False]
+
+    def test_day_histogram(self, kernel_path):
+        keys = sort_key_column([
+            _make_schedule("240101_0900"),
+            _make_schedule("240101_1000"),
+            _make_schedule("241231_1000"),
+            _make_schedule("250101_1000"),
+        ])
+        hist = day_histogram(keys, 2024)
+        assert len(hist) == 366
+        assert hist[0] == 2
+        assert hist[365] == 1
+        assert sum(hist) == 3
+
+    def test_occupied_date_keys(self, kernel_path):
+        keys = sort_key_column([
+            _make_schedule("260219_0900"),
+            _make_schedule("260219_1400"),
+            _make_schedule("000105_1000"),
+        ])
+        assert occupied_date_keys(keys) == {"260219", "000105"}
+
+    def test_argsort_is_stable(self, kernel_path):
+        assert argsort_keys([30, 10, 20, 10]) == [1, 3, 2, 0]
+
+    def test_empty_inputs(self, kernel_path):
+        keys = sort_key_column([])
+        d = datetime.date(2026, 2, 19)
+        assert date_range_mask(keys, d, d) == []
+        assert sum(day_histogram(keys, 2026)) == 0
+        assert occupied_date_keys(keys) == set()
+        assert argsort_keys(keys) == []
+
+
+class TestNumpyParity:
+    """NumPy 経路と純 Python 経路の結果が一致することの確認。"""
+
+    def _both(self, monkeypatch, fn):
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(query_mod, "NUMPY_MIN_SIZE", 0)
+        monkeypatch.setattr(query_mod, "USE_NUMPY", False)
+        expected = fn()
+        monkeypatch.setattr(query_mod, "USE_NUMPY", True)
+        return expected, fn()
+
+    def test_parity_on_random_dataset(self, monkeypatch):
+        schedules = _random_schedules(3000)
+        table = ScheduleTable.from_schedules(schedules)
+        keys = sort_key_column(schedules)
+        start, end = datetime.date(2025, 3, 10), datetime.date(2025, 9, 1)
+
+        for fn in (
+            lambda: date_range_mask(keys, start, end),
+            lambda: date_range_mask(table.sort_keys, start, end),
+            lambda: day_histogram(keys, 2024),
+            lambda: day_histogram(keys, 2025),
+            lambda: occupied_date_keys(keys),
+            lambda: dates_with_schedules(table),
+            lambda: argsort_keys(keys),
+        ):
+            expected, actual = self._both(monkeypatch, fn)
+            assert actual == expected
+
+    def test_table_matches_list(self, monkeypatch):
+        schedules = _random_schedules(500)
+        table = ScheduleTable.from_schedules(schedules)
+        expected, actual = self._both(
+            monkeypatch, lambda: dates_with_schedules(table)
+        )
+        assert expected == actual == dates_with_schedules(schedules)
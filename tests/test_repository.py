@@ -0,0 +1,132 @@
+"""ScheduleRepository と変更イベントのテスト。"""
+
+import datetime
+
+import pytest
+
+from db.events import ScheduleAdded, ScheduleDeleted, ScheduleUpdated
+from db.query import filter_by_date
+from db.repository import ScheduleRepository, diff_schedules
+from models.schedule import Schedule
+
+
+def _make_schedule(date_time: str, title: str = "テスト", **kwargs) -> Schedule:
+    return Schedule(date_time=date_time, title=title, **kwargs)
+
+
+@pytest.fixture
+def repo():
+    repo = ScheduleRepository([
+        _make_schedule("260219_1400", title="午後", id="a"),
+        _make_schedule("260219_0900", title="朝", id="b"),
+        _make_schedule("260220_1000", title="翌日", id="c"),
+    ])
+    repo.changes = []
+    repo.subscribe(repo.changes.append)
+    return repo
+
+
+class TestScheduleRepository:
+    """ScheduleRepository のテスト。"""
+
+    def test_for_date_matches_filter_by_date(self, repo):
+        d = datetime.date(2026, 2, 19)
+        assert repo.for_date(d) == filter_by_date(repo.schedules, d)
+        assert [s.title for s in repo.for_date(d)] == ["朝", "午後"]
+        assert repo.for_date(datetime.date(2026, 2, 21)) == []
+
+    def test_add_emits_event(self, repo):
+        s = _make_schedule("260221_0800", id="d")
+        change = repo.add(s)
+        assert isinstance(change, ScheduleAdded)
+        assert repo.changes == [change]
+        assert change.old_date_key is None
+        assert change.new_date_key == "260221"
+        assert repo.get("d") is s
+        assert repo.occupancy.count(datetime.date(2026, 2, 21)) == 1
+
+    def test_add_duplicate_id(self, repo):
+        with pytest.raises(ValueError):
+            repo.add(_make_schedule("260221_0800", id="a"))
+        assert repo.changes == []
+
+    def test_update_moves_date_and_keeps_order(self, repo):
+        moved = _make_schedule("260220_0800", title="移動", id="a")
+        change = repo.update(moved)
+        assert isinstance(change, ScheduleUpdated)
+        assert change.date_keys == {"260219", "260220"}
+        assert change.touches("260219") and not change.touches("260221")
+        assert [s.id for s in repo.schedules] == ["a", "b", "c"]
+        assert [s.title for s in repo.for_date(datetime.date(2026, 2, 20))] == ["移動", "翌日"]
+        assert repo.occupancy.count(datetime.date(2026, 2, 19)) == 1
+
+    def test_delete(self, repo):
+        change = repo.delete("b")
+        assert isinstance(change, ScheduleDeleted)
+        assert change.old.id == "b" and change.new is None
+        assert change.schedule_id == "b"
+        assert "b" not in repo
+        assert len(repo) == 2
+
+    def test_delete_last_of_day(self, repo):
+        repo.delete("c")
+        assert repo.for_date(datetime.date(2026, 2, 20)) == []
+        assert repo.occupancy.mask(2026, 2) == 1 << 18
+
+    def test_unknown_id(self, repo):
+        with pytest.raises(KeyError):
+            repo.delete("zzz")
+        with pytest.raises(KeyError):
+            repo.update(_make_schedule("260219_0900", id="zzz"))
+
+    def test_reset_does_not_emit(self, repo):
+        repo.reset([_make_schedule("260301_0900", id="x")])
+        assert repo.changes == []
+        assert [s.id for s in repo.schedules] == ["x"]
+        assert repo.occupancy.mask(2026, 2) == 0
+
+    def test_unsubscribe(self, repo):
+        repo.unsubscribe(repo.changes.append)
+        repo.delete("a")
+        assert repo.changes == []
+
+
+class TestDiffSchedules:
+    """diff_schedules と apply のテスト。"""
+
+    def test_diff_and_apply(self, repo):
+        incoming = [
+            _make_schedule("260219_1400", title="午後（変更）", id="a"),
+            _make_schedule("260220_1000", title="翌日", id="c"),
+            _make_schedule("260301_0900", title="新規", id="d"),
+        ]
+        incoming[0].created_at = repo.get("a").created_at
+        incoming[1].created_at = repo.get("c").created_at
+        changes = diff_schedules(repo.schedules, incoming)
+        assert sorted((c.kind, c.schedule_id) for c in changes) == [
+            ("added", "d"), ("deleted", "b"), ("updated", "a"),
+        ]
+        for change in changes:
+            repo.apply(change)
+        assert len(repo.changes) == 3
+        assert {s.id: s for s in repo.schedules} == {s.id: s for s in incoming}
+
+    def test_reused_id_is_delete_and_add(self, repo):
+        replaced = _make_schedule("260219_1400", id="a", created_at="260101_0000")
+        current = [s for s in repo.schedules if s.id == "a"]
+        changes = diff_schedules(current, [replaced])
+        assert [c.kind for c in changes] == ["deleted", "added"]
+
+    def test_no_changes(self, repo):
+        assert diff_schedules(repo.schedules, list(repo.schedules)) == []
+
+    def test_revision(self, repo):
+        revision = repo.revision
+        repo.delete("a")
+        assert repo.revision > revision
+
+    def test_between_and_search(self, repo):
+        start, end = datetime.date(2026, 2, 19), datetime.date(2026, 2, 20)
+        assert [s.id for s in repo.between(start, end)] == ["b", "a", "c"]
+        assert [s.id for s in repo.between(end, end)] == ["c"]
+        assert [s.id for s in repo.search("朝")] == ["b"]
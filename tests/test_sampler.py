@@ -0,0 +1,71 @@
+"""サンプリングプロファイラのテスト。"""
+
+import threading
+import time
+
+import pytest
+
+from utils.sampler import StackSampler
+
+
+def _busy_marker(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestStackSampler:
+    """StackSampler のテスト。"""
+
+    def test_invalid_hz(self):
+        with pytest.raises(ValueError):
+            StackSampler(hz=0)
+
+    def test_sample_once_collapses_current_stack(self, tmp_path):
+        sampler = StackSampler(out_dir=tmp_path)
+        sampler.sample_once()
+        assert sampler.samples == 1
+        stacks = list(sampler.stacks)
+        mine = [s for s in stacks if "test_sample_once_collapses_current_stack" in s]
+        assert len(mine) == 1
+        assert mine[0].startswith("MainThread;")
+        assert "(tests/test_sampler.py:" in mine[0]
+
+    def test_background_sampling_writes_collapsed_file(self, tmp_path):
+        stop = threading.Event()
+        worker = threading.Thread(target=_busy_marker, args=(stop,), name="busy")
+        worker.start()
+        sampler = StackSampler(hz=200, out_dir=tmp_path)
+        try:
+            sampler.start()
+            assert sampler.running
+            time.sleep(0.2)
+            path = sampler.stop()
+        finally:
+            stop.set()
+            worker.join()
+
+        assert not sampler.running
+        assert path is not None and path.parent == tmp_path
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert lines
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) > 0
+        assert any(l.startswith("busy;") and "_busy_marker" in l for l in lines)
+        # サンプラー自身のスレッドは含めない
+        assert not any(l.startswith("stack-sampler;") for l in lines)
+
+    def test_toggle(self, tmp_path):
+        sampler = StackSampler(hz=200, out_dir=tmp_path)
+        assert sampler.toggle() is None
+        assert sampler.running
+        time.sleep(0.05)
+        first = sampler.toggle()
+        assert not sampler.running
+        sampler.toggle()
+        time.sleep(0.05)
+        second = sampler.toggle()
+        assert first is not None and second is not None and first != second
+
+    def test_stop_without_start(self, tmp_path):
+        assert StackSampler(out_dir=tmp_path).stop() is None
@@ -0,0 +1,152 @@
+"""ScheduleTable のテスト。"""
+
+import datetime
+import pytest
+
+from models.schedule import Schedule
+from models.schedule_table import ScheduleTable
+
+
+def _records() -> list[dict]:
+    return [
+        {
+            "id": "ccc33333",
+            "date_time": "260220_1000",
+            "date_time_type": "exact",
+            "title": "別の日",
+            "memo": "",
+            "created_at": "260218_0900",
+        },
+        {
+            "id": "aaa11111",
+            "date_time": "260219_1400~",
+            "date_time_type": "from",
+            "title": "午後作業",
+            "memo": "コーディング",
+            "created_at": "260218_0900",
+        },
+        {
+            "id": "bbb22222",
+            "date_time": "~260219_0900",
+            "date_time_type": "until",
+            "title": "朝会",
+            "memo": "",
+            "created_at": "260218_1000",
+        },
+    ]
+
+
+class TestBuild:
+    """一括構築のテスト。"""
+
+    def test_from_dicts_sorted_by_datetime(self):
+        table = ScheduleTable.from_dicts(_records())
+        assert len(table) == 3
+        assert [r.id for r in table] == ["bbb22222", "aaa11111", "ccc33333"]
+        assert list(table.sort_keys) == sorted(table.sort_keys)
+
+    def test_from_schedules_matches_from_dicts(self):
+        schedules = [Schedule.from_dict(d) for d in _records()]
+        a = ScheduleTable.from_schedules(schedules)
+        b = ScheduleTable.from_dicts(_records())
+        assert [r.to_dict() for r in a] == [r.to_dict() for r in b]
+
+    def test_empty(self):
+        table = ScheduleTable.from_dicts([])
+        assert len(table) == 0
+        assert table.filter_by_date(datetime.date(2026, 2, 19)) == []
+
+    def test_invalid_date_time_raises(self):
+        with pytest.raises(ValueError):
+            ScheduleTable.from_dicts([{"id": "x", "date_time": "invalid"}])
+
+    def test_unknown_date_time_type_raises(self):
+        record = {"id": "x", "date_time": "260219_0900", "date_time_type": "around"}
+        with pytest.raises(ValueError):
+            ScheduleTable.from_dicts([record])
+        with pytest.raises(ValueError):
+            ScheduleTable.from_schedules([Schedule.from_dict(record)])
+
+    def test_mismatched_tilde_roundtrips(self):
+        # ~ の位置と date_time_type が食い違うレコードもそのまま復元する
+        records = [
+            {"id": "a", "date_time": "~260219_0900", "date_time_type": "exact"},
+            {"id": "b", "date_time": "260219_1000", "date_time_type": "from"},
+            {"id": "c", "date_time": "260219_1100~", "date_time_type": "until"},
+        ]
+        for table in (
+            ScheduleTable.from_dicts(records),
+            ScheduleTable.from_schedules(Schedule.from_dict(d) for d in records),
+        ):
+            assert [(r.date_time, r.date_time_type) for r in table] == [
+                (d["date_time"], d["date_time_type"]) for d in records
+            ]
+
+
+class TestScheduleRow:
+    """ScheduleRow のテスト。"""
+
+    def test_behaves_like_schedule(self):
+        table = ScheduleTable.from_dicts(_records())
+        row = table[1]
+        original = Schedule.from_dict(_records()[1])
+        assert row.id == original.id
+        assert row.date_time == original.date_time
+        assert row.date_time_type == original.date_time_type
+        assert row.title == original.title
+        assert row.memo == original.memo
+        assert row.created_at == original.created_at
+        assert row.date_key == original.date_key
+        assert row.parsed_datetime == original.parsed_datetime
+
+    def test_to_schedule_roundtrip(self):
+        table = ScheduleTable.from_dicts(_records())
+        for row in table:
+            assert row.to_schedule().to_dict() == row.to_dict()
+
+    def test_negative_index(self):
+        table = ScheduleTable.from_dicts(_records())
+        assert table[-1].id == "ccc33333"
+
+    def test_index_out_of_range(self):
+        table = ScheduleTable.from_dicts(_records())
+        with pytest.raises(IndexError):
+            table[3]
+
+
+class TestRangeFilter:
+    """日付範囲抽出のテスト。"""
+
+    def test_filter_by_date(self):
+        table = ScheduleTable.from_dicts(_records())
+        result = table.filter_by_date(datetime.date(2026, 2, 19))
+        assert [r.title for r in result] == ["朝会", "午後作業"]
+
+    def test_filter_date_range_inclusive(self):
+        table = ScheduleTable.from_dicts(_records())
+        result = table.filter_date_range(
+            datetime.date(2026, 2, 19), datetime.date(2026, 2, 20)
+        )
+        assert len(result) == 3
+
+    def test_filter_no_match(self):
+        table = ScheduleTable.from_dicts(_records())
+        assert table.filter_by_date(datetime.date(2026, 2, 21)) == []
+
+    def test_reversed_range_is_empty(self):
+        table = ScheduleTable.from_dicts(_records())
+        result = table.filter_date_range(
+            datetime.date(2026, 2, 20), datetime.date(2026, 2, 19)
+        )
+        assert result == []
+
+    def test_month_boundary(self):
+        records = [
+            {"id": "a", "date_time": "260131_2359", "title": "月末"},
+            {"id": "b", "date_time": "260201_0000", "title": "月初"},
+        ]
+        table = ScheduleTable.from_dicts(records)
+        result = table.filter_date_range(
+            datetime.date(2026, 2, 1), datetime.date(2026, 2, 28)
+        )
+        assert [r.title for r in result] == ["月初"]
@@ -2,7 +2,7 @@
 
 import pytest
 
-from db.schema import validate_schedule
+from db.schema import validate_records, validate_schedule
 
 
 class TestValidateSchedule:
@@ -112,3 +112,44 @@ class TestValidateSchedule:
         }
         errors = validate_schedule(data)
         assert len(errors) == 3
+
+
+class TestValidateRecords:
+    """validate_records（読み込み時の一括検証）のテスト。"""
+
+    @pytest.mark.parametrize("date_time", [
+        "260219_1430", "~260219_1430", "260219_1430~", " 260219_1430 ", "240229_0000",
+        "260229_1200", "260219_2400", "260219_1460", "261319_1000", "260100_1000",
+        "~260219_1430~", "260219-1430", "2602191430", "", "  ",
+    ])
+    def test_agrees_with_validate_schedule(self, date_time):
+        record = {"title": "会議", "date_time": date_time}
+        expected = validate_schedule(record)
+        result = validate_records([record])
+        assert bool(result) == bool(expected)
+        if expected:
+            assert result == [(0, expected)]
+
+    def test_returns_positions_of_invalid_records(self):
+        records = [
+            {"title": "会議", "date_time": "260219_1430"},
+            {"title": "", "date_time": "260219_1430"},
+            {"title": "会議", "date_time": "260219_1430", "date_time_type": "sometimes"},
+            {"id": "a", "date_time": "260219_1430", "date_time_type": "exact",
+             "title": "全項目", "memo": "", "created_at": ""},
+        ]
+        assert validate_records(records) == [
+            (1, ["タイトルは必須です"]),
+            (2, ["不正な date_time_type: sometimes"]),
+        ]
+
+    def test_rejects_wrong_types(self):
+        records = [["会議"], {"title": "会議", "date_time": "260219_1430", "memo": None}]
+        assert validate_records(records) == [
+            (0, ["レコードがオブジェクトではありません"]),
+            (1, ["memo は文字列で指定してください"]),
+        ]
+
+    def test_rejects_full_width_digits(self):
+        result = validate_records([{"title": "会議", "date_time": "２６0219_1430"}])
+        assert len(result) == 1 and "半角" in result[0][1][0]
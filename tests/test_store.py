@@ -1,11 +1,33 @@
 """store モジュールのテスト。"""
 
+import asyncio
 import json
+import multiprocessing
 import pytest
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from models.schedule import Schedule
-from db.store import load_schedules, save_schedules, load_config, save_config
+from db.store import (
+    LoadReport,
+    VersionConflict,
+    aload_config,
+    aload_schedules,
+    aload_schedules_versioned,
+    asave_config,
+    asave_merged,
+    asave_schedules,
+    load_config,
+    load_schedule_table,
+    load_schedules,
+    load_schedules_versioned,
+    merge_schedules,
+    quarantine_path,
+    save_config,
+    save_merged,
+    save_schedules,
+)
+from db.watcher import file_signature
 
 
 @pytest.fixture
@@ -81,6 +103,66 @@ class TestLoadSchedules:
         assert len(result) == 2
 
 
+class TestQuarantine:
+    """読み込み時の検証と不正なレコードの隔離のテスト。"""
+
+    def _write(self, schedule_file, records):
+        payload = {"version": 3, "schedules": records}
+        schedule_file.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+    def _records(self):
+        return [
+            {"id": "ok1", "date_time": "260219_0900", "title": "朝会"},
+            {"id": "bad", "date_time": "2602190900", "title": "壊れた日時"},
+            {"id": "ok2", "date_time": "260219_1400", "title": "午後作業"},
+            {"id": "none", "date_time": "260219_1500", "title": ""},
+        ]
+
+    def test_invalid_records_are_quarantined(self, tmp_data_dir):
+        _, schedule_file, _ = tmp_data_dir
+        self._write(schedule_file, self._records())
+        report = LoadReport()
+        schedules, version = load_schedules_versioned(report)
+        assert [s.id for s in schedules] == ["ok1", "ok2"]
+        assert version == 3
+        assert report.quarantined == 2
+        assert set(report.timings) == {"read", "validate", "decode"}
+
+        entries = json.loads(quarantine_path().read_text(encoding="utf-8"))["records"]
+        assert [(e["index"], e["record"]["id"]) for e in entries] == [(1, "bad"), (3, "none")]
+        assert "フォーマット" in entries[0]["errors"][0]
+        assert entries[0]["source"] == "schedules.json"
+
+    def test_quarantine_is_not_duplicated(self, tmp_data_dir):
+        _, schedule_file, _ = tmp_data_dir
+        self._write(schedule_file, self._records())
+        load_schedules()
+        load_schedules()
+        entries = json.loads(quarantine_path().read_text(encoding="utf-8"))["records"]
+        assert len(entries) == 2
+
+    def test_saving_drops_quarantined_records(self, tmp_data_dir):
+        _, schedule_file, _ = tmp_data_dir
+        self._write(schedule_file, self._records())
+        schedules, version = load_schedules_versioned()
+        save_schedules(schedules, expected_version=version)
+        report = LoadReport()
+        assert [s.id for s in load_schedules_versioned(report)[0]] == ["ok1", "ok2"]
+        assert report.quarantined == 0
+
+    def test_valid_file_creates_no_quarantine(self, tmp_data_dir):
+        save_schedules([Schedule(id="a", date_time="260219_0900", title="会議")])
+        assert len(load_schedules()) == 1
+        assert not quarantine_path().exists()
+
+    def test_async_load_reports(self, tmp_data_dir):
+        _, schedule_file, _ = tmp_data_dir
+        self._write(schedule_file, self._records())
+        report = LoadReport()
+        schedules, _ = asyncio.run(aload_schedules_versioned(report=report))
+        assert len(schedules) == 2 and report.quarantined == 2
+
+
 class TestSaveSchedules:
     """save_schedules のテスト。"""
 
@@ -137,6 +219,25 @@ class TestSaveSchedules:
         assert loaded[0].date_time_type == original[0].date_time_type
 
 
+class TestLoadScheduleTable:
+    """load_schedule_table のテスト。"""
+
+    def test_empty_when_no_file(self, tmp_data_dir):
+        assert len(load_schedule_table()) == 0
+
+    def test_matches_load_schedules(self, tmp_data_dir):
+        save_schedules([
+            Schedule(id="second22", date_time="260219_1400", title="次"),
+            Schedule(id="first111", date_time="~260219_0900",
+                     date_time_type="until", title="最初"),
+        ])
+        table = load_schedule_table()
+        assert [r.id for r in table] == ["first111", "second22"]
+        by_id = {s.id: s.to_dict() for s in load_schedules()}
+        for row in table:
+            assert row.to_dict() == by_id[row.id]
+
+
 class TestConfig:
     """config 読み書きのテスト。"""
 
@@ -155,3 +256,299 @@ class TestConfig:
         save_config({"key": "value2"})
         loaded = load_config()
         assert loaded["key"] == "value2"
+
+
+def _append_many(args):
+    """別プロセスから save_merged で1件ずつ追加する（並行書き込みのテスト用）。"""
+    data_dir, prefix, n = args
+    import db.store as store_mod
+
+    store_mod.DATA_DIR = data_dir
+    store_mod.SCHEDULE_FILE = data_dir / "schedules.json"
+    for i in range(n):
+        base, version = store_mod.load_schedules_versioned()
+        ours = base + [Schedule(id=f"{prefix}{i}", date_time="260219_0900", title="並行")]
+        store_mod.save_merged(base, ours, version)
+
+
+class TestVersionedSave:
+    """version 付き保存（compare-and-swap とマージ）のテスト。"""
+
+    def test_version_increments(self, tmp_data_dir):
+        _, schedule_file, _ = tmp_data_dir
+        assert load_schedules_versioned() == ([], 0)
+        assert save_schedules([Schedule(id="a", date_time="260219_0900")]) == 1
+        assert save_schedules([]) == 2
+        data = json.loads(schedule_file.read_text(encoding="utf-8"))
+        assert data["version"] == 2
+
+    def test_file_without_version(self, tmp_data_dir):
+        _, schedule_file, _ = tmp_data_dir
+        schedule_file.write_text('{"schedules": []}', encoding="utf-8")
+        assert load_schedules_versioned() == ([], 0)
+        assert save_schedules([], expected_version=0) == 1
+
+    def test_version_after_schedules(self, tmp_data_dir):
+        _, schedule_file, _ = tmp_data_dir
+        schedule_file.write_text('{"schedules": [], "version": 7}', encoding="utf-8")
+        with pytest.raises(VersionConflict):
+            save_schedules([], expected_version=0)
+        assert save_schedules([], expected_version=7) == 8
+
+    @pytest.mark.parametrize("codec", ["none", "gzip", "zlib", "lzma"])
+    def test_save_reads_only_version(self, tmp_data_dir, monkeypatch, codec):
+        import db.store as store_mod
+
+        monkeypatch.setattr(store_mod, "COMPRESSION", codec)
+        save_schedules([Schedule(id="a", date_time="260219_0900", title="A")] * 100)
+
+        def fail(*args):
+            raise AssertionError("全体を読み込んだ")
+
+        monkeypatch.setattr(store_mod, "_read_payload", fail)
+        assert save_schedules([], expected_version=1) == 2
+        with pytest.raises(VersionConflict):
+            save_schedules([], expected_version=1)
+
+    def test_compare_and_swap(self, tmp_data_dir):
+        save_schedules([])
+        with pytest.raises(VersionConflict) as exc:
+            save_schedules([], expected_version=0)
+        assert (exc.value.expected, exc.value.actual) == (0, 1)
+        assert save_schedules([], expected_version=1) == 2
+
+    def test_no_temp_file_left(self, tmp_data_dir):
+        data_dir, _, _ = tmp_data_dir
+        save_schedules([Schedule(id="a", date_time="260219_0900")])
+        assert not (data_dir / "schedules.json.tmp").exists()
+
+    def test_merge_non_overlapping(self, tmp_data_dir):
+        a = Schedule(id="a", date_time="260219_0900", title="A")
+        b = Schedule(id="b", date_time="260219_1000", title="B")
+        save_schedules([a, b])
+        base, version = load_schedules_versioned()
+
+        # 他のインスタンスが b を編集して先に保存する
+        theirs = [a, Schedule(**{**b.to_dict(), "title": "B（他）"})]
+        save_schedules(theirs)
+
+        # こちらは a を削除し c を追加
+        c = Schedule(id="c", date_time="260220_0900", title="C")
+        result = save_merged(base, [b, c], version)
+        assert result.merged
+        assert result.version == 3
+        assert [(s.id, s.title) for s in load_schedules()] == [("b", "B（他）"), ("c", "C")]
+
+    def test_conflict_takes_theirs_and_keeps_other_edits(self, tmp_data_dir):
+        a = Schedule(id="a", date_time="260219_0900", title="A")
+        b = Schedule(id="b", date_time="260219_1000", title="B")
+        save_schedules([a, b])
+        base, version = load_schedules_versioned()
+        save_schedules([Schedule(**{**a.to_dict(), "title": "他"}), b])
+        result = save_merged(
+            base,
+            [
+                Schedule(**{**a.to_dict(), "title": "こちら"}),
+                Schedule(**{**b.to_dict(), "title": "B（こちら）"}),
+            ],
+            version,
+        )
+        assert result.conflicts == ["a"] and result.merged and result.version == 3
+        assert [s.title for s in result.schedules] == ["他", "B（こちら）"]
+        assert load_schedules_versioned() == (result.schedules, 3)
+
+    def test_known_signature_skips_reread(self, tmp_data_dir, monkeypatch):
+        import db.store as store_mod
+
+        save_schedules([])
+        base, version = load_schedules_versioned()
+        signature = file_signature(store_mod.SCHEDULE_FILE)
+        monkeypatch.setattr(store_mod, "_read_payload", lambda: pytest.fail("読み直した"))
+        result = save_merged(base, [], version, signature)
+        assert result.version == 2 and not result.merged
+
+    def test_concurrent_processes(self, tmp_data_dir):
+        data_dir, _, _ = tmp_data_dir
+        save_schedules([])
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=2, mp_context=ctx) as pool:
+            list(pool.map(_append_many, [(data_dir, "p", 15), (data_dir, "q", 15)]))
+        schedules, version = load_schedules_versioned()
+        assert len({s.id for s in schedules}) == 30
+        assert version == 31
+
+
+class TestCompression:
+    """圧縮したデータファイル（config.json の compression）のテスト。"""
+
+    @pytest.fixture
+    def compression(self, tmp_data_dir, monkeypatch):
+        import db.store as store_mod
+
+        monkeypatch.setattr(store_mod, "COMPRESSION", "none")
+
+        def configure(codec):
+            return store_mod.configure_compression({"compression": codec})
+
+        return configure
+
+    def _schedules(self, n=20):
+        return [
+            Schedule(id=f"s{i}", date_time=f"2603{i % 28 + 1:02d}_0900", title=f"予定{i}")
+            for i in range(n)
+        ]
+
+    @pytest.mark.parametrize("codec", ["gzip", "zlib", "lzma"])
+    def test_roundtrip(self, tmp_data_dir, compression, codec):
+        from db import codecs
+
+        _, schedule_file, _ = tmp_data_dir
+        compression(codec)
+        save_schedules(self._schedules())
+        raw = schedule_file.read_bytes()
+        assert codecs.detect(raw[:codecs.HEADER_SIZE]) == codec
+        assert load_schedules() == self._schedules()
+        assert load_schedules_versioned()[1] == 1
+        assert len(load_schedule_table()) == 20
+        # 空白を省いた JSON
+        with open(schedule_file, "rb") as f:
+            assert b'"schedules":[{"id":"s0"' in codecs.read_all(f, codec)
+
+    def test_switching_codec_keeps_data_readable(self, tmp_data_dir, compression):
+        _, schedule_file, _ = tmp_data_dir
+        save_schedules(self._schedules(3))
+        compression("lzma")
+        save_schedules(self._schedules(5), expected_version=1)
+        # バックアップは置き換え前のファイル（非圧縮）そのもの
+        bak = schedule_file.with_suffix(".json.bak")
+        assert len(json.loads(bak.read_text(encoding="utf-8"))["schedules"]) == 3
+        compression("none")
+        save_schedules(self._schedules(4), expected_version=2)
+        assert len(load_schedules()) == 4
+        assert schedule_file.read_bytes().startswith(b"{")
+
+    def test_empty(self, tmp_data_dir, compression):
+        compression("gzip")
+        save_schedules([])
+        assert load_schedules_versioned() == ([], 1)
+
+    def test_async_progress(self, tmp_data_dir, compression, monkeypatch):
+        import db.store as store_mod
+
+        monkeypatch.setattr(store_mod, "_RECORD_CHUNK", 4)
+        compression("zlib")
+        events = []
+
+        async def main():
+            await asave_schedules(self._schedules(), progress=lambda *e: events.append(e))
+            return await aload_schedules(progress=lambda *e: events.append(e))
+
+        assert asyncio.run(main()) == self._schedules()
+        assert ("write", 20, 20) in events
+        assert [e for e in events if e[0] == "write"][0] == ("write", 4, 20)
+
+    def test_invalid_codec(self, compression):
+        with pytest.raises(ValueError):
+            compression("brotli")
+
+    def test_corrupted_file(self, tmp_data_dir, compression):
+        _, schedule_file, _ = tmp_data_dir
+        compression("gzip")
+        save_schedules(self._schedules())
+        schedule_file.write_bytes(schedule_file.read_bytes()[:30])
+        with pytest.raises(ValueError):
+            load_schedules()
+
+
+class TestMergeSchedules:
+    """merge_schedules のテスト。"""
+
+    def test_both_deleted(self):
+        a = Schedule(id="a", date_time="260219_0900")
+        assert merge_schedules([a], [], []) == ([], [])
+
+    def test_same_change_on_both_sides(self):
+        a = Schedule(id="a", date_time="260219_0900", title="A")
+        edited = Schedule(**{**a.to_dict(), "title": "同じ"})
+        assert merge_schedules([a], [edited], [edited]) == ([edited], [])
+
+    def test_delete_vs_edit_conflicts(self):
+        a = Schedule(id="a", date_time="260219_0900", title="A")
+        edited = Schedule(**{**a.to_dict(), "title": "編集"})
+        assert merge_schedules([a], [], [edited]) == ([edited], ["a"])
+
+
+class TestAsyncStore:
+    """asyncio 版の読み書き（進捗・中断）のテスト。"""
+
+    @pytest.fixture
+    def small_chunks(self, monkeypatch):
+        import db.store as store_mod
+
+        monkeypatch.setattr(store_mod, "_IO_CHUNK", 256)
+        monkeypatch.setattr(store_mod, "_RECORD_CHUNK", 4)
+
+    def _schedules(self, n: int = 10) -> list[Schedule]:
+        return [
+            Schedule(id=f"s{i}", date_time=f"2603{i + 1:02d}_0900", title=f"予定{i}")
+            for i in range(n)
+        ]
+
+    def test_roundtrip_with_progress(self, tmp_data_dir, small_chunks):
+        events = []
+
+        async def main():
+            version = await asave_schedules(
+                self._schedules(), progress=lambda *e: events.append(e)
+            )
+            loaded = await aload_schedules_versioned(progress=lambda *e: events.append(e))
+            return version, loaded
+
+        version, (loaded, loaded_version) = asyncio.run(main())
+        assert version == loaded_version == 1
+        assert loaded == self._schedules() == load_schedules()
+        phases = [phase for phase, _, _ in events]
+        assert phases.index("encode") < phases.index("write") < phases.index("read")
+        assert phases[-1] == "decode"
+        assert ("decode", 10, 10) in events
+        assert all(0 < done <= total for _, done, total in events)
+
+    def test_asave_merged(self, tmp_data_dir):
+        base = self._schedules(2)
+        save_schedules(base)
+        theirs = base + [Schedule(id="t", date_time="260401_0900", title="追加")]
+        save_schedules(theirs)
+        ours = base[:1]
+        result = asyncio.run(asave_merged(base, ours, 1))
+        assert result.merged and result.version == 3
+        assert [s.id for s in load_schedules()] == ["s0", "t"]
+
+    def test_config(self, tmp_data_dir):
+        asyncio.run(asave_config({"theme": "dark"}))
+        assert asyncio.run(aload_config()) == {"theme": "dark"}
+
+    def test_cancel_before_replace_keeps_file(self, tmp_data_dir, small_chunks):
+        import db.store as store_mod
+
+        _, schedule_file, _ = tmp_data_dir
+        save_schedules(self._schedules(2))
+        before = schedule_file.read_bytes()
+        job = store_mod._Job(
+            lambda phase, done, total: job.cancel() if phase == "write" else None
+        )
+        with pytest.raises(store_mod._Cancelled):
+            store_mod._save(self._schedules(), None, job)
+        assert schedule_file.read_bytes() == before
+        assert not schedule_file.with_suffix(".json.tmp").exists()
+
+    def test_task_cancellation(self, tmp_data_dir, small_chunks):
+        save_schedules(self._schedules(200))
+
+        async def main():
+            task = asyncio.create_task(aload_schedules())
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
@@ -0,0 +1,105 @@
+"""入力トレースの記録・読み込みのテスト。"""
+
+import datetime
+import hashlib
+import json
+
+import pytest
+from textual import events
+
+from benchmarks.replay_trace import event_label, summarize
+from utils.trace import (
+    TRACE_VERSION,
+    TraceRecorder,
+    dataset_fingerprint,
+    event_to_record,
+    read_trace,
+    record_to_event,
+)
+
+
+class TestEventConversion:
+    """event_to_record / record_to_event のテスト。"""
+
+    def test_key_roundtrip(self):
+        record = event_to_record(events.Key("greater_than_sign", ">"))
+        assert record == {"type": "key", "key": "greater_than_sign", "character": ">"}
+        event = record_to_event(record)
+        assert isinstance(event, events.Key)
+        assert (event.key, event.character) == ("greater_than_sign", ">")
+
+    def test_mouse_roundtrip(self):
+        down = events.MouseDown(None, 12, 7, 0, 0, 1, False, False, True, screen_x=12, screen_y=7)
+        record = event_to_record(down)
+        assert record["type"] == "mouse_down"
+        assert (record["x"], record["y"], record["button"], record["ctrl"]) == (12, 7, 1, True)
+        event = record_to_event(record)
+        assert isinstance(event, events.MouseDown)
+        assert (event.screen_x, event.screen_y, event.button, event.ctrl) == (12, 7, 1, True)
+
+    def test_mouse_move_ignored(self):
+        move = events.MouseMove(None, 1, 1, 0, 0, 0, False, False, False)
+        assert event_to_record(move) is None
+
+    def test_unknown_record(self):
+        with pytest.raises(ValueError):
+            record_to_event({"type": "resize"})
+
+
+class TestTraceRecorder:
+    """TraceRecorder / read_trace のテスト。"""
+
+    def test_fingerprint(self, tmp_path):
+        data = tmp_path / "schedules.json"
+        data.write_bytes(b'{"schedules": []}')
+        fp = dataset_fingerprint(data)
+        assert fp["bytes"] == 17
+        assert fp["sha256"] == hashlib.sha256(b'{"schedules": []}').hexdigest()
+        assert dataset_fingerprint(tmp_path / "missing.json")["sha256"] is None
+
+    def test_record_and_read(self, tmp_path):
+        data = tmp_path / "schedules.json"
+        data.write_text('{"schedules": []}', encoding="utf-8")
+        recorder = TraceRecorder(tmp_path / "trace.jsonl")
+        recorder.begin((120, 40), datetime.date(2026, 2, 19), data)
+        recorder.record(events.Key("a", "a"))
+        recorder.record(events.MouseMove(None, 1, 1, 0, 0, 0, False, False, False))
+        recorder.record(events.Key("greater_than_sign", ">"))
+        recorder.close()
+
+        header, records = read_trace(tmp_path / "trace.jsonl")
+        assert header["version"] == TRACE_VERSION
+        assert header["size"] == [120, 40]
+        assert header["start_date"] == "2026-02-19"
+        assert header["dataset"] == dataset_fingerprint(data)
+        assert recorder.events == 2
+        assert [r["key"] for r in records] == ["a", "greater_than_sign"]
+        assert records[0]["t"] <= records[1]["t"]
+
+    def test_read_without_header(self, tmp_path):
+        path = tmp_path / "trace.jsonl"
+        path.write_text(json.dumps({"type": "key", "t": 0, "key": "a"}) + "\n")
+        with pytest.raises(ValueError):
+            read_trace(path)
+
+    def test_read_unsupported_version(self, tmp_path):
+        path = tmp_path / "trace.jsonl"
+        path.write_text(json.dumps({"type": "header", "version": 999}) + "\n")
+        with pytest.raises(ValueError):
+            read_trace(path)
+
+
+class TestReplaySummary:
+    """再生結果の集計のテスト。"""
+
+    def test_summarize_by_label(self):
+        results = [
+            {"label": event_label({"type": "key", "key": "greater_than_sign"}), "latency_s": 0.1},
+            {"label": event_label({"type": "key", "key": "greater_than_sign"}), "latency_s": 0.3},
+            {"label": event_label({"type": "mouse_down"}), "latency_s": 0.2},
+        ]
+        summary = {s["label"]: s for s in summarize(results)}
+        assert summary["key:greater_than_sign"]["count"] == 2
+        assert summary["key:greater_than_sign"]["max_s"] == 0.3
+        assert summary["mouse_down"]["p50_s"] == 0.2
+        assert summary["(all)"]["count"] == 3
@@ -0,0 +1,49 @@
+"""データファイル監視のテスト。"""
+
+import os
+
+from db.watcher import FileWatcher, file_signature
+
+
+class TestFileWatcher:
+    """FileWatcher のテスト。"""
+
+    def test_missing_file(self, tmp_path):
+        path = tmp_path / "schedules.json"
+        assert file_signature(path) is None
+        watcher = FileWatcher(path)
+        assert not watcher.changed()
+        path.write_text("{}", encoding="utf-8")
+        assert watcher.changed()
+
+    def test_detects_same_size_rewrite(self, tmp_path):
+        path = tmp_path / "schedules.json"
+        path.write_text("aaaa", encoding="utf-8")
+        watcher = FileWatcher(path)
+        path.write_text("bbbb", encoding="utf-8")
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000))
+        assert watcher.changed()
+        watcher.mark_synced()
+        assert not watcher.changed()
+
+    def test_detects_atomic_replace(self, tmp_path):
+        path = tmp_path / "schedules.json"
+        path.write_text("aaaa", encoding="utf-8")
+        st = os.stat(path)
+        watcher = FileWatcher(path)
+        tmp = tmp_path / "schedules.json.tmp"
+        tmp.write_text("aaaa", encoding="utf-8")
+        os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(tmp, path)
+        assert watcher.signature().inode != watcher.synced.inode
+        assert watcher.changed()
+
+    def test_mark_synced_with_signature(self, tmp_path):
+        path = tmp_path / "schedules.json"
+        path.write_text("aaaa", encoding="utf-8")
+        watcher = FileWatcher(path)
+        before = watcher.signature()
+        path.write_text("bbbbbb", encoding="utf-8")
+        watcher.mark_synced(before)
+        assert watcher.changed()
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import calendar
 import datetime
 
 from textual.app import ComposeResult
@@ -11,6 +10,24 @@ from textual.message import Message
 from textual.reactive import reactive
 from textual.widget import Widget
 from textual.widgets import Button, Label, Static
+from textual.worker import get_current_worker
+
+from db.events import ScheduleChange
+from db.query import OccupancyIndex, SearchCursor
+from ui.month_model import MonthModelCache
+from utils import perf
+from utils.datetime_util import month_key, shift_month
+
+
+def density_marker(count: int) -> str:
+    """件数に応じた密度マーカーを返す（1件 / 2〜4件 / 5件以上）。"""
+    if count <= 0:
+        return "  "
+    if count == 1:
+        return " ○"
+    if count <= 4:
+        return " ◎"
+    return " ●"
 
 
 class DayCell(Static):
@@ -29,35 +46,61 @@ class DayCell(Static):
         day: int,
         date: datetime.date,
         is_today: bool = False,
-        has_schedule: bool = False,
+        schedule_count: int = 0,
         is_selected: bool = False,
         is_other_month: bool = False,
+        is_search_hit: bool = False,
     ) -> None:
         super().__init__()
         self.day = day
         self.date = date
         self.is_today = is_today
-        self.has_schedule = has_schedule
+        self.schedule_count = schedule_count
         self.is_selected = is_selected
         self.is_other_month = is_other_month
+        self.is_search_hit = is_search_hit
+
+    @property
+    def has_schedule(self) -> bool:
+        return self.schedule_count > 0
 
     def render(self) -> str:
         if self.day == 0:
             return "    "
-        marker = " ●" if self.has_schedule else "  "
-        return f"{self.day:>2}{marker}"
+        return f"{self.day:>2}{density_marker(self.schedule_count)}"
 
     def on_mount(self) -> None:
         self._apply_styles()
 
+    def update_state(
+        self,
+        *,
+        schedule_count: int | None = None,
+        is_selected: bool | None = None,
+        is_search_hit: bool | None = None,
+    ) -> None:
+        """指定した状態だけを変更して再描画する（セルは作り直さない）。"""
+        if schedule_count is not None:
+            self.schedule_count = schedule_count
+        if is_selected is not None:
+            self.is_selected = is_selected
+        if is_search_hit is not None:
+            self.is_search_hit = is_search_hit
+        self._apply_styles()
+        self.refresh()
+
     def _apply_styles(self) -> None:
-        self.remove_class("today", "selected", "has-schedule", "other-month")
+        self.remove_class(
+            "today", "selected", "has-schedule", "other-month", "search-hit"
+        )
         if self.is_other_month:
             self.add_class("other-month")
         if self.is_today:
             self.add_class("today")
         if self.has_schedule:
             self.add_class("has-schedule")
+        if self.is_search_hit:
+            self.add_class("search-hit")
         if self.is_selected:
             self.add_class("selected")
 
@@ -92,11 +135,21 @@ class CalendarView(Widget):
 
     def __init__(
         self,
-        schedule_dates: set[str] | None = None,
+        occupancy: OccupancyIndex | None = None,
         **kwargs,
     ) -> None:
         super().__init__(**kwargs)
-        self.schedule_dates: set[str] = schedule_dates or set()
+        self.occupancy: OccupancyIndex = occupancy or OccupancyIndex()
+        self.month_cache = MonthModelCache()
+        # 検索ヒットの印に使う（アプリが update_occupancy / apply_change の前に設定する）
+        self.search_cursor: SearchCursor | None = None
+        # 描画待ちの移動先の月（None なら保留中の月移動なし）
+        self._nav_target: tuple[int, int] | None = None
+        # 連続した月移動でまとめて省略した再構築の回数
+        self.skipped_rebuilds = 0
+        # 表示中のセル（日 → DayCell）と、その (年, 月)
+        self._cells: dict[int, DayCell] = {}
+        self._cells_month: tuple[int, int] | None = None
 
     def compose(self) -> ComposeResult:
         with Container(id="calendar-container"):
@@ -130,6 +183,7 @@ class CalendarView(Widget):
         except Exception:
             pass
 
+    @perf.timed("calendar._rebuild_calendar")
     def _rebuild_calendar(self) -> None:
         try:
             grid = self.query_one("#calendar-grid", Grid)
@@ -139,12 +193,17 @@ class CalendarView(Widget):
         grid.remove_children()
 
         today = datetime.date.today()
-        cal = calendar.monthcalendar(self.current_year, self.current_month)
+        year, month = self.current_year, self.current_month
+        model = self.month_cache.get(self.occupancy, year, month)
 
-        from utils.datetime_util import date_to_key
+        search_hits: set[str] = set()
+        if self.search_cursor is not None:
+            search_hits = self.search_cursor.date_keys_in_month(year, month)
 
         cells: list[DayCell] = []
-        for week in cal:
+        self._cells = {}
+        self._cells_month = (year, month)
+        for week in model.weeks:
             for day in week:
                 if day == 0:
                     cell = DayCell(
@@ -153,21 +212,87 @@ class CalendarView(Widget):
                         is_other_month=True,
                     )
                 else:
-                    d = datetime.date(self.current_year, self.current_month, day)
-                    dk = date_to_key(d)
+                    d = model.date(day)
                     cell = DayCell(
                         day=day,
                         date=d,
                         is_today=(d == today),
-                        has_schedule=(dk in self.schedule_dates),
+                        schedule_count=model.counts[day - 1],
                         is_selected=(d == self.selected_date),
+                        is_search_hit=(model.date_keys[day - 1] in search_hits),
                     )
+                    self._cells[day] = cell
                 cells.append(cell)
         grid.mount_all(cells)
+        perf.count("widget.mounts", len(cells))
+        self._prefetch_adjacent(year, month)
+
+    def _prefetch_adjacent(self, year: int, month: int) -> None:
+        """前後の月のモデルをワーカースレッドで先読みする。
+
+        月を続けて移動したときは前の先読みを取り消し、最後に表示した月の分だけを行う。
+        """
+        occupancy = self.occupancy
+        months = [shift_month(year, month, -1), shift_month(year, month, 1)]
+
+        def prefetch() -> None:
+            worker = get_current_worker()
+            for y, m in months:
+                if worker.is_cancelled:
+                    return
+                if self.month_cache.prefetch(occupancy, y, m):
+                    perf.count("calendar.month_cache.prefetch")
+
+        self.run_worker(
+            prefetch,
+            name="month-prefetch",
+            group="month-prefetch",
+            exclusive=True,
+            thread=True,
+            exit_on_error=False,
+        )
+
+    def _visible_cell(self, d: datetime.date) -> DayCell | None:
+        if self._cells_month != (d.year, d.month):
+            return None
+        return self._cells.get(d.day)
+
+    def _move_selection(self, d: datetime.date) -> bool:
+        """選択を表示中の月の d に移す（前後2セルだけ更新）。d が表示外なら False。"""
+        cell = self._visible_cell(d)
+        if cell is None:
+            return False
+        previous = self._visible_cell(self.selected_date)
+        self.selected_date = d
+        if previous is not None and previous is not cell:
+            previous.update_state(is_selected=False)
+        cell.update_state(is_selected=True)
+        return True
+
+    def apply_change(self, change: ScheduleChange) -> None:
+        """変更のあった日付のセルだけを更新する（表示中の月に無ければ何もしない）。"""
+        if self._cells_month is None:
+            return
+        prefix = month_key(*self._cells_month)
+        hits = self.search_cursor.date_keys if self.search_cursor is not None else set()
+        for key in change.date_keys:
+            if not key.startswith(prefix):
+                continue
+            cell = self._cells.get(int(key[4:6]))
+            if cell is None:
+                continue
+            cell.update_state(
+                schedule_count=self.occupancy.count(cell.date),
+                is_search_hit=key in hits,
+            )
+            perf.count("calendar.cell_updates")
+        # 世代が進んでキャッシュ済みの月は無効になったため、前後の月を読み直す
+        self._prefetch_adjacent(*self._cells_month)
 
     def on_day_cell_selected(self, event: DayCell.Selected) -> None:
-        self.selected_date = event.date
-        self._rebuild_calendar()
+        if not self._move_selection(event.date):
+            self.selected_date = event.date
+            self._rebuild_calendar()
         self.post_message(self.DateSelected(event.date))
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
@@ -177,36 +302,58 @@ class CalendarView(Widget):
             self.go_next_month()
 
     def go_prev_month(self) -> None:
-        if self.current_month == 1:
-            self.current_month = 12
-            self.current_year -= 1
-        else:
-            self.current_month -= 1
-        self.post_message(self.MonthChanged(self.current_year, self.current_month))
+        self._shift_month(-1)
 
     def go_next_month(self) -> None:
-        if self.current_month == 12:
-            self.current_month = 1
-            self.current_year += 1
+        self._shift_month(1)
+
+    @property
+    def pending_month(self) -> tuple[int, int]:
+        """描画待ちを含めた移動先の (年, 月) を返す。"""
+        return self._nav_target or (self.current_year, self.current_month)
+
+    def _shift_month(self, delta: int) -> None:
+        """表示月を delta か月移動する。
+
+        描画は次のフレームの後にまとめて1回だけ行う。描画前に次の移動が来た場合は
+        移動先だけを更新し、途中の月の再構築・ラベル更新・MonthChanged を省略する。
+        """
+        target = shift_month(*self.pending_month, delta)
+        if self._nav_target is None:
+            self.call_after_refresh(self._apply_navigation)
         else:
-            self.current_month += 1
-        self.post_message(self.MonthChanged(self.current_year, self.current_month))
+            self.skipped_rebuilds += 1
+            perf.count("calendar.skipped_rebuilds")
+        self._nav_target = target
+
+    def _apply_navigation(self) -> None:
+        target = self._nav_target
+        self._nav_target = None
+        if target is None:
+            # select_date / go_today で取り消された
+            return
+        self._show_month(*target)
+        self.post_message(self.MonthChanged(*target))
 
-    def go_today(self) -> None:
-        today = datetime.date.today()
-        self.current_year = today.year
-        self.current_month = today.month
-        self.selected_date = today
+    def _show_month(self, year: int, month: int) -> None:
+        """年月を切り替えて1回だけ再構築する（watch_* による二重の再構築を避ける）。"""
+        self.set_reactive(CalendarView.current_year, year)
+        self.set_reactive(CalendarView.current_month, month)
+        self._update_month_label()
         self._rebuild_calendar()
-        self.post_message(self.DateSelected(today))
 
-    def update_schedule_dates(self, dates: set[str]) -> None:
-        self.schedule_dates = dates
+    def go_today(self) -> None:
+        self.select_date(datetime.date.today())
+
+    def update_occupancy(self, occupancy: OccupancyIndex) -> None:
+        self.occupancy = occupancy
         self._rebuild_calendar()
 
     def select_date(self, d: datetime.date) -> None:
-        self.current_year = d.year
-        self.current_month = d.month
-        self.selected_date = d
-        self._rebuild_calendar()
+        self._nav_target = None
+        if (d.year, d.month) != (self.current_year, self.current_month) or (
+            not self._move_selection(d)
+        ):
+            self.selected_date = d
+            self._show_month(d.year, d.month)
         self.post_message(self.DateSelected(d))
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import bisect
 import datetime
 from typing import Optional
 
@@ -12,8 +13,10 @@ from textual.reactive import reactive
 from textual.widget import Widget
 from textual.widgets import Label, ListItem, ListView, Static
 
+from db.events import ScheduleChange
 from models.schedule import Schedule
-from utils.datetime_util import format_time_display
+from utils import perf
+from utils.datetime_util import date_to_key, format_time_display
 
 
 class ScheduleItem(ListItem):
@@ -51,6 +54,8 @@ class DetailView(Widget):
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
         self._schedules: list[Schedule] = []
+        # 「スケジュールなし」の行（表示中のみ）
+        self._placeholder: ListItem | None = None
 
     def compose(self) -> ComposeResult:
         yield Label("── スケジュールなし ──", id="detail-date-label")
@@ -67,6 +72,7 @@ class DetailView(Widget):
             pass
         return None
 
+    @perf.timed("detail.update_schedules")
     def update_schedules(self, date: datetime.date, schedules: list[Schedule]) -> None:
         """表示する日付とスケジュールを更新する。"""
         self.selected_date = date
@@ -81,14 +87,93 @@ class DetailView(Widget):
         try:
             lv = self.query_one("#schedule-list", ListView)
             lv.clear()
+            self._placeholder = None
             if schedules:
                 for s in schedules:
                     lv.append(ScheduleItem(s))
             else:
-                lv.append(ListItem(Static("  スケジュールなし")))
+                self._show_placeholder(lv)
+            perf.count("widget.mounts", len(schedules) or 1)
         except Exception:
             pass
 
+    @perf.timed("detail.apply_change")
+    def apply_change(self, change: ScheduleChange) -> bool:
+        """表示中の日付に関わる変更だけを一覧に反映する（該当行だけ追加・削除）。
+
+        表示中の日付に関係しない変更なら何もせず False を返す。
+        """
+        if self.selected_date is None:
+            return False
+        key = date_to_key(self.selected_date)
+        if not change.touches(key):
+            return False
+        try:
+            lv = self.query_one("#schedule-list", ListView)
+        except Exception:
+            return False
+
+        # 行の除去は非同期に行われるため、位置ではなく行の Widget を直接操作する
+        highlighted = self.highlighted_schedule
+        focus_id = highlighted.id if highlighted is not None else None
+        position = lv.index or 0
+        for i, s in enumerate(self._schedules):
+            if s.id == change.schedule_id:
+                del self._schedules[i]
+                self._item_for(lv, s).remove()
+                position = i
+                break
+
+        new = change.new
+        if new is not None and new.date_key == key:
+            pos = bisect.bisect_right(
+                [s.parsed_datetime for s in self._schedules], new.parsed_datetime
+            )
+            item = ScheduleItem(new)
+            if pos < len(self._schedules):
+                lv.mount(item, before=self._item_for(lv, self._schedules[pos]))
+            else:
+                lv.mount(item)
+            self._schedules.insert(pos, new)
+            self._remove_placeholder()
+            focus_id = new.id
+            perf.count("widget.mounts")
+        elif not self._schedules:
+            self._show_placeholder(lv)
+            perf.count("widget.mounts")
+        self.call_after_refresh(self._restore_highlight, lv, focus_id, position)
+        perf.count("detail.patches")
+        return True
+
+    @staticmethod
+    def _item_for(lv: ListView, schedule: Schedule) -> ScheduleItem:
+        for item in lv.query(ScheduleItem):
+            if item.schedule is schedule:
+                return item
+        raise LookupError(schedule.id)
+
+    def _show_placeholder(self, lv: ListView) -> None:
+        self._placeholder = ListItem(Static("  スケジュールなし"))
+        lv.append(self._placeholder)
+
+    def _remove_placeholder(self) -> None:
+        if self._placeholder is not None:
+            self._placeholder.remove()
+            self._placeholder = None
+
+    def _restore_highlight(
+        self, lv: ListView, schedule_id: str | None, fallback: int
+    ) -> None:
+        """差分更新の後、同じスケジュール（無ければ近い位置）をハイライトする。"""
+        if not self._schedules:
+            return
+        index = min(fallback, len(self._schedules) - 1)
+        for i, s in enumerate(self._schedules):
+            if s.id == schedule_id:
+                index = i
+                break
+        lv.index = index
+
     def on_list_view_highlighted(self, event: ListView.Highlighted) -> None:
         if event.item and isinstance(event.item, ScheduleItem):
             self.post_message(self.ScheduleHighlighted(event.item.schedule))
@@ -17,4 +17,4 @@ class AppFooter(Static):
     """キーバインド表示用フッター。"""
 
     def render(self) -> str:
-        return " a:追加  e:編集  d:削除  /:検索  t:今日  </>:月切替  Tab:切替  q:終了"
+        return " a:追加  e:編集  d:削除  /:検索  n/N:次/前の結果  t:今日  </>:月切替  Tab:切替  p:統計  q:終了"
@@ -0,0 +1,126 @@
+"""カレンダー1か月分の表示モデルと LRU キャッシュ。
+
+CalendarView は月を切り替えるたびに ``calendar.monthcalendar``・各セルの日付キー・
+日別件数を計算していた。MonthModel はこれらをまとめた不変の計算結果で、
+MonthModelCache が YYMM ごとに保持する。キャッシュの各エントリは作成時の
+``OccupancyIndex.generation`` を持ち、データが変わって世代が進むと無効になる。
+
+前後の月はワーカースレッドで先読みするため、キャッシュはスレッドセーフにしている。
+"""
+
+from __future__ import annotations
+
+import calendar
+import datetime
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from db.query import OccupancyIndex
+from utils import perf
+from utils.datetime_util import date_to_key, month_key
+
+# 保持する月数（表示中の月と前後の先読み分に、行き来する数か月分の余裕を持たせる）
+DEFAULT_CAPACITY = 12
+
+
+@dataclass(frozen=True)
+class MonthModel:
+    """1か月分のカレンダー表示に必要な計算結果。"""
+
+    year: int
+    month: int
+    generation: int                     # 計算時の OccupancyIndex.generation
+    weeks: tuple[tuple[int, ...], ...]  # calendar.monthcalendar（0 は月外）
+    date_keys: tuple[str, ...]          # 日ごとの YYMMDD（インデックスは day - 1）
+    counts: tuple[int, ...]             # 日ごとの件数（インデックスは day - 1）
+    mask: int                           # 占有ビットマスク
+
+    def date(self, day: int) -> datetime.date:
+        return datetime.date(self.year, self.month, day)
+
+
+def build_month_model(occupancy: OccupancyIndex, year: int, month: int) -> MonthModel:
+    """occupancy の現在の内容から year 年 month 月のモデルを計算する。"""
+    generation = occupancy.generation
+    days = calendar.monthrange(year, month)[1]
+    return MonthModel(
+        year=year,
+        month=month,
+        generation=generation,
+        weeks=tuple(tuple(week) for week in calendar.monthcalendar(year, month)),
+        date_keys=tuple(
+            date_to_key(datetime.date(year, month, day)) for day in range(1, days + 1)
+        ),
+        counts=tuple(occupancy.counts(year, month)[:days]),
+        mask=occupancy.mask(year, month),
+    )
+
+
+class MonthModelCache:
+    """YYMM をキーにした MonthModel の LRU キャッシュ。"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError("capacity は 1 以上を指定してください")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._models: OrderedDict[str, MonthModel] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def __contains__(self, key: tuple[int, int]) -> bool:
+        return month_key(*key) in self._models
+
+    def _lookup(
+        self, occupancy: OccupancyIndex, key: str, year: int
+    ) -> MonthModel | None:
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                return None
+            # YYMM は 100 年ごとに重複するため年も確認する
+            if model.generation != occupancy.generation or model.year != year:
+                del self._models[key]
+                return None
+            self._models.move_to_end(key)
+            return model
+
+    def _store(self, occupancy: OccupancyIndex, key: str, model: MonthModel) -> None:
+        with self._lock:
+            # 計算中にデータが変わっていたら古い結果は保存しない
+            if model.generation != occupancy.generation:
+                return
+            self._models[key] = model
+            self._models.move_to_end(key)
+            while len(self._models) > self.capacity:
+                self._models.popitem(last=False)
+
+    def get(self, occupancy: OccupancyIndex, year: int, month: int) -> MonthModel:
+        """キャッシュ済みのモデルを返す。無い・古い場合は計算して保存する。"""
+        key = month_key(year, month)
+        model = self._lookup(occupancy, key, year)
+        if model is not None:
+            self.hits += 1
+            perf.count("calendar.month_cache.hit")
+            return model
+        self.misses += 1
+        perf.count("calendar.month_cache.miss")
+        model = build_month_model(occupancy, year, month)
+        self._store(occupancy, key, model)
+        return model
+
+    def prefetch(self, occupancy: OccupancyIndex, year: int, month: int) -> bool:
+        """未計算なら計算して保存する（ヒット・ミスには数えない）。計算したら True。"""
+        key = month_key(year, month)
+        if self._lookup(occupancy, key, year) is not None:
+            return False
+        self._store(occupancy, key, build_month_model(occupancy, year, month))
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
@@ -315,12 +315,13 @@ class SearchDialog(ModalScreen[Optional[str]]):
     }
     """
 
-    def __init__(self) -> None:
+    def __init__(self, title: str = "検索") -> None:
         super().__init__()
+        self._title = title
 
     def compose(self) -> ComposeResult:
         with Container(id="search-container"):
-            yield Static("検索", id="search-title")
+            yield Static(self._title, id="search-title")
             yield Input(placeholder="検索キーワード", id="search-input")
             with Horizontal(id="search-buttons"):
                 yield Button("検索", variant="primary", id="btn-search")
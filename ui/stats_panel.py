@@ -0,0 +1,128 @@
+"""ホットパス計測の統計パネル Widget。"""
+
+from __future__ import annotations
+
+from textual.timer import Timer
+from textual.widgets import Static
+
+from utils import perf
+
+# 常に表示する計測名（未計測なら "-"）。これ以外の計測名は後ろに追加表示する
+HOT_PATHS = (
+    "app._load_data",
+    "app._save_data",
+    "app._refresh_views",
+    "calendar._rebuild_calendar",
+    "detail.update_schedules",
+    "query.search_schedules",
+)
+
+# 起動の内訳の表示順（app.on_mount が perf.Breakdown("startup") で記録する）
+STARTUP_PARTS = (
+    ("config", "設定"),
+    ("archive", "アーカイブ"),
+    ("read", "読込"),
+    ("validate", "検証"),
+    ("decode", "変換"),
+    ("load", "読込全体"),
+    ("render", "描画"),
+    ("total", "合計"),
+)
+
+# 表示の更新間隔（秒）
+REFRESH_INTERVAL = 0.5
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:8.2f}"
+
+
+def format_stats() -> str:
+    """perf の現在の記録をパネル表示用のテキストにする。"""
+    by_name = {s.name: s for s in perf.stats()}
+    names = list(HOT_PATHS) + sorted(n for n in by_name if n not in HOT_PATHS)
+    lines = [
+        f" 計測 (直近{perf.WINDOW}回, ms)            回数     最新     平均     最大",
+    ]
+    for name in names:
+        s = by_name.get(name)
+        if s is None:
+            lines.append(f" {name:<28} {'-':>6} {'-':>8} {'-':>8} {'-':>8}")
+        else:
+            lines.append(
+                f" {name:<28} {s.count:>6} {_ms(s.last)} {_ms(s.mean)} {_ms(s.max)}"
+            )
+    gauges = perf.gauges()
+    lines.append("")
+    lines.append(
+        f" マウント数/リフレッシュ: {gauges.get('widget.mounts/refresh', 0):,}"
+        f"   累計: {perf.counter('widget.mounts'):,}"
+    )
+    lines.append(
+        f" 省略した月移動の再構築: {perf.counter('calendar.skipped_rebuilds'):,}"
+    )
+    lines.append(
+        f" 月モデルキャッシュ: hit {perf.counter('calendar.month_cache.hit'):,}"
+        f" / miss {perf.counter('calendar.month_cache.miss'):,}"
+        f" / 先読み {perf.counter('calendar.month_cache.prefetch'):,}"
+    )
+    lines.append(
+        f" 差分更新: セル {perf.counter('calendar.cell_updates'):,}"
+        f" / 詳細 {perf.counter('detail.patches'):,}"
+    )
+    lines.append(f" データ件数: {gauges.get('dataset.records', 0):,}")
+    startup = perf.breakdowns().get("startup")
+    if startup:
+        parts = " / ".join(
+            f"{label} {startup[name] * 1000:.1f}"
+            for name, label in STARTUP_PARTS
+            if name in startup
+        )
+        lines.append(f" 起動 (ms): {parts}")
+    lines.append(f" 隔離したレコード: {gauges.get('dataset.quarantined', 0):,}")
+    return "\n".join(lines)
+
+
+class StatsPanel(Static):
+    """計測スパンのローリング統計を表示するパネル。
+
+    表示中だけ perf の記録を有効にし、閉じると無効に戻す。
+    """
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__("", **kwargs)
+        self._timer: Timer | None = None
+
+    def on_mount(self) -> None:
+        self.display = False
+
+    @property
+    def is_open(self) -> bool:
+        return bool(self.display)
+
+    def open(self) -> None:
+        """記録をリセットして計測を開始し、パネルを表示する。"""
+        perf.reset()
+        perf.enable()
+        self.display = True
+        self.refresh_stats()
+        if self._timer is None:
+            self._timer = self.set_interval(REFRESH_INTERVAL, self.refresh_stats)
+        else:
+            self._timer.resume()
+
+    def close(self) -> None:
+        """パネルを隠し、計測を停止する。"""
+        perf.enable(False)
+        self.display = False
+        if self._timer is not None:
+            self._timer.pause()
+
+    def toggle(self) -> None:
+        if self.is_open:
+            self.close()
+        else:
+            self.open()
+
+    def refresh_stats(self) -> None:
+        self.update(format_stats())
@@ -2,14 +2,26 @@
 
 from __future__ import annotations
 
+import os
 import shutil
 from pathlib import Path
 
 
-def create_backup(filepath: Path) -> Path | None:
-    """ファイルの .bak コピーを作成する。"""
+def create_backup(filepath: Path, link: bool = False) -> Path | None:
+    """ファイルの .bak コピーを作成する。
+
+    link=True の場合はコピーせずにハードリンクを作る（読み書きが発生しない）。
+    呼び出し側が元のファイルを書き換えず、別のファイルで置き換える場合にだけ使える。
+    """
     if not filepath.exists():
         return None
     bak = filepath.with_suffix(filepath.suffix + ".bak")
+    if link:
+        bak.unlink(missing_ok=True)
+        try:
+            os.link(filepath, bak)
+            return bak
+        except OSError:
+            pass  # ハードリンクに対応していないファイルシステムではコピーする
     shutil.copy2(filepath, bak)
     return bak
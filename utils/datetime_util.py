@@ -12,29 +12,40 @@
 from __future__ import annotations
 
 import datetime
+from functools import lru_cache
 
+# parse_datetime のメモ化キャッシュ上限（件数）
+PARSE_CACHE_SIZE = 65_536
 
-def parse_datetime(raw: str) -> tuple[datetime.datetime, str]:
-    """日時文字列をパースし (datetime, type) を返す。
+# 月ごとの最大日数（2/29 は parse_many 内で別途判定する。2000〜2099 年は 4 で割り切れる年がうるう年）
+_DAYS_IN_MONTH = (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
 
-    Args:
-        raw: "YYMMDD_HHMM" / "~YYMMDD_HHMM" / "YYMMDD_HHMM~"
 
-    Returns:
-        (datetime, date_time_type) のタプル
+def _split_type(raw: str) -> tuple[str, str]:
+    """タイプ修飾子を取り除いた本体と date_time_type を返す。
 
-    Raises:
-        ValueError: フォーマット不正
+    前後に空白のない3形式（11 / 12 文字）は strip せずに判定する。
     """
-    dt_type = "exact"
-    s = raw.strip()
+    n = len(raw)
+    if n == 11:
+        return raw, "exact"
+    if n == 12:
+        if raw[0] == "~":
+            return raw[1:], "until"
+        if raw[11] == "~":
+            return raw[:11], "from"
 
+    s = raw.strip()
     if s.startswith("~"):
-        dt_type = "until"
-        s = s[1:]
-    elif s.endswith("~"):
-        dt_type = "from"
-        s = s[:-1]
+        return s[1:], "until"
+    if s.endswith("~"):
+        return s[:-1], "from"
+    return s, "exact"
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_cached(raw: str) -> tuple[datetime.datetime, str]:
+    s, dt_type = _split_type(raw)
 
     if len(s) != 11 or s[6] != "_":
         raise ValueError(f"Invalid datetime format: {raw!r}  (expected YYMMDD_HHMM)")
@@ -50,6 +61,70 @@ def parse_datetime(raw: str) -> tuple[datetime.datetime, str]:
     return dt, dt_type
 
 
+def parse_datetime(raw: str) -> tuple[datetime.datetime, str]:
+    """日時文字列をパースし (datetime, type) を返す。
+
+    結果は LRU キャッシュ（最大 PARSE_CACHE_SIZE 件）でメモ化される。
+
+    Args:
+        raw: "YYMMDD_HHMM" / "~YYMMDD_HHMM" / "YYMMDD_HHMM~"
+
+    Returns:
+        (datetime, date_time_type) のタプル
+
+    Raises:
+        ValueError: フォーマット不正
+    """
+    return _parse_cached(raw)
+
+
+def parse_many(raws: list[str]) -> list[int]:
+    """日時文字列を一括で検証し、整数ソートキー (YYMMDDHHMM) のリストを返す。
+
+    datetime オブジェクトを生成しないため、大量レコードの検証・ソートに向く。
+    結果は to_sort_key(parse_datetime(raw)[0]) と一致する
+    （ただし数字は ASCII のみ受け付ける）。
+
+    Raises:
+        ValueError: フォーマット不正・存在しない日時（位置を含むメッセージ）
+    """
+    keys: list[int] = []
+    append = keys.append
+    days_in_month = _DAYS_IN_MONTH
+    for i, raw in enumerate(raws):
+        n = len(raw)
+        if n == 11:
+            s = raw
+        elif n == 12 and raw[0] == "~":
+            s = raw[1:]
+        elif n == 12 and raw[11] == "~":
+            s = raw[:11]
+        else:
+            s, _ = _split_type(raw)
+        digits = s[:6] + s[7:]
+        if (
+            len(s) != 11
+            or s[6] != "_"
+            or not digits.isdigit()
+            or not digits.isascii()
+        ):
+            raise ValueError(
+                f"Invalid datetime format at index {i}: {raw!r}  (expected YYMMDD_HHMM)"
+            )
+        key = int(digits)
+        mm = key // 1_000_000 % 100
+        dd = key // 10_000 % 100
+        if not (
+            1 <= mm <= 12
+            and 1 <= dd <= days_in_month[mm]
+            and key // 100 % 100 < 24
+            and key % 100 < 60
+        ) or (mm == 2 and dd == 29 and key // 100_000_000 % 4):
+            raise ValueError(f"Invalid datetime at index {i}: {raw!r}")
+        append(key)
+    return keys
+
+
 def format_datetime(dt: datetime.datetime, dt_type: str = "exact") -> str:
     """datetime を YYMMDD_HHMM 形式に変換する。"""
     s = dt.strftime("%y%m%d_%H%M")
@@ -80,6 +155,40 @@ def date_to_key(d: datetime.date) -> str:
     return d.strftime("%y%m%d")
 
 
+def to_sort_key(dt: datetime.datetime) -> int:
+    """datetime を整数ソートキー YYMMDDHHMM に変換する。
+
+    例: 2026-02-19 14:30 → 2602191430。大小関係は日時の前後と一致する。
+    """
+    return (
+        (dt.year % 100) * 100_000_000
+        + dt.month * 1_000_000
+        + dt.day * 10_000
+        + dt.hour * 100
+        + dt.minute
+    )
+
+
+def from_sort_key(key: int) -> datetime.datetime:
+    """整数ソートキー YYMMDDHHMM を datetime に戻す。"""
+    yy, rest = divmod(key, 100_000_000)
+    mm, rest = divmod(rest, 1_000_000)
+    dd, rest = divmod(rest, 10_000)
+    hh, mi = divmod(rest, 100)
+    return datetime.datetime(2000 + yy, mm, dd, hh, mi)
+
+
+def month_key(year: int, month: int) -> str:
+    """年・月を YYMM 文字列に変換する（月単位の集計キー）。"""
+    return f"{year % 100:02d}{month:02d}"
+
+
+def shift_month(year: int, month: int, delta: int) -> tuple[int, int]:
+    """year 年 month 月から delta か月ずらした (年, 月) を返す。"""
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
+
+
 def extract_date_key(raw: str) -> str:
     """日時文字列から YYMMDD 部分を抽出する。"""
     s = raw.strip().lstrip("~")
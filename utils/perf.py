@@ -0,0 +1,262 @@
+"""ホットパス計測用の軽量スパン。
+
+    from utils import perf
+
+    @perf.timed("app._refresh_views")
+    def _refresh_views(self): ...
+
+    with perf.span("query.search_schedules"):
+        ...
+
+計測は ``enable()`` されているか、``add_sink()`` で出力先が登録されている間だけ
+記録する。どちらも無い間の ``span()`` は共有の何もしないオブジェクトを返し、
+``timed`` のラッパーはフラグを1回見るだけなので、コストはほぼゼロになる。
+
+``enable()`` 中は所要時間を名前ごとに直近 ``WINDOW`` 件保持する（ローリング統計）。
+sink には ``(名前, 秒)`` が記録のたびに渡される（utils.perf_log など）。
+
+起動のように1回だけ行う処理は ``Breakdown`` で段階ごとに測り、``breakdowns()`` で
+後から参照する（ゲージと同じく、計測が無効でも記録する）。
+
+保存やカレンダーの先読みはワーカースレッドから記録するため、記録先の dict は
+``_lock`` の中で更新し、``stats()`` などはロックの中で取ったコピーから値を作る。
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# 名前ごとに保持する直近サンプル数
+WINDOW = 50
+
+_enabled = False   # ローリング統計の記録
+_active = False    # _enabled または sink あり（計測するかどうか）
+_sinks: list[Callable[[str, float], None]] = []
+_timings: dict[str, deque[float]] = {}
+_counts: dict[str, int] = {}
+_counters: dict[str, int] = {}
+_gauges: dict[str, int] = {}
+_breakdowns: dict[str, dict[str, float]] = {}
+_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class TimingStats:
+    """1つの計測名のローリング統計（秒）。"""
+
+    name: str
+    count: int      # 有効化以降の総呼び出し回数
+    last: float
+    mean: float     # 直近 WINDOW 件の平均
+    max: float      # 直近 WINDOW 件の最大
+
+
+def _update_active() -> None:
+    global _active
+    _active = _enabled or bool(_sinks)
+
+
+def enable(on: bool = True) -> None:
+    """ローリング統計の記録を有効化（on=False で無効化）する。"""
+    global _enabled
+    _enabled = on
+    _update_active()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def add_sink(sink: Callable[[str, float], None]) -> None:
+    """記録のたびに (名前, 秒) を受け取る出力先を登録する。"""
+    _sinks.append(sink)
+    _update_active()
+
+
+def remove_sink(sink: Callable[[str, float], None]) -> None:
+    if sink in _sinks:
+        _sinks.remove(sink)
+    _update_active()
+
+
+def reset() -> None:
+    """記録済みの所要時間とカウンタを消去する（ゲージは残す）。"""
+    with _lock:
+        _timings.clear()
+        _counts.clear()
+        _counters.clear()
+
+
+def record(name: str, seconds: float) -> None:
+    """所要時間を1件記録する（無効時は何もしない）。"""
+    for sink in _sinks:
+        sink(name, seconds)
+    if not _enabled:
+        return
+    with _lock:
+        samples = _timings.get(name)
+        if samples is None:
+            samples = _timings[name] = deque(maxlen=WINDOW)
+        samples.append(seconds)
+        _counts[name] = _counts.get(name, 0) + 1
+
+
+def count(name: str, n: int = 1) -> None:
+    """カウンタを n 増やす（無効時は何もしない）。"""
+    if _enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + n
+
+
+def counter(name: str) -> int:
+    return _counters.get(name, 0)
+
+
+def gauge(name: str, value: int) -> None:
+    """現在値を記録する。データ件数など常に最新であるべき値のため、無効時も更新する。"""
+    with _lock:
+        _gauges[name] = value
+
+
+def gauges() -> dict[str, int]:
+    with _lock:
+        return dict(_gauges)
+
+
+def breakdown(name: str, parts: dict[str, float]) -> None:
+    """1回だけ行う処理の段階ごとの所要時間（秒）を記録する。
+
+    無効時も記録し、reset() でも消さない。各段階は ``名前.段階`` として record にも渡す。
+    """
+    with _lock:
+        _breakdowns[name] = dict(parts)
+    for part, seconds in parts.items():
+        record(f"{name}.{part}", seconds)
+
+
+def breakdowns() -> dict[str, dict[str, float]]:
+    with _lock:
+        return {name: dict(parts) for name, parts in _breakdowns.items()}
+
+
+class Breakdown:
+    """段階ごとの所要時間を順に測る。
+
+        startup = perf.Breakdown("startup")
+        config = await load_config()
+        startup.lap("config")      # 直前の lap（または開始）からの時間
+        ...
+        startup.finish()           # "total" を加えて breakdown() に記録する
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.parts: dict[str, float] = {}
+        self._start = self._last = time.perf_counter()
+
+    def lap(self, part: str) -> None:
+        now = time.perf_counter()
+        self.parts[part] = self.parts.get(part, 0.0) + now - self._last
+        self._last = now
+
+    def finish(self) -> dict[str, float]:
+        self.parts["total"] = time.perf_counter() - self._start
+        breakdown(self.name, self.parts)
+        return self.parts
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> _Span:
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        record(self.name, time.perf_counter() - self.start)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str) -> _Span | _NullSpan:
+    """with 文で囲んだ区間の所要時間を記録するスパンを返す。"""
+    return _Span(name) if _active else _NULL_SPAN
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """関数・メソッドの所要時間を記録するデコレータ。
+
+    コルーチン関数に付けた場合は、await が完了するまでの時間を記録する。
+    """
+
+    def decorator(fn: F) -> F:
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not _active:
+                    return await fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    record(name, time.perf_counter() - start)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _active:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def stats() -> list[TimingStats]:
+    """記録済みの計測名ごとのローリング統計を名前順で返す。"""
+    with _lock:
+        snapshot = [
+            (name, _counts[name], list(samples))
+            for name, samples in _timings.items()
+            if samples
+        ]
+    return [
+        TimingStats(
+            name=name,
+            count=n,
+            last=samples[-1],
+            mean=sum(samples) / len(samples),
+            max=max(samples),
+        )
+        for name, n, samples in sorted(snapshot)
+    ]
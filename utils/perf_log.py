@@ -0,0 +1,195 @@
+"""構造化パフォーマンスログ（JSONL ＋ レイテンシヒストグラム）。
+
+``python main.py --perf-log`` で有効にすると、utils.perf の計測スパン
+（store / query / 画面更新）を ``log/perf_YYYYmmdd_HHMMSS.jsonl`` に記録する。
+
+1行1レコードの JSON で、``type`` により次の3種類がある。
+
+  - ``start``:     プロセス情報（pid / Python / プラットフォーム）
+  - ``span``:      計測1件（``name``、``ms``、終了時刻 ``ts``）
+  - ``histogram``: 終了時に書き出す名前ごとのヒストグラム（LatencyHistogram.to_dict）
+
+ヒストグラムは HDR Histogram と同様の対数＋線形バケットで、マイクロ秒単位の値を
+相対誤差 1/2**SUB_BUCKET_BITS 以内で保持する。集計は ``python -m utils.perf_summary``。
+"""
+
+from __future__ import annotations
+
+import atexit
+import datetime
+import json
+import math
+import os
+import platform
+import threading
+import time
+from pathlib import Path
+from typing import IO, Any
+
+from utils import perf
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+LOG_DIR = PROJECT_ROOT / "log"
+
+# 2 のべき乗区間ごとの線形サブバケット数 = 2**SUB_BUCKET_BITS（相対誤差約 3%）
+SUB_BUCKET_BITS = 5
+
+
+class LatencyHistogram:
+    """HDR 形式（対数＋線形バケット）のレイテンシヒストグラム。
+
+    値は整数マイクロ秒で記録する。2**SUB_BUCKET_BITS 未満の値は 1µs 幅、
+    それ以上は [2**k, 2**(k+1)) ごとに 2**SUB_BUCKET_BITS 等分したバケットに入る。
+    """
+
+    def __init__(self, sub_bucket_bits: int = SUB_BUCKET_BITS) -> None:
+        self.sub_bucket_bits = sub_bucket_bits
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.min = 0
+        self.max = 0
+        self.total = 0
+
+    # ---- bucket index ----
+
+    def bucket_index(self, value: int) -> int:
+        size = 1 << self.sub_bucket_bits
+        if value < 2 * size:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits - 1
+        return (shift + 1) * size + (value >> shift) - size
+
+    def bucket_upper(self, index: int) -> int:
+        """バケットに入る最大値（highest equivalent value）を返す。"""
+        size = 1 << self.sub_bucket_bits
+        if index < 2 * size:
+            return index
+        shift = index // size - 1
+        mantissa = index % size + size
+        return ((mantissa + 1) << shift) - 1
+
+    # ---- recording ----
+
+    def record(self, value_us: int) -> None:
+        value_us = max(0, int(value_us))
+        idx = self.bucket_index(value_us)
+        self.buckets[idx] = self.buckets.get(idx, 0) + 1
+        if self.count == 0 or value_us < self.min:
+            self.min = value_us
+        if value_us > self.max:
+            self.max = value_us
+        self.count += 1
+        self.total += value_us
+
+    def merge(self, other: LatencyHistogram) -> None:
+        if other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("sub_bucket_bits が異なるヒストグラムは結合できません")
+        if other.count == 0:
+            return
+        for idx, n in other.buckets.items():
+            self.buckets[idx] = self.buckets.get(idx, 0) + n
+        self.min = other.min if self.count == 0 else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    # ---- queries ----
+
+    def percentile(self, p: float) -> int:
+        """p パーセンタイル（マイクロ秒、最大値で頭打ち）を返す。"""
+        if self.count == 0:
+            return 0
+        rank = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            if seen >= rank:
+                return min(self.bucket_upper(idx), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    # ---- serialization ----
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "unit": "us",
+            "sub_bucket_bits": self.sub_bucket_bits,
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "sum": self.total,
+            "buckets": {str(k): v for k, v in sorted(self.buckets.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> LatencyHistogram:
+        hist = cls(int(data.get("sub_bucket_bits", SUB_BUCKET_BITS)))
+        hist.buckets = {int(k): int(v) for k, v in data.get("buckets", {}).items()}
+        hist.count = int(data.get("count", 0))
+        hist.min = int(data.get("min", 0))
+        hist.max = int(data.get("max", 0))
+        hist.total = int(data.get("sum", 0))
+        return hist
+
+
+class PerfLogger:
+    """perf の sink として計測を JSONL に書き、終了時にヒストグラムを書き出す。"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: IO[str] | None = open(path, "a", encoding="utf-8")
+        self._write({
+            "type": "start",
+            "ts": time.time(),
+            "pid": os.getpid(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        })
+
+    def _write(self, record: dict[str, Any]) -> None:
+        if self._file is not None:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def __call__(self, name: str, seconds: float) -> None:
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = LatencyHistogram()
+            hist.record(round(seconds * 1_000_000))
+            self._write({
+                "type": "span",
+                "ts": round(time.time(), 6),
+                "name": name,
+                "ms": round(seconds * 1000, 3),
+            })
+
+    def close(self) -> None:
+        """ヒストグラムを書き出してファイルを閉じる（2回目以降は何もしない）。"""
+        with self._lock:
+            if self._file is None:
+                return
+            for name, hist in sorted(self.histograms.items()):
+                self._write({"type": "histogram", "name": name, **hist.to_dict()})
+            self._file.close()
+            self._file = None
+
+
+def start(log_dir: Path | None = None) -> PerfLogger:
+    """パフォーマンスログを開始する（perf に sink を登録し、終了時に自動で閉じる）。"""
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    logger = PerfLogger((log_dir or LOG_DIR) / f"perf_{timestamp}.jsonl")
+    perf.add_sink(logger)
+    atexit.register(stop, logger)
+    return logger
+
+
+def stop(logger: PerfLogger) -> None:
+    """sink の登録を解除し、ログを閉じる。"""
+    perf.remove_sink(logger)
+    logger.close()
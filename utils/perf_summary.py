@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""パフォーマンスログ（log/perf_*.jsonl）の集計。
+
+使い方:
+    python -m utils.perf_summary [LOG ...] [--all]
+
+計測名ごとに回数・平均・p50 / p95 / p99・最大（ms）を表示する。
+LOG 省略時は log/ 内の最新のログ、--all では log/ 内の全ログを結合して集計する。
+終了時に書き出されたヒストグラムを使い、異常終了などでヒストグラムが無いログは
+span レコードから集計し直す。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from utils.perf_log import LOG_DIR, LatencyHistogram
+
+
+def read_histograms(path: Path) -> dict[str, LatencyHistogram]:
+    """1つのログファイルから計測名ごとのヒストグラムを読み込む。"""
+    from_histograms: dict[str, LatencyHistogram] = {}
+    from_spans: dict[str, LatencyHistogram] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # 強制終了で途中までしか書かれなかった行は読み飛ばす
+                continue
+            kind = record.get("type")
+            if kind == "histogram":
+                from_histograms[record["name"]] = LatencyHistogram.from_dict(record)
+            elif kind == "span":
+                hist = from_spans.setdefault(record["name"], LatencyHistogram())
+                hist.record(round(record["ms"] * 1000))
+    return from_histograms or from_spans
+
+
+def summarize(paths: list[Path]) -> dict[str, LatencyHistogram]:
+    """複数のログを計測名ごとに結合する。"""
+    merged: dict[str, LatencyHistogram] = {}
+    for path in paths:
+        for name, hist in read_histograms(path).items():
+            merged.setdefault(name, LatencyHistogram(hist.sub_bucket_bits)).merge(hist)
+    return merged
+
+
+def format_summary(histograms: dict[str, LatencyHistogram]) -> str:
+    lines = [
+        f"{'operation':<28} {'count':>8} {'mean':>9} {'p50':>9} {'p95':>9} "
+        f"{'p99':>9} {'max':>9}  (ms)"
+    ]
+    for name, h in sorted(histograms.items()):
+        cols = [h.mean, h.percentile(50), h.percentile(95), h.percentile(99), h.max]
+        lines.append(
+            f"{name:<28} {h.count:>8,} "
+            + " ".join(f"{v / 1000:>9.2f}" for v in cols)
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="パフォーマンスログの集計")
+    parser.add_argument("logs", nargs="*", type=Path, help="集計するログファイル")
+    parser.add_argument("--all", action="store_true", help="log/ 内の全ログを集計")
+    args = parser.parse_args(argv)
+
+    paths: list[Path] = list(args.logs)
+    if not paths:
+        found = sorted(LOG_DIR.glob("perf_*.jsonl"))
+        paths = found if args.all else found[-1:]
+    if not paths:
+        print(f"[PERF] ログがありません: {LOG_DIR}", file=sys.stderr)
+        return 1
+
+    for path in paths:
+        print(f"[PERF] {path}", file=sys.stderr)
+    print(format_summary(summarize(paths)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""低オーバーヘッドのサンプリングプロファイラ。
+
+バックグラウンドスレッドが一定間隔で ``sys._current_frames()`` を読み、
+各スレッドのスタックを「折りたたみ形式」（collapsed stacks）で集計する。
+
+    MainThread;main (main.py:18);run (textual/app.py:2050);... 42
+
+1行が「; 区切りのスタック（根元→末端）＋ 空白 ＋ サンプル数」で、
+flamegraph.pl / speedscope / inferno などでそのままフレームグラフにできる。
+関数の中身を計測する cProfile と異なり、対象スレッドには一切フックを入れないため、
+実運用の環境でも有効にしたまま使える。
+"""
+
+from __future__ import annotations
+
+import datetime
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import CodeType, FrameType
+
+from utils.perf_log import LOG_DIR, PROJECT_ROOT
+
+DEFAULT_HZ = 100
+
+_PREFIXES = (str(PROJECT_ROOT) + "/", sysconfig.get_paths()["stdlib"] + "/")
+
+
+def _short_filename(filename: str) -> str:
+    """プロジェクト・標準ライブラリ・site-packages からの相対パスに短縮する。"""
+    marker = "site-packages/"
+    idx = filename.find(marker)
+    if idx >= 0:
+        return filename[idx + len(marker):]
+    for prefix in _PREFIXES:
+        if filename.startswith(prefix):
+            return filename[len(prefix):]
+    return filename
+
+
+class StackSampler:
+    """全スレッドのスタックを hz 回/秒でサンプリングし、折りたたみ形式で集計する。"""
+
+    def __init__(self, hz: float = DEFAULT_HZ, out_dir: Path | None = None) -> None:
+        if hz <= 0:
+            raise ValueError(f"サンプリング周波数は正の値で指定してください: {hz}")
+        self.hz = hz
+        self.out_dir = out_dir or LOG_DIR
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._labels: dict[CodeType, str] = {}
+        self._thread_names: dict[int, str] = {}
+        self._thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        """集計をリセットしてサンプリングを開始する。"""
+        if self._thread is not None:
+            return
+        self.stacks.clear()
+        self.samples = 0
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> Path | None:
+        """サンプリングを停止し、結果を書き出したファイルのパスを返す（0件なら None）。"""
+        if self._thread is None:
+            return None
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        if not self.stacks:
+            return None
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = self.out_dir / f"profile_{timestamp}.collapsed"
+        n = 2
+        while path.exists():
+            path = self.out_dir / f"profile_{timestamp}_{n}.collapsed"
+            n += 1
+        return self.write(path)
+
+    def toggle(self) -> Path | None:
+        """停止中なら開始し、実行中なら停止して書き出す。"""
+        if self.running:
+            return self.stop()
+        self.start()
+        return None
+
+    # ---- sampling ----
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        interval = 1.0 / self.hz
+        next_time = time.perf_counter()
+        while not self._stop_event.is_set():
+            self.sample_once(exclude=own)
+            next_time += interval
+            delay = next_time - time.perf_counter()
+            if delay < 0:
+                # 処理が追いつかない場合は遅れを取り戻さずに次の周期から再開する
+                next_time = time.perf_counter()
+                delay = 0
+            self._stop_event.wait(delay)
+
+    def sample_once(self, exclude: int | None = None) -> None:
+        """現在の全スレッドのスタックを1回分記録する。"""
+        for ident, frame in sys._current_frames().items():
+            if ident == exclude:
+                continue
+            stack = self._collapse(frame)
+            self.stacks[f"{self._thread_name(ident)};{stack}"] += 1
+        self.samples += 1
+
+    def _thread_name(self, ident: int) -> str:
+        name = self._thread_names.get(ident)
+        if name is None:
+            self._thread_names = {t.ident: t.name for t in threading.enumerate()}
+            name = self._thread_names.get(ident, f"thread-{ident}")
+        return name
+
+    def _collapse(self, frame: FrameType | None) -> str:
+        labels: list[str] = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = (
+                    f"{code.co_name} "
+                    f"({_short_filename(code.co_filename)}:{code.co_firstlineno})"
+                ).replace(";", ":")
+            labels.append(label)
+            frame = frame.f_back
+        labels.reverse()
+        return ";".join(labels)
+
+    # ---- output ----
+
+    def collapsed(self) -> str:
+        """折りたたみ形式のテキストを返す（サンプル数の多い順）。"""
+        return "".join(
+            f"{stack} {n}\n" for stack, n in self.stacks.most_common()
+        )
+
+    def write(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.collapsed(), encoding="utf-8")
+        return path
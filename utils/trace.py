@@ -0,0 +1,155 @@
+"""入力イベントのトレース記録（性能問題の再現用）。
+
+``python main.py --record-trace`` で起動すると、ScheduleApp が受け取ったキー・マウス入力を
+``log/trace_YYYYmmdd_HHMMSS.jsonl`` に記録する。1行目はヘッダーで、端末サイズ・開始日付・
+データファイルの指紋（サイズと SHA-256）を含む。2行目以降が入力イベントで、
+``t`` は記録開始からの経過秒数。
+
+    {"type": "header", "version": 1, "size": [120, 40], "start_date": "2026-02-19", ...}
+    {"type": "key", "t": 0.532, "key": "greater_than_sign", "character": ">"}
+    {"type": "mouse_down", "t": 1.204, "x": 12, "y": 7, "button": 1, ...}
+
+マウス移動（MouseMove）は件数が多く再現に不要なため記録しない。
+再生は ``python -m benchmarks.replay_trace``。
+"""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import IO, Any
+
+from textual import events
+
+TRACE_VERSION = 1
+
+# 記録するマウスイベントとトレース上の種別名
+_MOUSE_TYPES: dict[type[events.MouseEvent], str] = {
+    events.MouseDown: "mouse_down",
+    events.MouseUp: "mouse_up",
+    events.MouseScrollDown: "scroll_down",
+    events.MouseScrollUp: "scroll_up",
+}
+_MOUSE_CLASSES = {name: cls for cls, name in _MOUSE_TYPES.items()}
+
+
+def dataset_fingerprint(path: Path) -> dict[str, Any]:
+    """データファイルの指紋（ファイル名・バイト数・SHA-256）を返す。"""
+    if not path.exists():
+        return {"file": path.name, "bytes": 0, "sha256": None}
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+            size += len(chunk)
+    return {"file": path.name, "bytes": size, "sha256": digest.hexdigest()}
+
+
+def event_to_record(event: events.Event) -> dict[str, Any] | None:
+    """入力イベントをトレースのレコードに変換する（記録対象外なら None）。"""
+    if isinstance(event, events.Key):
+        return {"type": "key", "key": event.key, "character": event.character}
+    kind = _MOUSE_TYPES.get(type(event))
+    if kind is None:
+        return None
+    return {
+        "type": kind,
+        "x": int(event.screen_x),
+        "y": int(event.screen_y),
+        "button": event.button,
+        "shift": event.shift,
+        "meta": event.meta,
+        "ctrl": event.ctrl,
+    }
+
+
+def record_to_event(record: dict[str, Any]) -> events.Event:
+    """トレースのレコードから、ドライバーが送るのと同じ入力イベントを作る。"""
+    kind = record["type"]
+    if kind == "key":
+        return events.Key(record["key"], record.get("character"))
+    cls = _MOUSE_CLASSES.get(kind)
+    if cls is None:
+        raise ValueError(f"不明なイベント種別です: {kind!r}")
+    x, y = record["x"], record["y"]
+    return cls(
+        None, x, y, 0, 0,
+        record.get("button", 0),
+        record.get("shift", False),
+        record.get("meta", False),
+        record.get("ctrl", False),
+        screen_x=x,
+        screen_y=y,
+    )
+
+
+class TraceRecorder:
+    """入力イベントを JSONL のトレースファイルに記録する。"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.events = 0
+        self._start = time.perf_counter()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: IO[str] | None = open(path, "w", encoding="utf-8")
+
+    def begin(
+        self, size: tuple[int, int], start_date: datetime.date, data_file: Path
+    ) -> None:
+        """ヘッダーを書き、イベント時刻の基準をリセットする（アプリ起動直後に呼ぶ）。"""
+        self._write({
+            "type": "header",
+            "version": TRACE_VERSION,
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "size": list(size),
+            "start_date": start_date.isoformat(),
+            "dataset": dataset_fingerprint(data_file),
+        })
+        self._start = time.perf_counter()
+
+    def record(self, event: events.Event) -> None:
+        record = event_to_record(event)
+        if record is None:
+            return
+        elapsed = round(time.perf_counter() - self._start, 4)
+        self._write({"type": record.pop("type"), "t": elapsed, **record})
+        self.events += 1
+
+    def _write(self, record: dict[str, Any]) -> None:
+        if self._file is not None:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_trace(path: Path) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """トレースファイルを (ヘッダー, イベントのリスト) として読み込む。
+
+    Raises:
+        ValueError: ヘッダーが無い、またはバージョンが異なる
+    """
+    header: dict[str, Any] | None = None
+    records: list[dict[str, Any]] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if record.get("type") == "header":
+                header = record
+            else:
+                records.append(record)
+    if header is None:
+        raise ValueError(f"トレースのヘッダーがありません: {path}")
+    if header.get("version") != TRACE_VERSION:
+        raise ValueError(f"未対応のトレース形式です: version={header.get('version')}")
+    return header, records